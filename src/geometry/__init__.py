@@ -68,11 +68,17 @@ from .basic_utils import *
 from .constants import *
 from .distances import *
 from .formatting import *
+from .lie_jacobians import *
 from .manifolds import *
 from .mds_algos import *
 from .poses import *
 from .poses_embedding import *
+from .poses_qt import *
+from .poses_xytheta import *
 from .procrustes import *
+from .quaternions import *
+from .rotation_averaging import *
+from .rotation_index import *
 from .rotations import *
 from .rotations_embedding import *
 from .spheres import *
@@ -1,4 +1,7 @@
 # coding=utf-8
+import functools
+import os
+import threading
 import warnings
 
 import numpy as np
@@ -27,6 +30,10 @@ __all__ = [
     "normalize_length_or_zero",
     "deprecated",
     "safe_arccos",
+    "random_generator",
+    "fast_path",
+    "set_fast_mode",
+    "in_fast_mode",
 ]
 
 
@@ -78,3 +85,75 @@ def safe_arccos(x):
         slightly over 1 or below -1 due to numerical errors.
     """
     return np.arccos(np.clip(x, -1.0, 1.0))
+
+
+def random_generator(rng=None):
+    """
+        Returns the random number generator to use for sampling.
+
+        :param rng: A ``numpy.random.Generator`` (or ``RandomState``), which
+            is returned as is; a seed, for a new ``Generator``; or None, for
+            the global numpy state (``np.random``), as in the functions that
+            draw one sample at a time.
+    """
+    if rng is None or rng is np.random:
+        # the module has the same sampling methods as its global RandomState
+        return np.random
+    if isinstance(rng, (np.random.Generator, np.random.RandomState)):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def _env_flag(name):
+    """ True if the environment variable is "1", "true", "yes" or "on" (any case). """
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class FastMode(object):
+    """ Global switch for skipping the contracts on the hot paths. """
+
+    # default to ENV variable; "0", "false", etc. keep the checks on
+    active = _env_flag("GEOMETRY_FAST_MODE")
+    # per-thread override, used by the geometry.fast namespace
+    local = threading.local()
+
+
+def set_fast_mode(active=True):
+    """
+        Enables (or disables) the "fast mode".
+
+        In fast mode, the functions decorated with :py:func:`fast_path`
+        skip the evaluation of their contracts. Other contracts (and other
+        libraries using PyContracts) are not affected; use
+        ``contracts.disable_all()`` for that.
+    """
+    FastMode.active = bool(active)
+
+
+def in_fast_mode():
+    """ Returns True if the contracts on the hot paths are skipped. """
+    return getattr(FastMode.local, "active", False) or FastMode.active
+
+
+def fast_path(function):
+    """
+        Decorator for functions that are called in tight loops.
+
+        Use it on top of ``@contract``: the contracts are checked as usual,
+        unless :py:func:`in_fast_mode` is True, in which case the
+        undecorated function is called directly.
+
+        The undecorated function is available as ``function.unchecked``.
+    """
+    # if contracts are disabled, @contract returned the function itself
+    unchecked = getattr(function, "__wrapped__", function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if FastMode.active or getattr(FastMode.local, "active", False):
+            return unchecked(*args, **kwargs)
+        return function(*args, **kwargs)
+
+    wrapper.unchecked = unchecked
+    wrapper.checked = function
+    return wrapper
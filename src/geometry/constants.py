@@ -8,3 +8,9 @@ __all__ = [
 class GeometryConstants(object):
     atol_zero_norm = 1e-7
     rtol_SE2_from_SE3 = 1e-4
+    # inner_product_embedding(solver="auto"): dense LAPACK up to this size,
+    # then ARPACK.
+    mds_lapack_max_n = 500
+    # quaternion_distance_matrix(): below this angle, the arccos of the
+    # dot product is not accurate and the chordal distance is used.
+    rotation_distance_small_angle = 1e-3
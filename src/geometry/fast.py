@@ -0,0 +1,117 @@
+# coding=utf-8
+"""
+    Contract-free versions of the functions on the hot paths.
+
+    The functions here are the same as in :py:mod:`geometry.poses` and
+    :py:mod:`geometry.rotations`, but they (and the functions they call)
+    do not evaluate any contract, whatever the global setting is: ::
+
+        from geometry import fast
+        pose = fast.SE2_from_se2(vel)
+
+    The same effect can be obtained globally with
+    :py:func:`geometry.set_fast_mode`.
+"""
+import functools
+
+from . import poses, rotations
+from .basic_utils import FastMode
+
+__all__ = [
+    # poses
+    "extract_pieces",
+    "combine_pieces",
+    "pose_from_rotation_translation",
+    "rotation_translation_from_pose",
+    "translation_from_SE2",
+    "translation_from_SE3",
+    "SE2_from_translation_angle",
+    "translation_angle_from_SE2",
+    "angle_from_SE2",
+    "SE2_from_xytheta",
+    "xytheta_from_SE2",
+    "se2_from_linear_angular",
+    "linear_angular_from_se2",
+    "se2_from_SE2",
+    "SE2_from_se2",
+    "SE3_from_se3",
+    "se3_from_SE3",
+    "SE2_from_SE3",
+    # rotations
+    "rotz",
+    "SO2_from_angle",
+    "angle_from_SO2",
+    "hat_map_2d",
+    "map_hat_2d",
+    "hat_map",
+    "map_hat",
+    "rotation_from_quaternion",
+    "quaternion_from_rotation",
+    "quaternion_from_axis_angle",
+    "axis_angle_from_quaternion",
+    "rotation_from_axis_angle",
+    "axis_angle_from_rotation",
+    "SO3_from_so3",
+    "so3_from_SO3",
+    "SO2_from_so2",
+    "so2_from_SO2",
+]
+
+
+def unchecked(function):
+    """
+        Returns a version of a :py:func:`fast_path` function that skips
+        the contracts, also for the nested calls, in the current thread.
+    """
+    f = function.unchecked
+    local = FastMode.local
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        if getattr(local, "active", False):
+            return f(*args, **kwargs)
+        local.active = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            local.active = False
+
+    return wrapper
+
+
+extract_pieces = unchecked(poses.extract_pieces)
+combine_pieces = unchecked(poses.combine_pieces)
+pose_from_rotation_translation = unchecked(poses.pose_from_rotation_translation)
+rotation_translation_from_pose = unchecked(poses.rotation_translation_from_pose)
+translation_from_SE2 = unchecked(poses.translation_from_SE2)
+translation_from_SE3 = unchecked(poses.translation_from_SE3)
+SE2_from_translation_angle = unchecked(poses.SE2_from_translation_angle)
+translation_angle_from_SE2 = unchecked(poses.translation_angle_from_SE2)
+angle_from_SE2 = unchecked(poses.angle_from_SE2)
+SE2_from_xytheta = unchecked(poses.SE2_from_xytheta)
+xytheta_from_SE2 = unchecked(poses.xytheta_from_SE2)
+se2_from_linear_angular = unchecked(poses.se2_from_linear_angular)
+linear_angular_from_se2 = unchecked(poses.linear_angular_from_se2)
+se2_from_SE2 = unchecked(poses.se2_from_SE2)
+SE2_from_se2 = unchecked(poses.SE2_from_se2)
+SE3_from_se3 = unchecked(poses.SE3_from_se3)
+se3_from_SE3 = unchecked(poses.se3_from_SE3)
+SE2_from_SE3 = unchecked(poses.SE2_from_SE3)
+
+rotz = unchecked(rotations.rotz)
+SO2_from_angle = unchecked(rotations.SO2_from_angle)
+angle_from_SO2 = unchecked(rotations.angle_from_SO2)
+hat_map_2d = unchecked(rotations.hat_map_2d)
+map_hat_2d = unchecked(rotations.map_hat_2d)
+hat_map = unchecked(rotations.hat_map)
+map_hat = unchecked(rotations.map_hat)
+rotation_from_quaternion = unchecked(rotations.rotation_from_quaternion)
+quaternion_from_rotation = unchecked(rotations.quaternion_from_rotation)
+quaternion_from_axis_angle = unchecked(rotations.quaternion_from_axis_angle)
+axis_angle_from_quaternion = unchecked(rotations.axis_angle_from_quaternion)
+rotation_from_axis_angle = unchecked(rotations.rotation_from_axis_angle)
+axis_angle_from_rotation = unchecked(rotations.axis_angle_from_rotation)
+SO3_from_so3 = unchecked(rotations.SO3_from_so3)
+so3_from_SO3 = unchecked(rotations.so3_from_SO3)
+SO2_from_so2 = unchecked(rotations.SO2_from_so2)
+so2_from_SO2 = unchecked(rotations.so2_from_SO2)
@@ -0,0 +1,222 @@
+# coding=utf-8
+"""
+    Adjoints and Jacobians of the exponential map of SO(3), SE(2), SE(3).
+
+    The tangent vectors are in the coordinates of
+    :py:func:`MatrixLieAlgebra.vector_from_algebra`: the rotation vector for
+    so(3), and the angular velocity followed by the linear velocity for
+    se(n), that is, (omega, vx, vy) and (w1, w2, w3, vx, vy, vz).
+
+    The left Jacobian J_l(v) is the one for which, for small d,
+
+        exp(v + d) = exp(J_l(v) d) exp(v),
+
+    and the right Jacobian is J_r(v) = J_l(-v), for which
+    exp(v + d) = exp(v) exp(J_r(v) d). The adjoint of g is the matrix of
+    X -> g X g^-1 in the same coordinates.
+
+    All functions accept a single element or a stack, with shape
+    (N,n,n) for the group elements and (N,k) for the vectors, and return
+    (k,k) or (N,k,k) matrices. Taylor series are used for small angles.
+"""
+from math import factorial
+
+import numpy as np
+from contracts import contract
+
+from .rotations import exp_coefficients, hat_maps, log_coefficient
+
+__all__ = [
+    "SO3_left_jacobian",
+    "SO3_left_jacobian_inverse",
+    "SE2_adjoint",
+    "SE2_left_jacobian",
+    "SE2_left_jacobian_inverse",
+    "SE3_adjoint",
+    "SE3_left_jacobian",
+    "SE3_left_jacobian_inverse",
+]
+
+
+def _coefficients(v):
+    """ Returns the angle |v| and A, B, C of :py:func:`exp_coefficients`. """
+    theta = np.linalg.norm(v, axis=-1)
+    A, B, C = exp_coefficients(theta)
+    return theta, np.asarray(A), np.asarray(B), np.asarray(C)
+
+
+def _series(theta, coefficients):
+    """ Evaluates sum_k c_k (-theta^2)^k. """
+    x = -theta * theta
+    result = np.zeros(np.shape(theta))
+    for c in reversed(coefficients):
+        result = result * x + c
+    return result
+
+
+# Taylor coefficients of the two functions of _q_coefficients(); eight
+# terms are accurate to the last digit for angles below 1.
+_D_SERIES = [1.0 / factorial(2 * k + 4) for k in range(8)]
+_E_SERIES = [(k + 1.0) / factorial(2 * k + 5) for k in range(8)]
+
+
+def _q_coefficients(theta):
+    """
+        Returns (t^2 + 2 cos(t) - 2) / (2 t^4) and
+        (2 t - 3 sin(t) + t cos(t)) / (2 t^5), which appear in the
+        left Jacobian of SE(3). Their series are
+        sum_k (-t^2)^k / (2k+4)! and sum_k (-t^2)^k (k+1) / (2k+5)!;
+        the closed forms lose many digits to cancellation well above
+        the threshold of :py:func:`exp_coefficients`.
+    """
+    small = theta < 1
+    t = np.where(small, 1.0, theta)
+    D = np.where(small, _series(theta, _D_SERIES), (t * t + 2 * np.cos(t) - 2) / (2 * t ** 4))
+    E = np.where(
+        small, _series(theta, _E_SERIES), (2 * t - 3 * np.sin(t) + t * np.cos(t)) / (2 * t ** 5)
+    )
+    return D, E
+
+
+def _matrices(x):
+    """ Reshapes coefficients of shape (...) to broadcast with (...,3,3) matrices. """
+    return np.asarray(x)[..., np.newaxis, np.newaxis]
+
+
+@contract(w="array[Nx3]|array[3]", returns="array[Nx3x3]|array[3x3]")
+def SO3_left_jacobian(w):
+    """ Left Jacobian of SO(3): I + B W + C W^2. """
+    _, _, B, C = _coefficients(w)
+    W = hat_maps(w)
+    return np.eye(3) + _matrices(B) * W + _matrices(C) * np.matmul(W, W)
+
+
+@contract(w="array[Nx3]|array[3]", returns="array[Nx3x3]|array[3x3]")
+def SO3_left_jacobian_inverse(w):
+    """ Inverse of the left Jacobian of SO(3): I - W/2 + D W^2. """
+    theta = np.linalg.norm(w, axis=-1)
+    W = hat_maps(w)
+    return np.eye(3) - 0.5 * W + _matrices(log_coefficient(theta)) * np.matmul(W, W)
+
+
+@contract(g="array[Nx3x3]|array[3x3]", returns="array[Nx3x3]|array[3x3]")
+def SE2_adjoint(g):
+    """ Adjoint of SE(2): (omega, v) -> (omega, R v - omega J t). """
+    g = np.asarray(g)
+    M = np.zeros(g.shape)
+    M[..., 0, 0] = 1
+    M[..., 1, 0] = g[..., 1, 2]
+    M[..., 2, 0] = -g[..., 0, 2]
+    M[..., 1:, 1:] = g[..., :2, :2]
+    return M
+
+
+def _se2_blocks(v):
+    """
+        Returns the blocks of the left Jacobian of SE(2): the first
+        column c of the linear part, and A, theta B of the 2x2 block
+        A I + theta B J.
+    """
+    v = np.asarray(v, dtype="float64")
+    w = v[..., 0]
+    _, A, B, C = _coefficients(v[..., :1])
+    c = np.empty(v.shape[:-1] + (2,))
+    c[..., 0] = w * C * v[..., 1] + B * v[..., 2]
+    c[..., 1] = -B * v[..., 1] + w * C * v[..., 2]
+    return c, A, w * B
+
+
+@contract(v="array[Nx3]|array[3]", returns="array[Nx3x3]|array[3x3]")
+def SE2_left_jacobian(v):
+    """ Left Jacobian of SE(2). """
+    c, A, wB = _se2_blocks(v)
+    M = np.zeros(c.shape[:-1] + (3, 3))
+    M[..., 0, 0] = 1
+    M[..., 1:, 0] = c
+    M[..., 1, 1] = A
+    M[..., 1, 2] = -wB
+    M[..., 2, 1] = wB
+    M[..., 2, 2] = A
+    return M
+
+
+@contract(v="array[Nx3]|array[3]", returns="array[Nx3x3]|array[3x3]")
+def SE2_left_jacobian_inverse(v):
+    """
+        Inverse of the left Jacobian of SE(2). The 2x2 block
+        A I + theta B J has inverse k I - theta/2 J, with
+        k = (theta / 2) / tan(theta / 2), as in :py:func:`xytheta_log`.
+    """
+    v = np.asarray(v, dtype="float64")
+    c, _, _ = _se2_blocks(v)
+    w = v[..., 0]
+    k = np.cos(w / 2) / np.sinc(w / (2 * np.pi))
+    M = np.zeros(c.shape[:-1] + (3, 3))
+    M[..., 0, 0] = 1
+    M[..., 1, 0] = -(k * c[..., 0] + (w / 2) * c[..., 1])
+    M[..., 2, 0] = -(-(w / 2) * c[..., 0] + k * c[..., 1])
+    M[..., 1, 1] = k
+    M[..., 1, 2] = w / 2
+    M[..., 2, 1] = -w / 2
+    M[..., 2, 2] = k
+    return M
+
+
+@contract(g="array[Nx4x4]|array[4x4]", returns="array[Nx6x6]|array[6x6]")
+def SE3_adjoint(g):
+    """ Adjoint of SE(3): [[R, 0], [t^ R, R]]. """
+    g = np.asarray(g)
+    R = g[..., :3, :3]
+    M = np.zeros(g.shape[:-2] + (6, 6))
+    M[..., :3, :3] = R
+    M[..., 3:, 3:] = R
+    M[..., 3:, :3] = np.matmul(hat_maps(g[..., :3, 3]), R)
+    return M
+
+
+def _se3_q(v):
+    """
+        The block Q of the left Jacobian of SE(3) (Barfoot, "State
+        Estimation for Robotics", eq. 7.86), with W = w^ and P = v^:
+
+            Q = P/2 + C (WP + PW + WPW) + D (WWP + PWW - 3 WPW)
+                + E (WPWW + WWPW).
+    """
+    w = v[..., :3]
+    _, _, _, C = _coefficients(w)
+    D, E = _q_coefficients(np.linalg.norm(w, axis=-1))
+    W = hat_maps(w)
+    P = hat_maps(v[..., 3:])
+    WP = np.matmul(W, P)
+    PW = np.matmul(P, W)
+    WW = np.matmul(W, W)
+    WPW = np.matmul(WP, W)
+    Q = 0.5 * P
+    Q = Q + _matrices(C) * (WP + PW + WPW)
+    Q = Q + _matrices(D) * (np.matmul(W, WP) + np.matmul(PW, W) - 3 * WPW)
+    Q = Q + _matrices(E) * (np.matmul(WPW, W) + np.matmul(WW, PW))
+    return Q
+
+
+@contract(v="array[Nx6]|array[6]", returns="array[Nx6x6]|array[6x6]")
+def SE3_left_jacobian(v):
+    """ Left Jacobian of SE(3): [[J, 0], [Q, J]], with J the one of SO(3). """
+    v = np.asarray(v, dtype="float64")
+    J = SO3_left_jacobian(v[..., :3])
+    M = np.zeros(v.shape[:-1] + (6, 6))
+    M[..., :3, :3] = J
+    M[..., 3:, 3:] = J
+    M[..., 3:, :3] = _se3_q(v)
+    return M
+
+
+@contract(v="array[Nx6]|array[6]", returns="array[Nx6x6]|array[6x6]")
+def SE3_left_jacobian_inverse(v):
+    """ Inverse of the left Jacobian of SE(3): [[J^-1, 0], [-J^-1 Q J^-1, J^-1]]. """
+    v = np.asarray(v, dtype="float64")
+    Jinv = SO3_left_jacobian_inverse(v[..., :3])
+    M = np.zeros(v.shape[:-1] + (6, 6))
+    M[..., :3, :3] = Jinv
+    M[..., 3:, 3:] = Jinv
+    M[..., 3:, :3] = -np.matmul(np.matmul(Jinv, _se3_q(v)), Jinv)
+    return M
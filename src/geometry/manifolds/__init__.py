@@ -23,6 +23,7 @@ from .square import *
 from .tangent_bundle import *
 from .torus import *
 from .torus01 import *
+from .trajectory import *
 from .translation_algebra import *
 from .translation_group import *
 
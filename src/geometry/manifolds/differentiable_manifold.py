@@ -1,6 +1,8 @@
 # coding=utf-8
 from abc import abstractmethod
 
+import numpy as np
+
 from contracts import ContractsMeta, contract, new_contract
 from geometry import GEOMETRY_DO_EXTRA_CHECKS, logger
 from geometry.formatting import formatm, printm
@@ -11,6 +13,15 @@ from .manifold_relations import Isomorphism, Embedding, ManifoldRelations
 __all__ = ["DifferentiableManifold", "RandomManifold"]
 
 
+def stack_points(B, shape):
+    """
+        Returns the points in *B* (a list of points, or an array)
+        as an array of shape (N,) + *shape*.
+    """
+    B = np.asarray(B, dtype="float64")
+    return B.reshape((-1,) + tuple(shape))
+
+
 class DifferentiableManifold:
     """ This is the base class for differentiable manifolds. """
 
@@ -60,6 +71,30 @@ class DifferentiableManifold:
             Computes the geodesic distance between two points.
         """
 
+    @contract(a="belongs", returns="array[N](>=0)")
+    def distances(self, a, B):
+        """
+            Computes the geodesic distances between the point *a* and
+            each of the N points in *B* (a list, or an array whose first
+            dimension indexes the points).
+
+            The generic implementation calls :py:func:`distance`;
+            subclasses provide vectorized versions.
+        """
+        return np.array([self.distance(a, b) for b in B], dtype="float64").reshape(len(B))
+
+    @contract(returns="array[MxN](>=0)")
+    def distance_matrix(self, A, B=None):
+        """
+            Computes the MxN matrix of geodesic distances between the M
+            points in *A* and the N points in *B* (default: *A*).
+        """
+        if B is None:
+            B = A
+        if len(A) == 0:
+            return np.zeros((0, len(B)))
+        return np.vstack([self.distances(a, B) for a in A])
+
     # @contract(returns='DifferentiableManifold') # Circular ref
     def tangent_bundle(self):
         """ Returns the manifold corresponding to the tangent bundle.
@@ -106,6 +141,22 @@ class DifferentiableManifold:
         bv = self.logmap(a, b)
         return self.expmap((bv[0], bv[1] * t))
 
+    def interpolate(self, A, B, t):
+        """
+            Batched version of :py:func:`geodesic`: *A* and *B* are stacks
+            of N points, and *t* is a number or an array of N fractions.
+            Returns the stack of interpolated points.
+
+            This generic implementation calls :py:func:`geodesic` once per
+            point; the subclasses with a closed form (SO, SE, spheres)
+            compute all points at once. Note that the SE groups do not
+            follow the geodesic by default, but interpolate separately
+            the rotation and the translation; see
+            :py:func:`SE_group.interpolate`.
+        """
+        t = np.broadcast_to(np.asarray(t, dtype="float64"), (len(A),))
+        return np.array([self.geodesic(a, b, float(ti)) for a, b, ti in zip(A, B, t)])
+
     @contract(a="belongs", returns="belongs")
     def normalize(self, a):
         """ Normalizes the coordinates to the canonical representation
@@ -284,10 +335,16 @@ class RandomManifold(DifferentiableManifold):
         to sample random points. """
 
     @abstractmethod
-    def sample_uniform(self):
+    def sample_uniform(self, n=None, rng=None):
         """
             Samples a random point in this manifold according to the Haar
             measure. Raises exception if the measure is improper (e.g., R^n).
+
+            :param n: If given, returns a stack of *n* points (the first
+                axis indexes the points), sampled all at once.
+            :param rng: Seed or generator; see
+                :py:func:`geometry.random_generator`. By default, the
+                global numpy random state is used.
         """
 
     @abstractmethod
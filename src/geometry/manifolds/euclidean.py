@@ -1,8 +1,10 @@
 # coding=utf-8
 from contracts import contract
+from geometry.basic_utils import random_generator
 from geometry.utils import assert_allclose
 import numpy as np
 
+from .differentiable_manifold import stack_points
 from .matrix_linear_space import MatrixLinearSpace
 
 __all__ = ["Euclidean", "R", "R1", "R2", "R3"]
@@ -30,8 +32,10 @@ class Euclidean(MatrixLinearSpace):
         assert_allclose(x.size, self.dimension)
         assert np.all(np.isreal(x)), "Expected real vector"
 
-    def sample_uniform(self):
-        return np.random.randn(self.dimension)
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        shape = (self.dimension,) if n is None else (n, self.dimension)
+        return random_generator(rng).standard_normal(shape)
 
     def interesting_points(self):
         points = []
@@ -39,6 +43,16 @@ class Euclidean(MatrixLinearSpace):
         points.append(np.ones(self.dimension))
         return points
 
+    def distances(self, a, B):
+        B = stack_points(B, (self.dimension,))
+        return np.linalg.norm(B - np.reshape(a, self.dimension), axis=1)
+
+    def interpolate(self, A, B, t):
+        A = stack_points(A, (self.dimension,))
+        B = stack_points(B, (self.dimension,))
+        t = np.asarray(t, dtype="float64")[..., np.newaxis]
+        return A + t * (B - A)
+
     @contract(returns="belongs")
     def riemannian_mean(self, points):
         return np.mean(points, axis=0)
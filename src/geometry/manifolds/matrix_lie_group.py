@@ -59,6 +59,16 @@ class MatrixLieGroup(Group, DifferentiableManifold):
             logger.error("Tried to invert %s" % describe_value(g))
             raise
 
+    def relative(self, a, b):
+        """
+            Returns :math:`a^{-1} b`, that is, *b* relative to *a*.
+
+            The argument *b* can also be a tangent vector at *a*, which is
+            translated to the origin. The subclasses with a closed-form
+            inverse also accept (N,n,n) stacks for *a* and *b*.
+        """
+        return np.matmul(self.inverse(a), b)
+
     @new_contract
     def belongs_algebra(self, x):
         self.algebra.belongs(x)
@@ -74,7 +84,7 @@ class MatrixLieGroup(Group, DifferentiableManifold):
         """
         # get it to the origin
         base, vel = bv
-        y = np.dot(self.inverse(base), vel)
+        y = self.relative(base, vel)
         # project it to the algebra
         ty = self.algebra.project(y)
         # get it back where it belonged
@@ -107,7 +117,7 @@ class MatrixLieGroup(Group, DifferentiableManifold):
             Here the :py:func:`MatrixLieAlgebra.project` function
             is used to mitigate numerical errors.
         """
-        diff = self.multiply(self.inverse(base), p)
+        diff = self.relative(base, p)
         X = self.algebra_from_group(diff)
         bX = np.dot(base, X)
         return (base, bX)
@@ -124,7 +134,7 @@ class MatrixLieGroup(Group, DifferentiableManifold):
             is used to mitigate numerical errors.
         """
         base, vel = bv
-        tv = np.dot(self.inverse(base), vel)
+        tv = self.relative(base, vel)
         tv = self.algebra.project(tv)
         x = self.group_from_algebra(tv)
         return np.dot(base, x)
@@ -156,7 +166,7 @@ class MatrixLieGroup(Group, DifferentiableManifold):
             Find the velocity in local frame to go from *a* to *b* in
             *delta* time.
         """
-        x = self.multiply(self.inverse(a), b)
+        x = self.relative(a, b)
         xt = self.algebra_from_group(x)
         #        xt = self.logmap(self.unity(), x) # XXX
         #        xt = self.algebra.project(xt)
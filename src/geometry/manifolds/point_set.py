@@ -37,7 +37,7 @@ class PointSet:
         return self.minimum_distance(p) <= min_dist
 
     def distances_to_point(self, p):
-        return np.array([self.manifold.distance(p, p0) for p0 in self.points])
+        return self.manifold.distances(p, self.points)
 
     def minimum_distance(self, p):
         dists = self.distances_to_point(p)
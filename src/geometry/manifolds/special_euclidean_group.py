@@ -1,18 +1,31 @@
 # coding=utf-8
+import warnings
+
 from contracts import contract, describe_type
+from geometry.basic_utils import random_generator
+from geometry.lie_jacobians import (
+    SE2_adjoint,
+    SE2_left_jacobian,
+    SE2_left_jacobian_inverse,
+    SE3_adjoint,
+    SE3_left_jacobian,
+    SE3_left_jacobian_inverse,
+)
 from geometry.poses import (
     extract_pieces,
     pose_from_rotation_translation,
     rotation_translation_from_pose,
     SE2_from_se2,
     se2_from_SE2,
+    SE3_from_se3,
+    se3_from_SE3,
     SE2_from_translation_angle,
     SE3_from_SE2,
 )
 from geometry.utils.numpy_backport import assert_allclose
 import numpy as np
 
-from .differentiable_manifold import DifferentiableManifold
+from .differentiable_manifold import DifferentiableManifold, stack_points
 from .euclidean import R
 from .matrix_lie_group import MatrixLieGroup
 from .special_euclidean_algebra import se
@@ -47,7 +60,7 @@ class SE_group(MatrixLieGroup):
         return "SE%s" % (self.n - 1)
 
     @contract(returns="array[2](>=0)")
-    def distances(self, a, b):
+    def distance_components(self, a, b):
         """ Returns linear, angular distance. """
         _, vel = self.logmap(a, b)
         W, v, _, _ = extract_pieces(vel)
@@ -55,6 +68,38 @@ class SE_group(MatrixLieGroup):
         dist2 = self.algebra.son.norm(W)
         return np.array([dist1, dist2])
 
+    def distances(self, a, B):
+        """
+            The distances between *a* and each of the poses in *B*,
+            computed with the closed-form logarithm on all poses at once.
+        """
+        if isinstance(B, np.ndarray) and B.shape == (self.n, self.n):
+            msg = "SE_group.distances(a, b) for one pose is deprecated; use distance_components()."
+            warnings.warn(msg, category=DeprecationWarning, stacklevel=2)
+            return self.distance_components(a, B)
+
+        B = stack_points(B, (self.n, self.n))
+        X = self.relative(a, B)
+        if self.n == 3:
+            R = X[:, :2, :2]
+            t = X[:, :2, 2]
+            theta = np.abs(np.arctan2(R[:, 1, 0], R[:, 0, 0]))
+            # |v| = |A t|, with A = a I + theta/2 J as in se2_from_SE2()
+            a_coeff = np.ones(theta.shape)
+            nonzero = theta >= 1e-8
+            half = theta[nonzero] / 2
+            a_coeff[nonzero] = half / np.tan(half)
+            linear = np.linalg.norm(t, axis=1) * np.sqrt(a_coeff ** 2 + theta ** 2 / 4)
+            angular = theta
+        else:
+            if len(X) == 0:
+                return np.zeros(0)
+            vel = se3_from_SE3(X)
+            W = vel[:, :3, :3]
+            linear = np.linalg.norm(vel[:, :3, 3], axis=1)
+            angular = np.sqrt(W[:, 2, 1] ** 2 + W[:, 0, 2] ** 2 + W[:, 1, 0] ** 2)
+        return linear + self.algebra.alpha * angular
+
     def norm(self, X):
         W, v, zero, zero = extract_pieces(X)  # @UnusedVariable
         return np.linalg.norm(v) + self.alpha * self.son.norm(W)
@@ -77,30 +122,131 @@ class SE_group(MatrixLieGroup):
         assert_allclose(zero, 0, err_msg="I expect the lower row to be 0.")
         assert_allclose(one, 1)
 
-    def sample_uniform(self):
-        t = self.En.sample_uniform()
-        R = self.SOn.sample_uniform()
-        assert t.size == R.shape[0]
-        return pose_from_rotation_translation(R, t)
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        rng = random_generator(rng)
+        t = self.En.sample_uniform(n, rng=rng)
+        R = self.SOn.sample_uniform(n, rng=rng)
+        if n is None:
+            assert t.size == R.shape[0]
+            return pose_from_rotation_translation(R, t)
+        P = np.zeros((n, self.n, self.n))
+        P[:, :-1, :-1] = R
+        P[:, :-1, -1] = t
+        P[:, -1, -1] = 1
+        return P
 
     def friendly(self, a):
         R, t = rotation_translation_from_pose(a)
         return "Pose(%s,%s)" % (self.SOn.friendly(R), self.En.friendly(t))
 
-    # TODO: make explicit inverse
-    # TODO: make specialization for SE(3)
+    def inverse(self, g):
+        """
+            Closed form of the inverse: (R, t) -> (R^T, -R^T t).
+            Accepts also a stack of (N,n,n) poses.
+        """
+        g = np.asarray(g)
+        Rt = np.swapaxes(g[..., :-1, :-1], -1, -2)
+        h = np.zeros(g.shape)
+        h[..., :-1, :-1] = Rt
+        h[..., :-1, -1] = -np.matmul(Rt, g[..., :-1, -1:])[..., 0]
+        h[..., -1, -1] = 1
+        return h
+
+    def relative(self, a, b):
+        """
+            Closed form of :math:`a^{-1} b`: the top rows are
+            R^T (b_top - t b_bottom), and the bottom row is b's.
+        """
+        a = np.asarray(a)
+        b = np.asarray(b)
+        Rt = np.swapaxes(a[..., :-1, :-1], -1, -2)
+        t = a[..., :-1, -1:]
+        r = np.empty(np.broadcast(a, b).shape)
+        r[..., :-1, :] = np.matmul(Rt, b[..., :-1, :] - t * b[..., -1:, :])
+        r[..., -1, :] = b[..., -1, :]
+        return r
+
+    def interpolate(self, A, B, t, screw=False):
+        """
+            Interpolates all the pairs of poses at once.
+
+            By default, the rotations are interpolated as in SO(n) and the
+            translations linearly, which is cheaper but differs from
+            :py:func:`geodesic` between the endpoints. If *screw* is True,
+            the interpolation follows instead the screw motion
+            :math:`A \\exp(t \\log(A^{-1} B))`, which is the geodesic.
+        """
+        A = stack_points(A, (self.n, self.n))
+        B = stack_points(B, (self.n, self.n))
+        t = np.asarray(t, dtype="float64")
+        if screw:
+            V = self.algebra_from_group(self.relative(A, B))
+            V *= np.reshape(t, t.shape + (1, 1))
+            return np.matmul(A, self.group_from_algebra(V))
+        P = np.zeros(A.shape)
+        P[:, :-1, :-1] = self.SOn.interpolate(A[:, :-1, :-1], B[:, :-1, :-1], t)
+        P[:, :-1, -1] = self.En.interpolate(A[:, :-1, -1], B[:, :-1, -1], t)
+        P[:, -1, -1] = 1
+        return P
+
     def group_from_algebra(self, a):
         if self.n == 3:
             return SE2_from_se2(a)
+        elif self.n == 4:
+            return SE3_from_se3(a)
         else:
             return MatrixLieGroup.group_from_algebra(self, a)
 
     def algebra_from_group(self, g):
         if self.n == 3:
             return se2_from_SE2(g)
+        elif self.n == 4:
+            return se3_from_SE3(g)
         else:
             return MatrixLieGroup.algebra_from_group(self, g)
 
+    def adjoint(self, g):
+        """
+            The matrix of the adjoint map :math:`X \\mapsto g X g^{-1}` in
+            the coordinates (omega, v) of :py:func:`vector_from_algebra`:
+            [[R, 0], [t^ R, R]] for SE(3), and the analogous for SE(2).
+            Accepts also a stack of (N,n,n) poses.
+        """
+        if self.n == 3:
+            return SE2_adjoint(g)
+        return SE3_adjoint(g)
+
+    def left_jacobian(self, v):
+        """
+            The left Jacobian of the exponential map at the vector *v* of
+            the algebra, that is, the matrix J for which
+            :math:`\\exp(v + d) \\simeq \\exp(J d) \\exp(v)` for small d.
+
+            Closed form, with Taylor series for small angles; *v* can also
+            be a (N,k) stack.
+        """
+        if self.n == 3:
+            return SE2_left_jacobian(np.asarray(v, dtype="float64"))
+        return SE3_left_jacobian(np.asarray(v, dtype="float64"))
+
+    def left_jacobian_inverse(self, v):
+        """ The inverse of :py:func:`left_jacobian`. """
+        if self.n == 3:
+            return SE2_left_jacobian_inverse(np.asarray(v, dtype="float64"))
+        return SE3_left_jacobian_inverse(np.asarray(v, dtype="float64"))
+
+    def right_jacobian(self, v):
+        """
+            The right Jacobian, for which :math:`\\exp(v + d) \\simeq
+            \\exp(v) \\exp(J d)`; it is the left Jacobian at -v.
+        """
+        return self.left_jacobian(-np.asarray(v, dtype="float64"))
+
+    def right_jacobian_inverse(self, v):
+        """ The inverse of :py:func:`right_jacobian`. """
+        return self.left_jacobian_inverse(-np.asarray(v, dtype="float64"))
+
     def interesting_points(self):
         if self.n == 3:
             return [
@@ -2,9 +2,26 @@
 import numpy as np
 from contracts import check, contract
 
-from geometry.rotations import rot2d, random_rotation, axis_angle_from_rotation, rotation_from_axis_angle
+from geometry.lie_jacobians import SO3_left_jacobian, SO3_left_jacobian_inverse
+from geometry.quaternions import quaternion_slerp
+from geometry.rotations import (
+    axis_angle_from_rotation,
+    quaternions_from_rotations,
+    random_rotation,
+    random_rotations,
+    rot2d,
+    rotation_distance_matrix,
+    rotation_distances,
+    rotation_from_axis_angle,
+    rotations_from_quaternions,
+    SO2_from_so2,
+    so2_from_SO2,
+    SO3_from_so3,
+    so3_from_SO3,
+)
+from geometry.rotation_averaging import rotation_mean
 from geometry.utils import assert_allclose
-from .differentiable_manifold import DifferentiableManifold
+from .differentiable_manifold import DifferentiableManifold, stack_points
 from .matrix_lie_group import MatrixLieGroup
 from .special_orthogonal_algebra import so
 from .sphere import S2
@@ -38,15 +55,142 @@ class SO_group(MatrixLieGroup):
         det = np.linalg.det(x)
         assert_allclose(det, 1, err_msg="I expect the determinant to be +1.")
 
-    @contract(returns="belongs")
-    def sample_uniform(self):
+    def inverse(self, g):
+        """ The inverse of a rotation (or of each in a stack) is its transpose. """
+        return np.swapaxes(g, -1, -2).copy()
+
+    def relative(self, a, b):
+        return np.matmul(np.swapaxes(a, -1, -2), b)
+
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        if self.n not in [2, 3]:
+            assert False, "Not implemented for n>=4."
+        if n is None:
+            return random_rotation(self.n, rng=rng)
+        return random_rotations(n, self.n, rng=rng)
+
+    def distances(self, a, B):
+        """ The rotation angles between *a* and each of the rotations in *B*. """
+        B = stack_points(B, (self.n, self.n))
         if self.n == 2:
-            theta = np.random.rand() * np.pi
-            return rot2d(theta)
+            R = self.relative(a, B)
+            return np.abs(np.arctan2(R[:, 1, 0], R[:, 0, 0]))
         elif self.n == 3:
-            return random_rotation()
+            return rotation_distances(a, B)
         else:
-            assert False, "Not implemented for n>=4."
+            return MatrixLieGroup.distances(self, a, B)
+
+    def interpolate(self, A, B, t):
+        """
+            Interpolates all the pairs of rotations at once: for SO(3), with
+            :py:func:`geometry.quaternion_slerp`; for SO(2), by interpolating
+            the angle of the relative rotation.
+        """
+        A = stack_points(A, (self.n, self.n))
+        B = stack_points(B, (self.n, self.n))
+        t = np.asarray(t, dtype="float64")
+        if self.n == 2:
+            R = self.relative(A, B)
+            theta = t * np.arctan2(R[:, 1, 0], R[:, 0, 0])
+            C = np.cos(theta)
+            S = np.sin(theta)
+            D = np.empty(R.shape)
+            D[:, 0, 0] = C
+            D[:, 0, 1] = -S
+            D[:, 1, 0] = S
+            D[:, 1, 1] = C
+            return np.matmul(A, D)
+        elif self.n == 3:
+            P = quaternions_from_rotations(A)
+            Q = quaternions_from_rotations(B)
+            return rotations_from_quaternions(quaternion_slerp(P, Q, t))
+        else:
+            return MatrixLieGroup.interpolate(self, A, B, t)
+
+    def riemannian_mean(self, points, weights=None, method="geodesic", **params):
+        """
+            Returns the (weighted) mean of the rotations in *points* (a list
+            or a stack), computed with :py:func:`geometry.rotation_mean`;
+            the default is the geodesic L2 (Karcher) mean.
+        """
+        if self.n not in [2, 3]:
+            return MatrixLieGroup.riemannian_mean(self, points)
+        R = stack_points(points, (self.n, self.n))
+        return rotation_mean(R, weights, method=method, **params)
+
+    def distance_matrix(self, A, B=None, **params):
+        """
+            For SO(3), the distances are computed from the quaternion
+            dot products, in blocks; *params* are passed to
+            :py:func:`geometry.rotation_distance_matrix` (e.g., *dtype*,
+            *block_size*, *out*).
+        """
+        if self.n != 3:
+            return MatrixLieGroup.distance_matrix(self, A, B)
+        A = stack_points(A, (3, 3))
+        if B is not None:
+            B = stack_points(B, (3, 3))
+        return rotation_distance_matrix(A, B, **params)
+
+    def group_from_algebra(self, a):
+        """ Closed form of the exponential map (Rodrigues' formula). """
+        if self.n == 2:
+            return SO2_from_so2(a)
+        elif self.n == 3:
+            return SO3_from_so3(a)
+        else:
+            return MatrixLieGroup.group_from_algebra(self, a)
+
+    def algebra_from_group(self, g):
+        """ Closed form of the logarithmic map. """
+        if self.n == 2:
+            return so2_from_SO2(g)
+        elif self.n == 3:
+            return so3_from_SO3(g)
+        else:
+            return MatrixLieGroup.algebra_from_group(self, g)
+
+    def adjoint(self, g):
+        """
+            The matrix of the adjoint map :math:`X \\mapsto g X g^{-1}` in
+            the coordinates of :py:func:`vector_from_algebra`: for SO(3) it
+            is the rotation itself, for SO(2) it is 1.
+        """
+        g = np.asarray(g, dtype="float64")
+        if self.n == 2:
+            return np.ones(g.shape[:-2] + (1, 1))
+        return g.copy()
+
+    def left_jacobian(self, v):
+        """
+            The left Jacobian of the exponential map at the vector *v* of
+            the algebra, that is, the matrix J for which
+            :math:`\\exp(v + d) \\simeq \\exp(J d) \\exp(v)` for small d.
+
+            Closed form, with Taylor series for small angles; *v* can also
+            be a (N,k) stack. For SO(2) it is 1.
+        """
+        if self.n == 2:
+            return np.ones(np.shape(v)[:-1] + (1, 1))
+        return SO3_left_jacobian(np.asarray(v, dtype="float64"))
+
+    def left_jacobian_inverse(self, v):
+        """ The inverse of :py:func:`left_jacobian`. """
+        if self.n == 2:
+            return np.ones(np.shape(v)[:-1] + (1, 1))
+        return SO3_left_jacobian_inverse(np.asarray(v, dtype="float64"))
+
+    def right_jacobian(self, v):
+        """
+            The right Jacobian, for which :math:`\\exp(v + d) \\simeq
+            \\exp(v) \\exp(J d)`; it is the left Jacobian at -v.
+        """
+        return self.left_jacobian(-np.asarray(v, dtype="float64"))
+
+    def right_jacobian_inverse(self, v):
+        """ The inverse of :py:func:`right_jacobian`. """
+        return self.left_jacobian_inverse(-np.asarray(v, dtype="float64"))
 
     def friendly(self, a):
         if self.n == 2:
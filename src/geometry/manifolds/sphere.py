@@ -2,16 +2,43 @@
 from numpy.core.numeric import outer
 
 from contracts import contract, check
-from geometry.basic_utils import normalize_length, normalize_length_or_zero
+from geometry.basic_utils import normalize_length, normalize_length_or_zero, safe_arccos
 from geometry.rotations import rot2d, rotation_from_axis_angle
 from geometry.spheres import any_orthogonal_direction, geodesic_distance_on_sphere, random_direction
+from geometry.spheres import random_directions
 import numpy as np
 
-from .differentiable_manifold import DifferentiableManifold
+from .differentiable_manifold import DifferentiableManifold, stack_points
 
 __all__ = ["Sphere", "Sphere1", "S", "S1", "S2"]
 
 
+def _geodesic_distances_to_point(a, B):
+    """ Vectorized version of :py:func:`geodesic_distance_on_sphere`. """
+    d = safe_arccos(np.dot(B, a))
+    # special case: return a 0 (no precision issues)
+    d[(B == a).all(axis=1)] = 0.0
+    return d
+
+
+def _geodesic_interpolation(A, B, t):
+    """
+        Vectorized version of :py:func:`slerp`, for the stacks of points
+        *A* and *B* and the fractions *t*.
+
+        The angle is computed from the chord, which is accurate also for
+        close points, and the weights sin(k w) / sin(w) are written with
+        sinc(), which has the correct limit for w -> 0. The result is not
+        defined for antipodal points.
+    """
+    t = np.asarray(t, dtype="float64")[..., np.newaxis]
+    omega = 2 * np.arcsin(np.minimum(np.linalg.norm(A - B, axis=-1) / 2, 1))[..., np.newaxis]
+    s = np.sinc(omega / np.pi)
+    wa = (1 - t) * np.sinc((1 - t) * omega / np.pi) / s
+    wb = t * np.sinc(t * omega / np.pi) / s
+    return wa * A + wb * B
+
+
 class Sphere(DifferentiableManifold):
     """ These are hyperspheres of unit radius. """
 
@@ -30,6 +57,14 @@ class Sphere(DifferentiableManifold):
     def distance(self, a, b):
         return geodesic_distance_on_sphere(a, b)
 
+    def distances(self, a, B):
+        return _geodesic_distances_to_point(a, stack_points(B, (self.N,)))
+
+    def interpolate(self, A, B, t):
+        A = stack_points(A, (self.N,))
+        B = stack_points(B, (self.N,))
+        return _geodesic_interpolation(A, B, t)
+
     @contract(base="belongs", p="belongs", returns="belongs_ts")
     def logmap(self, base, p):
         # TODO: create S1_logmap(base, target)
@@ -79,9 +114,11 @@ class Sphere(DifferentiableManifold):
     def belongs(self, x):
         check("array[N],unit_length", x)
 
-    @contract(returns="belongs")
-    def sample_uniform(self):
-        return random_direction(self.N)
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        if n is None:
+            return random_direction(self.N, rng=rng)
+        return random_directions(n, self.N, rng=rng).T
 
     @contract(returns="list(belongs)")
     def interesting_points(self):
@@ -131,6 +168,14 @@ class Sphere1(DifferentiableManifold):
     def distance(self, a, b):
         return geodesic_distance_on_sphere(a, b)
 
+    def distances(self, a, B):
+        return _geodesic_distances_to_point(a, stack_points(B, (2,)))
+
+    def interpolate(self, A, B, t):
+        A = stack_points(A, (2,))
+        B = stack_points(B, (2,))
+        return _geodesic_interpolation(A, B, t)
+
     @contract(base="S1", p="S1", returns="belongs_ts")
     def logmap(self, base, p):
         # TODO: create S1_logmap(base, target)
@@ -166,8 +211,11 @@ class Sphere1(DifferentiableManifold):
     def belongs(self, x):
         pass
 
-    def sample_uniform(self):
-        return random_direction(2)
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        if n is None:
+            return random_direction(2, rng=rng)
+        return random_directions(n, 2, rng=rng).T
 
     def interesting_points(self):
         points = []
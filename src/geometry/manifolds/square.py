@@ -1,8 +1,11 @@
 # coding=utf-8
 from contracts import contract
+from geometry.basic_utils import random_generator
 from geometry.manifolds import DifferentiableManifold, RandomManifold
 import numpy as np
 
+from .differentiable_manifold import stack_points
+
 __all__ = ["Square", "Sq", "Sq1", "Sq2", "Sq3"]
 
 
@@ -24,6 +27,10 @@ class Square(RandomManifold):
         _, vel = self.logmap(a, b)
         return np.linalg.norm(vel)
 
+    def distances(self, a, B):
+        B = stack_points(B, (self.n,))
+        return np.linalg.norm(B - a, axis=1)
+
     def logmap(self, base, p):
         vel = p - base
         return base, vel
@@ -36,8 +43,10 @@ class Square(RandomManifold):
     def project_ts(self, bv):
         return bv  # XXX: more checks
 
-    def sample_uniform(self):
-        return np.random.rand(self.n)
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        shape = (self.n,) if n is None else (n, self.n)
+        return random_generator(rng).random(shape)
 
     @contract(returns="belongs_ts")
     def sample_velocity(self, a):  # @UnusedVariable
@@ -1,6 +1,12 @@
 # coding=utf-8
 from geometry.utils import check_allclose
-from geometry.manifolds.tests import for_all_manifold_point, for_all_manifold_pairs
+from geometry.manifolds import RandomManifold
+from geometry.manifolds.tests import (
+    for_all_manifold_point,
+    for_all_manifold_pairs,
+    for_all_manifolds,
+    get_test_points,
+)
 import numpy as np
 from geometry.formatting import formatm
 
@@ -204,3 +210,35 @@ def test_dimensions():
         actual = M.get_dimension()
         msg = "Expected %d for %s, got %d " % (dim, M, actual)
         assert actual == dim, msg
+
+
+@for_all_manifold_point
+def check_distances_vectorized(M, a):
+    points = get_test_points(M)
+    try:
+        expected = np.array([M.distance(a, b) for b in points])
+    except ValueError:  # distance not supported
+        return
+    d = M.distances(a, points)
+    check_allclose(d, expected, atol=1e-7)
+    if points:
+        check_allclose(M.distances(a, np.array(points)), expected, atol=1e-7)
+    assert M.distances(a, []).shape == (0,)
+    D = M.distance_matrix([a, a], points)
+    assert D.shape == (2, len(points))
+    check_allclose(D[1], expected, atol=1e-7)
+
+
+@for_all_manifolds
+def check_sample_uniform_batch(M):
+    if not isinstance(M, RandomManifold):
+        return
+    points = M.sample_uniform(5, rng=0)
+    assert points.shape[0] == 5
+    assert points.shape[1:] == M.sample_uniform().shape
+    for p in points:
+        M.belongs(p)
+    # same seed, same points; a generator can also be passed
+    check_allclose(M.sample_uniform(5, rng=np.random.default_rng(0)), points)
+    assert M.sample_uniform(0, rng=0).shape == (0,) + points.shape[1:]
+    M.belongs(M.sample_uniform(rng=1))
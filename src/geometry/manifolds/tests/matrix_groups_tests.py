@@ -1,4 +1,12 @@
 # coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import logger
+from geometry.manifolds import SE2, SE3, SO2, SO3, Tran1, Tran2, Tran3
+from geometry.utils import assert_allclose
 from . import for_all_mgroup_point, for_all_mgroup
 
 
@@ -48,3 +56,36 @@ def algebra_enough(M):
     points = list(algebra.interesting_points())
     if not points:
         raise ValueError("No test points for algebra of %s." % M)
+
+
+def closed_form_inverse_test():
+    for M in [SO2, SO3, SE2, SE3, Tran1, Tran2, Tran3]:
+        A = M.sample_uniform(10, rng=0)
+        B = M.sample_uniform(10, rng=1)
+        assert_allclose(M.inverse(A), np.linalg.inv(A), atol=1e-14)
+        assert_allclose(M.inverse(A[0]), np.linalg.inv(A[0]), atol=1e-14)
+        expected = np.matmul(np.linalg.inv(A), B)
+        assert_allclose(M.relative(A, B), expected, atol=1e-14)
+        assert_allclose(M.relative(A[0], B), np.matmul(np.linalg.inv(A[0]), B), atol=1e-14)
+        # b can also be a tangent vector at a
+        _, vel = M.logmap(A[0], B[0])
+        assert_allclose(M.relative(A[0], vel), np.dot(np.linalg.inv(A[0]), vel), atol=1e-14)
+        # the argument is not modified, and the result is not a view
+        A0 = A.copy()
+        M.inverse(A)[:] = 0
+        assert np.all(A == A0)
+
+
+@attr("benchmark")
+def closed_form_inverse_benchmark_test():
+    for M in [SO3, SE3]:
+        A = M.sample_uniform(100000, rng=0)
+        t0 = time.time()
+        np.linalg.inv(A)
+        t1 = time.time()
+        M.inverse(A)
+        t2 = time.time()
+        logger.info(
+            "%s: inverse of 100000 elements  np.linalg.inv: %7.1f ms  closed form: %7.1f ms"
+            % (M, (t1 - t0) * 1000, (t2 - t1) * 1000)
+        )
@@ -0,0 +1,37 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import logger
+from geometry.manifolds import PointSet, SE2, SE3, SO3, S2
+from geometry.utils import assert_allclose
+
+
+def point_set_closest_test():
+    for M in [SO3, SE2, SE3, S2]:
+        points = [M.sample_uniform() for _ in range(20)]
+        ps = PointSet(M, points)
+        p = M.sample_uniform()
+        expected = np.array([M.distance(p, b) for b in points])
+        assert_allclose(ps.distances_to_point(p), expected, atol=1e-7)
+        assert ps.closest_index_to(points[7]) == 7
+        assert_allclose(ps.minimum_distance(p), expected.min(), atol=1e-7)
+
+
+@attr("benchmark")
+def distances_benchmark_test():
+    n = 300
+    for M in [SO3, SE2, SE3]:
+        points = np.array([M.sample_uniform() for _ in range(n)])
+        p = M.sample_uniform()
+        t0 = time.time()
+        expected = np.array([M.distance(p, b) for b in points])
+        t1 = time.time()
+        d = M.distances(p, points)
+        t2 = time.time()
+        assert_allclose(d, expected, atol=1e-7)
+        logger.info(
+            "%s: %d distances  loop: %7.1f ms  vectorized: %7.1f ms" % (M, n, (t1 - t0) * 1000, (t2 - t1) * 1000)
+        )
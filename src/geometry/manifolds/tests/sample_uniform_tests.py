@@ -0,0 +1,51 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import logger
+from geometry.manifolds import S2, SE2, SE3, SO2, SO3
+
+
+def SO2_sample_uniform_test():
+    # the angles cover the whole circle
+    R = SO2.sample_uniform(2000, rng=0)
+    theta = np.arctan2(R[:, 1, 0], R[:, 0, 0])
+    assert (theta < -np.pi / 2).any() and (theta > np.pi / 2).any()
+    assert np.abs(np.mean(np.cos(theta))) < 0.1
+    assert np.abs(np.mean(np.sin(theta))) < 0.1
+
+
+def SO3_sample_uniform_test():
+    # for uniform rotations, E[R] = 0 and the trace is 1 + 2 cos(angle)
+    R = SO3.sample_uniform(4000, rng=1)
+    assert np.abs(R.mean(axis=0)).max() < 0.05
+    tr = np.trace(R, axis1=1, axis2=2)
+    # E[trace] = 0, E[trace^2] = 1 under the Haar measure
+    assert np.abs(tr.mean()) < 0.05
+    assert np.abs((tr ** 2).mean() - 1) < 0.1
+
+
+def sample_uniform_global_state_test():
+    # without rng, the global numpy state is used
+    for M in [S2, SO2, SO3, SE2, SE3]:
+        np.random.seed(5)
+        a = M.sample_uniform(3)
+        np.random.seed(5)
+        assert np.array_equal(a, M.sample_uniform(3))
+
+
+@attr("benchmark")
+def sample_uniform_benchmark_test():
+    n = 1000
+    for M in [S2, SO2, SO3, SE2, SE3]:
+        t0 = time.time()
+        for _ in range(n):
+            M.sample_uniform()
+        t1 = time.time()
+        M.sample_uniform(n, rng=0)
+        t2 = time.time()
+        logger.info(
+            "%s: %d samples  loop: %7.1f ms  batched: %7.1f ms" % (M, n, (t1 - t0) * 1000, (t2 - t1) * 1000)
+        )
@@ -0,0 +1,64 @@
+# coding=utf-8
+import timeit
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import logger, rotation_from_axis_angle, rot2d, set_fast_mode
+from geometry.manifolds import MatrixLieGroup, SO2, SO3
+from geometry.utils import assert_allclose
+
+
+def generic_distance(M, a, b):
+    """ The distance computed with the generic MatrixLieGroup code (logm). """
+    x = M.multiply(M.inverse(a), b)
+    return M.algebra.norm(MatrixLieGroup.algebra_from_group(M, x))
+
+
+def SO3_closed_form_test():
+    for _ in range(20):
+        R = SO3.sample_uniform()
+        W = SO3.algebra_from_group(R)
+        assert_allclose(W, MatrixLieGroup.algebra_from_group(SO3, R), atol=1e-8)
+        assert_allclose(SO3.group_from_algebra(W), MatrixLieGroup.group_from_algebra(SO3, W), atol=1e-10)
+
+
+def SO2_closed_form_test():
+    for theta in [0, 0.1, -1, 3, -3]:
+        R = rot2d(theta)
+        W = SO2.algebra_from_group(R)
+        assert_allclose(W[1, 0], theta)
+        assert_allclose(SO2.group_from_algebra(W), R)
+
+
+def SO3_distance_near_pi_test():
+    axis = np.array([1.0, 2, 2]) / 3
+    for eps in [0, 1e-12, 1e-9, 1e-6, 1e-3]:
+        angle = np.pi - eps
+        R = rotation_from_axis_angle(axis, angle)
+        assert_allclose(SO3.distance(np.eye(3), R), angle, atol=1e-8)
+        W = SO3.algebra_from_group(R)
+        assert_allclose(SO3.group_from_algebra(W), R, atol=1e-10)
+
+
+@attr("benchmark")
+def SO3_log_benchmark_test():
+    a = SO3.sample_uniform()
+    b = SO3.sample_uniform()
+    assert_allclose(SO3.distance(a, b), generic_distance(SO3, a, b), atol=1e-8)
+    number = 100
+
+    def timeit_us(f):
+        return min(timeit.repeat(f, number=number, repeat=3)) / number * 1e6
+
+    t_generic = timeit_us(lambda: MatrixLieGroup.algebra_from_group(SO3, a))
+    t_closed = timeit_us(lambda: SO3.algebra_from_group(a))
+    set_fast_mode(True)
+    try:
+        t_closed_fast = timeit_us(lambda: SO3.algebra_from_group(a))
+    finally:
+        set_fast_mode(False)
+    logger.info(
+        "SO3.algebra_from_group  generic (logm): %7.1f us  closed form: %7.1f us  (fast mode: %7.1f us)"
+        % (t_generic, t_closed, t_closed_fast)
+    )
@@ -0,0 +1,162 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import cumulative_products, logger, SE2_from_xythetas
+from geometry.manifolds import S2, SE2, SE3, SO3, Trajectory, resample
+from geometry.utils import assert_allclose
+
+
+def compose_loop(start, increments):
+    """ Reference implementation, one product at a time. """
+    poses = [start]
+    for d in increments:
+        poses.append(np.dot(poses[-1], d))
+    return np.array(poses)
+
+
+def cumulative_products_test():
+    for n in [1, 2, 7, 64, 100]:
+        D = SE3.sample_uniform(n, rng=n)
+        assert_allclose(cumulative_products(D), compose_loop(D[0], D[1:]), atol=1e-12)
+
+
+def trajectory_from_increments_test():
+    for M in [SE2, SE3]:
+        D = M.sample_uniform(200, rng=0)
+        start = M.sample_uniform(rng=1)
+        traj = Trajectory.from_increments(M, D, start=start)
+        assert len(traj) == 201
+        assert_allclose(traj.poses, compose_loop(start, D), atol=1e-12)
+        assert_allclose(traj.increments(), D, atol=1e-12)
+        i = np.array([0, 5, 100])
+        j = np.array([3, 5, 200])
+        expected = np.matmul(np.linalg.inv(traj.poses[i]), traj.poses[j])
+        assert_allclose(traj.relative(i, j), expected, atol=1e-12)
+        assert_allclose(traj.relative(1, 2), D[1], atol=1e-12)
+        assert_allclose(Trajectory.from_increments(M, D[:0]).poses, [M.unity()])
+
+
+def trajectory_append_test():
+    D = SE2.sample_uniform(100, rng=2)
+    expected = Trajectory.from_increments(SE2, D)
+    traj = Trajectory(SE2)
+    for p in expected.poses[:50]:
+        traj.append(p)
+    traj.append(expected.poses[50:60])
+    traj.append_increments(D[59])
+    traj.append_increments(D[60:])
+    assert len(traj) == 101
+    assert_allclose(traj.poses, expected.poses, atol=1e-12)
+
+
+def trajectory_slicing_test():
+    traj = Trajectory.from_increments(SE2, SE2.sample_uniform(30, rng=3))
+    part = traj[10:20]
+    assert isinstance(part, Trajectory) and len(part) == 10
+    assert np.shares_memory(part.poses, traj.poses)
+    assert np.all(part[0] == traj[10])
+    assert len(traj[::2]) == 16
+    # appending to a slice does not modify the original
+    before = traj.poses.copy()
+    part.append(SE2.unity())
+    assert len(part) == 11
+    assert np.all(traj.poses == before)
+    assert len(list(traj)) == 31
+
+
+def interpolate_test():
+    for M in [SO3, SE2, SE3, S2]:
+        A = M.sample_uniform(20, rng=4)
+        B = M.sample_uniform(20, rng=5)
+        t = np.random.rand(20)
+        params = dict(screw=True) if M in [SE2, SE3] else {}
+        expected = np.array([M.geodesic(a, b, ti) for a, b, ti in zip(A, B, t)])
+        assert_allclose(M.interpolate(A, B, t, **params), expected, atol=1e-12)
+        assert_allclose(M.interpolate(A, B, 0.0, **params), A, atol=1e-12)
+        assert_allclose(M.interpolate(A, B, 1.0, **params), B, atol=1e-12)
+
+
+def interpolate_slerp_linear_test():
+    A = SE3.sample_uniform(10, rng=6)
+    B = SE3.sample_uniform(10, rng=7)
+    P = SE3.interpolate(A, B, 0.25)
+    assert_allclose(P[:, :3, :3], SO3.interpolate(A[:, :3, :3], B[:, :3, :3], 0.25), atol=1e-12)
+    assert_allclose(P[:, :3, 3], 0.75 * A[:, :3, 3] + 0.25 * B[:, :3, 3], atol=1e-12)
+    assert_allclose(P[:, 3], np.tile([0, 0, 0, 1], (10, 1)))
+    # which is not the geodesic, unlike screw=True
+    for M in [SE2, SE3]:
+        A = M.sample_uniform(10, rng=8)
+        B = M.sample_uniform(10, rng=9)
+        geodesic = np.array([M.geodesic(a, b, 0.25) for a, b in zip(A, B)])
+        assert np.abs(M.interpolate(A, B, 0.25) - geodesic).max() > 0.01
+        assert_allclose(M.interpolate(A, B, 0.25, screw=True), geodesic, atol=1e-12)
+
+
+def resample_test():
+    times = np.array([0.0, 1.0, 1.0, 3.0])
+    points = S2.sample_uniform(4, rng=8)
+    new_times = np.array([0.0, 0.5, 1.0, 2.0, 3.0])
+    P = resample(S2, times, points, new_times)
+    assert_allclose(P[0], points[0], atol=1e-12)
+    assert_allclose(P[1], S2.geodesic(points[0], points[1], 0.5), atol=1e-12)
+    assert_allclose(P[2], points[2], atol=1e-12)
+    assert_allclose(P[3], S2.geodesic(points[2], points[3], 0.5), atol=1e-12)
+    assert_allclose(P[4], points[3], atol=1e-12)
+    assert_allclose(resample(S2, times[:1], points[:1], times[:1]), points[:1])
+    for bad in [np.array([-0.1]), np.array([3.1])]:
+        try:
+            resample(S2, times, points, bad)
+        except ValueError:
+            pass
+        else:
+            raise Exception("Expected ValueError for %s" % bad)
+
+
+def trajectory_resample_test():
+    traj = Trajectory.from_increments(SE2, SE2_from_xythetas(np.random.randn(50, 3) * 0.1))
+    times = np.cumsum(np.random.rand(51))
+    new_times = np.linspace(times[0], times[-1], 200)
+    for screw in [False, True]:
+        part = traj.resample(times, new_times, screw=screw)
+        assert isinstance(part, Trajectory) and len(part) == 200
+        assert_allclose(traj.resample(times, times, screw=screw).poses, traj.poses, atol=1e-12)
+
+
+@attr("benchmark")
+def resample_benchmark_test():
+    n, m = 1000, 10000
+    poses = SE3.sample_uniform(n, rng=0)
+    times = np.cumsum(np.random.rand(n))
+    new_times = np.linspace(times[0], times[-1], m)
+    for screw in [False, True]:
+        t0 = time.time()
+        resample(SE3, times, poses, new_times, screw=screw)
+        t1 = time.time()
+        logger.info("resample() of %d SE3 poses (screw=%s): %7.1f ms" % (m, screw, (t1 - t0) * 1000))
+    t0 = time.time()
+    for i in range(100):
+        SE3.geodesic(poses[i], poses[i + 1], 0.5)
+    t1 = time.time()
+    logger.info("geodesic(), one call per pose: %7.1f ms for %d poses (extrapolated)" % ((t1 - t0) * 1000 * m / 100, m))
+
+
+@attr("benchmark")
+def trajectory_benchmark_test():
+    n = 100000
+    D = SE3.sample_uniform(n, rng=0)
+    t0 = time.time()
+    Trajectory.from_increments(SE3, D)
+    t1 = time.time()
+    compose_loop(np.eye(4), D)
+    t2 = time.time()
+    traj = Trajectory(SE3)
+    for p in D[:20000]:
+        traj.append(p)
+    t3 = time.time()
+    logger.info(
+        "Trajectory of %d poses  prefix scan: %7.1f ms  loop: %7.1f ms;  20000 appends: %7.1f ms"
+        % (n, (t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000)
+    )
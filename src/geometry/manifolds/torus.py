@@ -1,9 +1,10 @@
 # coding=utf-8
 from contracts import contract
+from geometry.basic_utils import random_generator
 from geometry.spheres import normalize_pi
 import numpy as np
 
-from .differentiable_manifold import DifferentiableManifold
+from .differentiable_manifold import DifferentiableManifold, stack_points
 
 __all__ = ["Torus", "T", "T1", "T2", "T3"]
 
@@ -22,6 +23,12 @@ class Torus(DifferentiableManifold):
         b = self.normalize(b - a)
         return np.linalg.norm(b)
 
+    def distances(self, a, B):
+        diff = stack_points(B, (self.n,)) - a
+        # as normalize(), but the sign at pi does not matter here
+        diff = np.arctan2(np.sin(diff), np.cos(diff))
+        return np.linalg.norm(diff, axis=1)
+
     def logmap(self, base, p):
         vel = self.normalize(p - base)
         return base, vel
@@ -34,9 +41,10 @@ class Torus(DifferentiableManifold):
     def project_ts(self, bv):
         return bv  # XXX: more checks
 
-    @contract(returns="belongs")
-    def sample_uniform(self):
-        return np.random.rand(self.n) * 2 * np.pi - np.pi
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        shape = (self.n,) if n is None else (n, self.n)
+        return random_generator(rng).random(shape) * 2 * np.pi - np.pi
 
     def normalize(self, a):
         return normalize_pi(a)
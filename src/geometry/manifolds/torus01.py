@@ -1,8 +1,9 @@
 # coding=utf-8
 from contracts import contract
+from geometry.basic_utils import random_generator
 import numpy as np
 
-from .differentiable_manifold import DifferentiableManifold
+from .differentiable_manifold import DifferentiableManifold, stack_points
 from .differentiable_manifold import RandomManifold
 
 __all__ = ["TorusW", "TorusW", "Ts", "Ts1", "Ts2", "Ts3"]
@@ -35,6 +36,15 @@ class TorusW(RandomManifold):
         _, vel = self.logmap(a, b)
         return np.linalg.norm(vel)
 
+    def distances(self, a, B):
+        B = stack_points(B, (self.n,))
+        vel = self.normalize(B) - self.normalize(a)
+        # same as logmap(), for all points at once
+        w = self.widths
+        vel = np.where(vel > w / 2.0, vel - w, vel)
+        vel = np.where(vel < -w / 2.0, vel + w, vel)
+        return np.linalg.norm(vel, axis=1)
+
     def logmap(self, base, p):
         a1 = self.normalize(base)
         b1 = self.normalize(p)
@@ -73,9 +83,10 @@ class TorusW(RandomManifold):
     def project_ts(self, bv):
         return bv  # XXX: more checks
 
-    @contract(returns="belongs")
-    def sample_uniform(self):
-        return (np.random.rand(self.n) - 0.5) * 10 * self.widths
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        shape = (self.n,) if n is None else (n, self.n)
+        return (random_generator(rng).random(shape) - 0.5) * 10 * self.widths
 
     @contract(returns="belongs_ts")
     def sample_velocity(self, a):  # @UnusedVariable
@@ -0,0 +1,158 @@
+# coding=utf-8
+import numpy as np
+from contracts import contract
+
+from geometry.poses import cumulative_products
+from .differentiable_manifold import DifferentiableManifold
+from .matrix_lie_group import MatrixLieGroup
+
+__all__ = ["Trajectory", "resample"]
+
+
+@contract(manifold=DifferentiableManifold, times="array[N](float|int),N>=1", new_times="array[M](float|int)")
+def resample(manifold, times, points, new_times, **params):
+    """
+        Interpolates the time series *points* (a stack of N points on
+        *manifold*, at the nondecreasing *times*) at the M *new_times*,
+        which must be within [times[0], times[-1]]; returns the stack
+        of M points.
+
+        Each time is located among the samples with ``np.searchsorted``,
+        and then all the points are computed at once by the manifold's
+        ``interpolate()`` (e.g., slerp for SO3 and S2, and slerp plus
+        linear translation for SE2 and SE3, which is not their geodesic;
+        pass ``screw=True`` for the screw motion of the geodesic);
+        *params* are passed to it.
+    """
+    times = np.asarray(times, dtype="float64")
+    new_times = np.asarray(new_times, dtype="float64")
+    if np.any(np.diff(times) < 0):
+        raise ValueError("The times must be sorted.")
+    if len(new_times) > 0 and (new_times.min() < times[0] or new_times.max() > times[-1]):
+        msg = "The new times must be within [%s, %s]." % (times[0], times[-1])
+        raise ValueError(msg)
+    points = np.asarray(points, dtype="float64")
+    n = len(times)
+    i = np.clip(np.searchsorted(times, new_times, side="right") - 1, 0, max(n - 2, 0))
+    j = np.minimum(i + 1, n - 1)
+    dt = times[j] - times[i]
+    nonzero = dt > 0
+    alpha = np.zeros(len(new_times))
+    alpha[nonzero] = (new_times[nonzero] - times[i][nonzero]) / dt[nonzero]
+    return manifold.interpolate(points[i], points[j], alpha, **params)
+
+
+class Trajectory(object):
+    """
+        A sequence of elements of a matrix Lie group (typically, poses in
+        SE2 or SE3), stored in a contiguous (N,n,n) buffer: ::
+
+            traj = Trajectory.from_increments(SE2, odometry)
+            traj.append(pose)
+            traj.poses        # (N,3,3) array, not a copy
+            traj[10:20]       # a Trajectory sharing the same buffer
+            traj.relative(i, j)
+
+        The buffer grows geometrically, so appending one pose at a time
+        costs amortized O(1) copies. A slice shares the buffer with the
+        original, but it has no spare capacity: appending to the slice
+        first copies it, so that the original is never modified.
+    """
+
+    @contract(group=MatrixLieGroup)
+    def __init__(self, group, poses=None):
+        """
+            :param group: The group, such as SE2 or SE3; its
+                ``relative()`` must accept stacks.
+            :param poses: Initial (N,n,n) poses; the array is used as
+                the buffer, without copying it.
+        """
+        self.group = group
+        n = group.n
+        if poses is None:
+            poses = np.empty((0, n, n))
+        self._buffer = np.asarray(poses, dtype="float64").reshape(-1, n, n)
+        self._n = len(self._buffer)
+
+    @classmethod
+    @contract(group=MatrixLieGroup, increments="array[NxKxK]")
+    def from_increments(cls, group, increments, start=None):
+        """
+            Returns the trajectory starting at *start* (default: the
+            identity) obtained composing the relative poses *increments*:
+            P_0 = start, P_{i+1} = P_i D_i. The composition is
+            computed with :py:func:`geometry.cumulative_products`.
+        """
+        n = group.n
+        M = np.empty((len(increments) + 1, n, n))
+        M[0] = group.unity() if start is None else start
+        M[1:] = increments
+        return cls(group, cumulative_products(M))
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def poses(self):
+        """ The (N,n,n) array of poses (not a copy). """
+        return self._buffer[: self._n]
+
+    def __getitem__(self, index):
+        """
+            An integer gives a pose, a slice gives a Trajectory;
+            neither is a copy.
+        """
+        if isinstance(index, slice):
+            return Trajectory(self.group, self.poses[index])
+        return self.poses[index]
+
+    def __iter__(self):
+        return iter(self.poses)
+
+    @contract(poses="array[KxK]|array[NxKxK]")
+    def append(self, poses):
+        """ Appends a pose, or a stack of poses. """
+        new = np.reshape(poses, (-1,) + self._buffer.shape[1:])
+        m = len(new)
+        n = self._n
+        capacity = len(self._buffer)
+        if n + m > capacity:
+            capacity = max(n + m, 2 * capacity, 16)
+            buffer = np.empty((capacity,) + self._buffer.shape[1:])
+            buffer[:n] = self._buffer[:n]
+            self._buffer = buffer
+        self._buffer[n : n + m] = new
+        self._n = n + m
+
+    @contract(increments="array[KxK]|array[NxKxK]")
+    def append_increments(self, increments):
+        """
+            Appends the poses obtained composing the relative poses
+            *increments*, starting from the last pose.
+        """
+        if self._n == 0:
+            raise ValueError("Cannot append increments to an empty trajectory.")
+        increments = np.reshape(increments, (-1,) + self._buffer.shape[1:])
+        M = np.concatenate([self.poses[-1:], increments])
+        self.append(cumulative_products(M)[1:])
+
+    def increments(self):
+        """ Returns the (N-1,n,n) relative poses between consecutive poses. """
+        P = self.poses
+        return self.group.relative(P[:-1], P[1:])
+
+    def relative(self, i, j):
+        """
+            Returns the pose *j* relative to the pose *i*, that is,
+            :math:`P_i^{-1} P_j`; *i* and *j* can be arrays of indices,
+            for many pairs at once.
+        """
+        P = self.poses
+        return self.group.relative(P[i], P[j])
+
+    def resample(self, times, new_times, **params):
+        """
+            Returns the trajectory interpolated at *new_times*, given the
+            *times* of the poses; see :py:func:`resample`.
+        """
+        return Trajectory(self.group, resample(self.group, times, self.poses, new_times, **params))
@@ -37,10 +37,28 @@ class TranG(MatrixLieGroup):
         assert_allclose(zero, 0, err_msg="I expect the lower row to be 0.")
         assert_allclose(one, 1, err_msg="Bottom-right must be 1.")
 
-    @contract(returns="belongs")
-    def sample_uniform(self):
-        t = self.En.sample_uniform()
-        return pose_from_rotation_translation(np.eye(self.n - 1), t)
+    @contract(n="None|(int,>=0)")
+    def sample_uniform(self, n=None, rng=None):
+        t = self.En.sample_uniform(n, rng=rng)
+        if n is None:
+            return pose_from_rotation_translation(np.eye(self.n - 1), t)
+        P = np.zeros((n, self.n, self.n))
+        P[:] = np.eye(self.n)
+        P[:, :-1, -1] = t
+        return P
+
+    def inverse(self, g):
+        """ The inverse of a translation (or of a stack) changes the sign of t. """
+        h = np.array(g, dtype="float64")
+        h[..., :-1, -1] *= -1
+        return h
+
+    def relative(self, a, b):
+        a = np.asarray(a)
+        b = np.asarray(b)
+        r = np.array(np.broadcast_to(b, np.broadcast(a, b).shape), dtype="float64")
+        r[..., :-1, :] -= a[..., :-1, -1:] * b[..., -1:, :]
+        return r
 
     def friendly(self, a):
         t = rotation_translation_from_pose(a)[1]
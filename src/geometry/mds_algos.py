@@ -1,68 +1,102 @@
 # coding=utf-8
-import itertools
+import functools
+import time
 
 import numpy as np
 from contracts import check_multiple, contract
 
 from . import logger, eigh
+from .basic_utils import random_generator
+from .constants import GeometryConstants
 from .formatting import formatm
-from .procrustes import best_similarity_transform
 from .spheres import project_vectors_onto_sphere
-from .utils import assert_allclose
 
 __all__ = [
     "euclidean_distances",
     "double_center",
     "inner_product_embedding_slow",
     "inner_product_embedding",
+    "choose_embedding_solver",
     "truncated_svd_randomized",
     "inner_product_embedding_randomized",
     "mds",
     "spherical_mds",
     "mds_randomized",
+    "mds_implicit",
     "place",
+    "LandmarkMDS",
+    "landmark_mds",
 ]
 
 
-@contract(S="array[KxN]", returns="array[NxN](>=0)")
-def euclidean_distances(S):
-    """ Computes the euclidean distance matrix for the given points. """
+@contract(S="array[KxN]", block_size="None|(int,>0)", returns="array[NxN]")
+def euclidean_distances(S, dtype="float64", block_size=None, out=None):
+    """
+        Computes the euclidean distance matrix for the given points.
+
+        The squared distances are obtained from the Gram matrix as
+        |x|^2 + |y|^2 - 2 <x,y>, after centering the points to limit the
+        cancellation. The diagonal is exactly zero, and the entries are
+        clipped to be nonnegative (not checked by the contract, as that
+        would cost more than the computation).
+
+        :param dtype: Type of the result (e.g., "float32" to halve the memory).
+        :param block_size: The rows are computed in blocks of this size,
+            so that the temporary memory is O(block_size * N). By default,
+            all at once for a float64 result, and in blocks of 1024 rows
+            for a smaller *dtype* or with *out*, where a NxN float64
+            temporary would defeat the purpose.
+        :param out: Optional NxN array (e.g., a memory-mapped file)
+            in which to write the result.
+    """
     K, N = S.shape
-    D = np.zeros((N, N))
-    for i in range(N):
-        p = S[:, i]
-        pp = np.tile(p, (N, 1)).T
-        assert pp.shape == (K, N)
-        d2 = ((S - pp) * (S - pp)).sum(axis=0)
-        d2 = np.maximum(d2, 0)
-        D[i, :] = np.sqrt(d2)
-    return D
-
-
-def double_center(P):
-    n = P.shape[0]
-
-    grand_mean = P.mean()
-    row_mean = np.zeros(n)
-    col_mean = np.zeros(n)
-    for i in range(n):
-        row_mean[i] = P[i, :].mean()
-        col_mean[i] = P[:, i].mean()
-
-    R = row_mean.reshape(n, 1).repeat(n, axis=1)
-    assert R.shape == (n, n)
-    C = col_mean.reshape(1, n).repeat(n, axis=0)
-    assert C.shape == (n, n)
-
-    B2 = -0.5 * (P - R - C + grand_mean)
+    S = np.asarray(S, dtype="float64")
+    X = S - S.mean(axis=1).reshape(K, 1)
+    norms2 = (X * X).sum(axis=0)
+    if block_size is None:
+        at_once = out is None and np.dtype(dtype) == np.float64
+        block_size = N if at_once else min(N, 1024)
+    if out is None:
+        out = np.empty((N, N), dtype=dtype)
+    # the products are computed directly in out if possible
+    direct = out.dtype == np.float64 and out.flags.c_contiguous
+    buffer = None if direct else np.empty((min(N, block_size), N))
+    for i0 in range(0, N, block_size):
+        i1 = min(N, i0 + block_size)
+        d2 = np.dot(X[:, i0:i1].T, X, out=out[i0:i1] if direct else buffer[: i1 - i0])
+        d2 *= -2
+        d2 += norms2[i0:i1].reshape(i1 - i0, 1)
+        d2 += norms2.reshape(1, N)
+        np.maximum(d2, 0, out=d2)
+        np.sqrt(d2, out=d2)
+        if not direct:
+            out[i0:i1, :] = d2
+        diagonal = np.arange(i0, i1)
+        out[diagonal, diagonal] = 0
+    return out
+
+
+def double_center(P, out=None):
+    """
+        Returns the double-centered matrix -0.5 * J P J,
+        where J = I - 11^T/n is the centering matrix.
 
-    if False:
-        B = np.zeros(P.shape)
-        for i, j in itertools.product(range(n), range(n)):
-            B[i, j] = -0.5 * (P[i, j] - col_mean[j] - row_mean[i] + grand_mean)
-        assert_allclose(B2, B)
+        If *out* is given (possibly *P* itself), the result is written
+        there and no other NxN temporary is allocated.
+    """
+    n = P.shape[0]
+    row_mean = P.mean(axis=1).reshape(n, 1)
+    col_mean = P.mean(axis=0).reshape(1, n)
+    grand_mean = row_mean.mean()
 
-    return B2
+    if out is None:
+        B = P - row_mean
+    else:
+        B = np.subtract(P, row_mean, out=out)
+    B -= col_mean
+    B += grand_mean
+    B *= -0.5
+    return B
 
 
 @contract(C="array[NxN]", ndim="int,>0,K", returns="array[KxN]")
@@ -75,19 +109,104 @@ def inner_product_embedding_slow(C, ndim):
     return coords
 
 
-@contract(C="array[NxN]", ndim="int,>1,K", returns="array[KxN]")
-def inner_product_embedding(C, ndim):
+def _eigh_top(C, ndim):
+    """ The top *ndim* eigenpairs, in ascending order, from LAPACK. """
+    n = C.shape[0]
+    subset = (n - ndim, n - 1)
+    try:
+        return eigh(C, subset_by_index=subset)
+    except TypeError:  # Scipy < 1.5
+        return eigh(C, eigvals=subset)
+
+
+def _eigh_arpack(C, ndim, tol=0):
+    from scipy.sparse.linalg import eigsh
+
+    return eigsh(C, k=ndim, which="LA", tol=tol)
+
+
+def _eigh_lobpcg(C, ndim, tol=None, maxiter=200, rng=None):
+    from scipy.sparse.linalg import lobpcg
+
+    rng = random_generator(rng)
+    X0 = rng.standard_normal(size=(C.shape[0], ndim))
+    S, V = lobpcg(C, X0, largest=True, tol=tol, maxiter=maxiter)
+    return S, V
+
+
+def _eigh_randomized(C, ndim, **params):
+    """
+        The SVD ranks the eigenvalues by absolute value and loses their
+        sign; the eigenvalues are recovered as the Rayleigh quotients
+        v^T C v, so that the negative ones (e.g., from non-Euclidean
+        distances) are not mistaken for positive ones.
+    """
+    U, S, V = truncated_svd_randomized(C, ndim, **params)  # @UnusedVariable
+    S = (V * np.dot(V, C)).sum(axis=1)
+    return S, V.T
+
+
+_eigh_solvers = {
+    "lapack": _eigh_top,
+    "arpack": _eigh_arpack,
+    "lobpcg": _eigh_lobpcg,
+    "randomized": _eigh_randomized,
+}
+
+
+def choose_embedding_solver(n, ndim):
+    """
+        The solver used by :py:func:`inner_product_embedding` for
+        ``solver="auto"``: LAPACK for small matrices (the threshold is in
+        :py:class:`GeometryConstants`), and ARPACK (Lanczos) otherwise.
+
+        The randomized SVD is never chosen: it finds the eigenvalues
+        largest in absolute value, which are not the top ones if *C*
+        has large negative eigenvalues, as it happens for the
+        distances on a manifold. Neither is LOBPCG, which can stall
+        on the exactly rank-deficient matrices of Euclidean distances.
+    """
+    if n <= GeometryConstants.mds_lapack_max_n or ndim >= n - 1:
+        return "lapack"
+    return "arpack"
+
+
+@contract(C="array[NxN]", ndim="int,>1,K", solver="str", returns="array[KxN]")
+def inner_product_embedding(C, ndim, solver="auto", **params):
+    """
+        Best embedding of the inner product matrix *C* in *ndim*
+        dimensions, from its top eigenvectors; the rows of the result
+        are sorted by increasing eigenvalue.
+
+        :param solver: One of ``"lapack"`` (dense, only the needed
+            eigenvalues), ``"arpack"`` (Lanczos), ``"lobpcg"``,
+            ``"randomized"`` (see :py:func:`truncated_svd_randomized`), or
+            ``"auto"`` (see :py:func:`choose_embedding_solver`).
+        :param params: Passed to the solver: ``tol`` for ``"arpack"``;
+            ``tol``, ``maxiter``, ``rng`` for ``"lobpcg"``; the arguments
+            of :py:func:`truncated_svd_randomized` for ``"randomized"``;
+            none for ``"lapack"``. Other keywords raise TypeError.
+    """
     n = C.shape[0]
     if ndim > n:
         msg = "Number of points: %s  Dimensions: %s" % (n, ndim)
         raise ValueError(msg)
 
-    eigvals = (n - ndim, n - 1)
-    print(n, eigvals)
-    S, V = eigh(C, eigvals=eigvals)
+    if solver == "auto":
+        solver = choose_embedding_solver(n, ndim)
+    if solver not in _eigh_solvers:
+        msg = "Unknown solver %r; use one of %s." % (solver, sorted(_eigh_solvers))
+        raise ValueError(msg)
 
-    if S.size >= 2:
-        assert S[0] <= S[1]  # eigh returns in ascending order
+    t0 = time.time()
+    S, V = _eigh_solvers[solver](C, ndim, **params)
+    order = np.argsort(S)
+    S = S[order]
+    V = V[:, order]
+    logger.debug(
+        "inner_product_embedding: N = %d  ndim = %d  solver = %s  %.1f ms"
+        % (n, ndim, solver, (time.time() - t0) * 1000)
+    )
 
     if np.any(S < 0):
         msg = "The cosine matrix singular values are not all positive: \n"
@@ -99,34 +218,98 @@ def inner_product_embedding(C, ndim):
 
     assert V.shape == (n, ndim)
     assert S.shape == (ndim,)
-    #    check_multiple([('K', ndim),
-    #                    ('array[NxK]', V),
-    #                    ('array[K]', S)])
-    coords = V.T
-    for i in range(ndim):
-        assert S[i] >= 0
-        coords[i, :] = coords[i, :] * np.sqrt(S[i])
+    coords = V.T * np.sqrt(S).reshape(ndim, 1)
     return coords
 
 
-def truncated_svd_randomized(M, k):
-    """ Truncated SVD based on randomized projections. """
-    p = k + 5  # TODO: add parameter
-    Y = np.dot(M, np.random.normal(size=(M.shape[1], p)))
-    Q, r = np.linalg.qr(Y)  # @UnusedVariable
+@contract(k="int,>=1", oversampling="int,>=0", n_iter="int,>=0", method="str")
+def truncated_svd_randomized(M, k, oversampling=10, n_iter=2, rng=None, method="subspace", block_size=1024):
+    """
+        Truncated SVD based on randomized projections (Halko, Martinsson
+        & Tropp, 2011). Returns U, s, V with M ~ U diag(s) V, where U is
+        m x k, s has length k, and V is k x n.
+
+        :param oversampling: Number of extra random directions.
+        :param n_iter: Number of power iterations; each costs two passes
+            on M, and they are needed when the spectrum decays slowly.
+        :param rng: For the random projections; see
+            :py:func:`random_generator`.
+        :param method: One of
+
+            - ``"subspace"``: subspace (power) iterations, re-orthonormalized
+              at every step.
+            - ``"krylov"``: block Krylov iterations, which keep the whole
+              Krylov space of the power iterations; it is more accurate for
+              the same number of passes, but the basis grows by
+              k + oversampling columns at each iteration.
+            - ``"single_pass"``: reads M only once, by blocks of
+              *block_size* rows (e.g., a memory-mapped or streamed matrix),
+              and ignores *n_iter*.
+    """
+    rng = random_generator(rng)
+    m, n = M.shape
+    p = min(k + oversampling, m, n)
+
+    if method == "single_pass":
+        return _truncated_svd_single_pass(M, k, p, rng, block_size)
+
+    Y = np.dot(M, rng.standard_normal(size=(n, p)))
+    Q, _ = np.linalg.qr(Y)
+    if method == "subspace":
+        for _ in range(n_iter):
+            Z, _ = np.linalg.qr(np.dot(M.T, Q))
+            Q, _ = np.linalg.qr(np.dot(M, Z))
+    elif method == "krylov":
+        basis = [Q]
+        for _ in range(n_iter):
+            Z, _ = np.linalg.qr(np.dot(M.T, Q))
+            Q, _ = np.linalg.qr(np.dot(M, Z))
+            basis.append(Q)
+        Q, _ = np.linalg.qr(np.hstack(basis))
+    else:
+        msg = "Unknown method %r; use subspace, krylov, or single_pass." % method
+        raise ValueError(msg)
+
     B = np.dot(Q.T, M)
-    Uhat, s, v = np.linalg.svd(B, full_matrices=False)
+    Uhat, s, V = np.linalg.svd(B, full_matrices=False)
+    U = np.dot(Q, Uhat)
+    return U[:, :k], s[:k], V[:k]
+
+
+def _truncated_svd_single_pass(M, k, p, rng, block_size):
+    """
+        Single-pass sketch: Y = M Omega and Z = Psi M are accumulated
+        in the same pass over the rows of M; then M ~ Q (Psi Q)^+ Z,
+        with Q an orthonormal basis of Y.
+    """
+    m, n = M.shape
+    l2 = min(2 * p + 1, m)
+    Omega = rng.standard_normal(size=(n, p))
+    Psi = rng.standard_normal(size=(l2, m))
+    Y = np.empty((m, p))
+    Z = np.zeros((l2, n))
+    for i0 in range(0, m, block_size):
+        i1 = min(m, i0 + block_size)
+        block = np.asarray(M[i0:i1, :])
+        Y[i0:i1, :] = np.dot(block, Omega)
+        Z += np.dot(Psi[:, i0:i1], block)
+    Q, _ = np.linalg.qr(Y)
+    B = np.linalg.lstsq(np.dot(Psi, Q), Z, rcond=None)[0]
+    Uhat, s, V = np.linalg.svd(B, full_matrices=False)
     U = np.dot(Q, Uhat)
-    return U.T[:k].T, s[:k], v[:k]
+    return U[:, :k], s[:k], V[:k]
 
 
 @contract(C="array[NxN]", ndim="int,>0,K", returns="array[KxN]")
-def inner_product_embedding_randomized(C, ndim):
+def inner_product_embedding_randomized(C, ndim, **params):
     """
         Best embedding of inner product matrix based on
         randomized projections.
+
+        The keyword arguments (*oversampling*, *n_iter*, *rng*, *method*,
+        *block_size*) are passed to :py:func:`truncated_svd_randomized`.
     """
-    U, S, V = truncated_svd_randomized(C, ndim)  # @UnusedVariable.
+    U, S, V = truncated_svd_randomized(C, ndim, **params)  # @UnusedVariable.
     check_multiple([("K", ndim), ("array[KxN]", V), ("array[K]", S)])
     coords = V
     for i in range(ndim):
@@ -134,27 +317,100 @@ def inner_product_embedding_randomized(C, ndim):
     return coords
 
 
-@contract(D="distance_matrix,array[MxM](>=0)", ndim="K,int,>=1", returns="array[KxM]")
-def mds(D, ndim, embed=inner_product_embedding):
-    #    if D.dtype != np.float64:
-    #        D = D.astype(np.float64)
+def check_zero_diagonal(D):
     diag = D.diagonal()
     # the diagonal should be zero
     if not np.allclose(diag, 0):
         msg = "The diagonal of the distance matrix should be zero."
         msg += "Here are all the entries: %s" % diag.tolist()
-        raise ValueError(diag)
-    # assert_allclose(diag, 0, atol=1e-09)
+        raise ValueError(msg)
+
+
+@contract(D="distance_matrix,array[MxM](>=0)", ndim="K,int,>=1", returns="array[KxM]")
+def mds(D, ndim, embed=inner_product_embedding, overwrite_D=False):
+    """
+        Classical multidimensional scaling.
+
+        If *overwrite_D* is True, the squared distances and the centered
+        matrix are computed in place in *D*, which is destroyed; this
+        avoids two NxN copies.
+    """
+    check_zero_diagonal(D)
     # Find centered cosine matrix
-    P = D * D
-    B = double_center(P)
+    if overwrite_D:
+        P = np.multiply(D, D, out=D)
+        B = double_center(P, out=P)
+    else:
+        P = D * D
+        B = double_center(P)
     return embed(B, ndim)
 
 
+@contract(D="array[MxM]", ndim="K,int,>=1", block_size="int,>0", returns="array[KxM]")
+def mds_implicit(D, ndim, block_size=1024, tol=0):
+    """
+        Classical MDS for large matrices, that never forms the
+        centered matrix B = -0.5 J (D*D) J.
+
+        B is represented implicitly as a
+        ``scipy.sparse.linalg.LinearOperator``, whose products are computed
+        reading *D* by blocks of *block_size* rows, and the top eigenvectors
+        are found with Lanczos iterations (``eigsh``). Therefore *D* can be a
+        memory-mapped array (``np.memmap``), and the memory used is
+        O(block_size * N) besides the output.
+
+        Only the diagonal of D is checked.
+
+        :param tol: Relative tolerance for the eigenvalues (0 is machine
+            precision), passed to ``eigsh``.
+    """
+    from scipy.sparse.linalg import LinearOperator, eigsh
+
+    check_zero_diagonal(D)
+    n = D.shape[0]
+    if ndim >= n:
+        msg = "Number of points: %s  Dimensions: %s" % (n, ndim)
+        raise ValueError(msg)
+
+    def matmat(X):
+        X = X.reshape(n, -1)
+        # B X = -0.5 J P J X
+        Y = X - X.mean(axis=0)
+        Z = np.empty(Y.shape)
+        for i0 in range(0, n, block_size):
+            i1 = min(n, i0 + block_size)
+            block = np.square(D[i0:i1, :], dtype="float64")
+            Z[i0:i1, :] = np.dot(block, Y)
+        Z -= Z.mean(axis=0)
+        Z *= -0.5
+        return Z
+
+    B = LinearOperator((n, n), matvec=matmat, matmat=matmat, dtype="float64")
+    S, V = eigsh(B, k=ndim, which="LA", tol=tol)
+    order = np.argsort(S)
+    S = S[order]
+    V = V[:, order]
+
+    if np.any(S < 0):
+        msg = "The cosine matrix singular values are not all positive: \n"
+        msg += formatm("S", S)
+        msg += "I assume it is rounding error and approximate with:\n"
+        S[S < 0] = 0
+        msg += formatm("S'", S)
+        logger.warning(msg)
+
+    coords = V.T * np.sqrt(S).reshape(ndim, 1)
+    return coords
+
+
 @contract(D="distance_matrix,array[MxM](>=0)", ndim="K,int,>=1", returns="array[KxM]")
-def mds_randomized(D, ndim):
-    """ MDS based on randomized projections. """
-    return mds(D, ndim, embed=inner_product_embedding_randomized)
+def mds_randomized(D, ndim, **params):
+    """
+        MDS based on randomized projections. The keyword arguments are
+        passed to :py:func:`truncated_svd_randomized`.
+    """
+    embed = functools.partial(inner_product_embedding_randomized, **params)
+    return mds(D, ndim, embed=embed)
 
 
 @contract(C="array[NxN]", ndim="int,>0,K", returns="array[KxN],directions")
@@ -171,26 +427,126 @@ def spherical_mds(C, ndim, embed=inner_product_embedding):
 best_embedding_on_sphere = spherical_mds
 
 
-@contract(references="array[KxN]", distances="array[N](>=0)")
+@contract(references="array[KxN]", distances="array[N](>=0)|array[NxM](>=0)", returns="array[K]|array[KxM]")
 def place(references, distances):
-    # TODO: docs
+    """
+        Locates new points given their distances to the *references*.
+
+        The points are triangulated in closed form, as in landmark MDS:
+        with *X* the centered references, and *d* the squared distances,
+        the position is ``mean - 0.5 * pinv(X.T) (d - |x_i|^2)``, which is
+        exact for consistent distances. It costs O(K N) per point, after an
+        O(K^2 N) setup.
+
+        :param distances: The distances of a point to the N references,
+            or a NxM array with the distances of M points (one per column).
+    """
     K, N = references.shape
+    mean = references.mean(axis=1)
+    X = references - mean.reshape(K, 1)
+    norms2 = (X * X).sum(axis=0)
+    X_pinv = np.linalg.pinv(X.T)
+    if distances.ndim == 1:
+        d2 = distances * distances - norms2
+        return mean - 0.5 * np.dot(X_pinv, d2)
+    d2 = distances * distances - norms2.reshape(N, 1)
+    return mean.reshape(K, 1) - 0.5 * np.dot(X_pinv, d2)
+
+
+class LandmarkMDS(object):
+    """
+        Landmark MDS (de Silva & Tenenbaum), i.e. the Nystrom approximation
+        of classical MDS.
 
-    # First do MDS on all data
-    D = np.zeros((N + 1, N + 1))
-    D[:N, :N] = euclidean_distances(references)
-    D[N, N] = 0
-    D[N, :N] = distances
-    D[:N, N] = distances
-    Sm = mds(D, K)
+        The k landmarks are embedded once with classical MDS; then each
+        new point is placed by triangulation from its distances to the
+        landmarks only, in O(k * ndim) operations: ::
 
-    # Only if perfect
-    # Dm = euclidean_distances(Sm)
-    # assert_almost_equal(D[:N, :N], Dm[:N, :N])
-    # new in other frame
-    R, t = best_similarity_transform(Sm[:, :N], references)
+            lmds = LandmarkMDS(D_landmarks, ndim=3)
+            coords = lmds.place(distances_to_landmarks)  # no state change
+            lmds.add(distances_to_landmarks)  # also stored in lmds.points
 
-    Sm_aligned = np.dot(R, Sm) + t
-    result = Sm_aligned[:, N]
+        The coordinates are in the frame of :py:attr:`landmark_coords`.
+    """
 
-    return result
+    @contract(D="distance_matrix,array[LxL](>=0)", ndim="int,>=1")
+    def __init__(self, D, ndim):
+        k = D.shape[0]
+        if ndim >= k:
+            msg = "Number of landmarks: %s  Dimensions: %s" % (k, ndim)
+            raise ValueError(msg)
+        check_zero_diagonal(D)
+        D2 = D * D
+        S, V = np.linalg.eigh(double_center(D2))
+        S = S[k - ndim :]
+        V = V[:, k - ndim :]
+        if np.any(S <= 0):
+            msg = "The landmarks do not span %d dimensions: \n" % ndim
+            msg += formatm("S", S)
+            raise ValueError(msg)
+        sqrt_S = np.sqrt(S).reshape(ndim, 1)
+        self.ndim = ndim
+        #: The coordinates of the landmarks (ndim x k).
+        self.landmark_coords = V.T * sqrt_S
+        self._pinv = V.T / sqrt_S
+        self._mean_d2 = D2.mean(axis=0)
+        self._points = np.empty((ndim, 0))
+        self._npoints = 0
+
+    @property
+    def points(self):
+        """ The points added with :py:func:`add` (ndim x M, not a copy). """
+        return self._points[:, : self._npoints]
+
+    @contract(distances="array[L](>=0)|array[LxM](>=0)", returns="array[K]|array[KxM]")
+    def place(self, distances):
+        """
+            Returns the coordinates of one point, given its distances
+            to the landmarks, or of M points (LxM array, one per column).
+        """
+        distances = np.asarray(distances, dtype="float64")
+        d2 = distances * distances
+        if distances.ndim == 1:
+            d2 -= self._mean_d2
+        else:
+            d2 -= self._mean_d2.reshape(-1, 1)
+        coords = np.dot(self._pinv, d2)
+        coords *= -0.5
+        return coords
+
+    @contract(distances="array[L](>=0)|array[LxM](>=0)", returns="array[K]|array[KxM]")
+    def add(self, distances):
+        """
+            Places the points and appends them to :py:attr:`points`.
+            The storage grows geometrically, so adding points one at a
+            time costs amortized O(1) copies.
+        """
+        coords = self.place(distances)
+        new = coords.reshape(self.ndim, -1)
+        m = new.shape[1]
+        n = self._npoints
+        capacity = self._points.shape[1]
+        if n + m > capacity:
+            capacity = max(n + m, 2 * capacity, 16)
+            points = np.empty((self.ndim, capacity))
+            points[:, :n] = self._points[:, :n]
+            self._points = points
+        self._points[:, n : n + m] = new
+        self._npoints = n + m
+        return coords
+
+
+@contract(
+    D="array[LxN](>=0)", landmarks="seq[L](int,>=0)|array[L](int,>=0)", ndim="K,int,>=1", returns="array[KxN]"
+)
+def landmark_mds(D, landmarks, ndim):
+    """
+        Embeds N points knowing only their distances to L landmarks, which
+        are the points with indices *landmarks*; the L x N array *D*
+        contains the distances from the landmarks (rows) to all points.
+
+        The cost is O(L^3 + L N ndim) instead of O(N^3) for :py:func:`mds`.
+    """
+    landmarks = np.asarray(landmarks, dtype="int")
+    lmds = LandmarkMDS(D[:, landmarks], ndim)
+    return lmds.place(D)
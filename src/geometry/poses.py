@@ -7,17 +7,22 @@ import numpy as np
 
 from contracts import contract, new_contract, raise_wrapped
 from . import expm, logm
+from .basic_utils import fast_path
 from .constants import GeometryConstants
 from .rotations import (
     angle_from_rot2d,
     angle_scale_from_O2,
-    axis_angle_from_rotation,
     check_orthogonal,
     check_skew_symmetric,
     check_SO,
+    exp_coefficients,
     hat_map_2d,
+    log_coefficient,
+    quaternions_from_rotations,
     rot2d,
+    rotation_angles,
     rotz,
+    so3_from_SO3,
 )
 from .types import se2value, SE2value, SE3value, SO2value, T2value, T3value
 from .utils import assert_allclose
@@ -81,38 +86,61 @@ __all__ = [
     "translation_from_SE2",
     "translation_from_SE3",
     "xytheta_from_SE2",
+    "SE3_from_se3",
+    "se3_from_SE3",
+    "cumulative_products",
 ]
 
 
+def _pieces(M):
+    """ Same as :py:func:`extract_pieces`, but also for stacks (N,n,n). """
+    M = np.asarray(M)
+    return M[..., :-1, :-1], M[..., :-1, -1], M[..., -1, :-1], M[..., -1, -1]
+
+
+def _check_last_row(zero, one, one_msg, zero_msg, expected_one=1):
+    # Same tolerances as assert_allclose(), which is only called to
+    # format the message, as it is slow on small arrays.
+    if not np.all(np.abs(one - expected_one) <= 1e-7 * expected_one):
+        assert_allclose(one, expected_one, err_msg=one_msg)
+    if np.any(zero != 0):
+        assert_allclose(zero, 0, err_msg=zero_msg)
+
+
 def check_E(M):
-    R, t, zero, one = extract_pieces(M)  # @UnusedVariable
+    R, t, zero, one = _pieces(M)  # @UnusedVariable
     try:
         check_orthogonal(R)
     except ValueError as e:
         msg = "The rotation is not a rotation."
         raise_wrapped(ValueError, e, msg, M=M, compact=True)
-    assert_allclose(one, 1, err_msg="I expect the lower-right to be 1")
-    assert_allclose(zero, 0, err_msg="I expect the bottom component to be 0.")
+    _check_last_row(zero, one, "I expect the lower-right to be 1", "I expect the bottom component to be 0.")
 
 
 def check_SE(M):
-    """ Checks that the argument is in the special euclidean group. """
-    R, t, zero, one = extract_pieces(M)  # @UnusedVariable
+    """
+        Checks that the argument is in the special euclidean group.
+        Also accepts a stack of matrices.
+    """
+    R, t, zero, one = _pieces(M)  # @UnusedVariable
     try:
         check_SO(R)
     except ValueError as e:
         msg = "The rotation is not a rotation."
         raise_wrapped(ValueError, e, msg, M=M, compact=True)
-    assert_allclose(one, 1, err_msg="I expect the lower-right to be 1")
-    assert_allclose(zero, 0, err_msg="I expect the bottom component to be 0.")
+    _check_last_row(zero, one, "I expect the lower-right to be 1", "I expect the bottom component to be 0.")
 
 
 def check_se(M):
-    """ Checks that the input is in the special euclidean Lie algebra. """
-    omega, v, Z, zero = extract_pieces(M)  # @UnusedVariable
+    """
+        Checks that the input is in the special euclidean Lie algebra.
+        Also accepts a stack of matrices.
+    """
+    omega, v, Z, zero = _pieces(M)  # @UnusedVariable
     check_skew_symmetric(omega)
-    assert_allclose(Z, 0, err_msg="I expect the lower-right to be 0.")
-    assert_allclose(zero, 0, err_msg="I expect the bottom component to be 0.")
+    _check_last_row(
+        Z, zero, "I expect the lower-right to be 0.", "I expect the bottom component to be 0.", expected_one=0
+    )
 
 
 new_contract("se", check_se)
@@ -129,6 +157,7 @@ new_contract("TSE2", "tuple(SE2, se2)")
 new_contract("TSE3", "tuple(SE3, se3)")
 
 
+@fast_path
 @contract(x="array[NxN]", returns="tuple(array[MxM],array[M],array[M],number),M=N-1")
 def extract_pieces(x):
     M = x.shape[0] - 1
@@ -139,10 +168,22 @@ def extract_pieces(x):
     return a, b, c, d
 
 
-@contract(a="array[MxM]", b="array[M]", c="array[M]", d="number", returns="array[NxN],N=M+1")
-def combine_pieces(a, b, c, d):
+@fast_path
+@contract(
+    a="array[MxM]",
+    b="array[M]",
+    c="array[M]",
+    d="number",
+    out="None|(array[NxN],N=M+1)",
+    returns="array[NxN],N=M+1",
+)
+def combine_pieces(a, b, c, d, out=None):
+    """
+        The inverse of :py:func:`extract_pieces`; if *out* is given, the
+        matrix is written there instead of in a new array.
+    """
     M = a.shape[0]
-    x = np.zeros((M + 1, M + 1))
+    x = np.zeros((M + 1, M + 1)) if out is None else out
     x[0:M, 0:M] = a
     x[0:M, M] = b
     x[M, 0:M] = c
@@ -163,9 +204,20 @@ def SE3_identity() -> SE3value:
     return np.eye(4)
 
 
-@contract(R="array[NxN],SO", t="array[N]", returns="array[MxM],M=N+1,SE")
-def pose_from_rotation_translation(R, t):
-    return combine_pieces(R, t, t * 0, 1)
+@fast_path
+@contract(R="array[NxN],SO", t="array[N]", out="None|(array[MxM],M=N+1)", returns="array[MxM],M=N+1,SE")
+def pose_from_rotation_translation(R, t, out=None):
+    """
+        Returns the pose with rotation *R* and translation *t*; if *out*
+        is given, the pose is written there instead of in a new array.
+    """
+    N = len(t)
+    x = np.empty((N + 1, N + 1)) if out is None else out
+    x[:N, :N] = R
+    x[:N, N] = t
+    x[N, :N] = 0
+    x[N, N] = 1
+    return x
 
 
 # TODO: make specialized
@@ -173,9 +225,16 @@ SE2_from_rotation_translation = pose_from_rotation_translation
 SE3_from_rotation_translation = pose_from_rotation_translation
 
 
+@fast_path
 @contract(pose="array[NxN],SE", returns="tuple(array[MxM], array[M]),M=N-1")
-def rotation_translation_from_pose(pose):
+def rotation_translation_from_pose(pose, copy=True):
+    """
+        Returns the rotation and the translation of the pose; if *copy*
+        is False, they are views of *pose*, rather than copies.
+    """
     R, t, zero, one = extract_pieces(pose)  # @UnusedVariable
+    if not copy:
+        return R, t
     return R.copy(), t.copy()
 
 
@@ -184,11 +243,12 @@ rotation_translation_from_SE2 = rotation_translation_from_pose
 rotation_translation_from_SE3 = rotation_translation_from_pose
 
 
+@fast_path
 @contract(pose="SE2", returns="array[2]")
-def translation_from_SE2(pose: SE2value) -> T2value:
-    # TODO: make it more efficient
-    R, t, zero, one = extract_pieces(pose)  # @UnusedVariable
-    return t.copy()
+def translation_from_SE2(pose: SE2value, copy=True) -> T2value:
+    """ Returns the translation; if *copy* is False, a view of *pose*. """
+    t = pose[:2, 2]
+    return t.copy() if copy else t
 
 
 def rotation_from_SE2(pose: SE2value) -> SO2value:
@@ -197,20 +257,37 @@ def rotation_from_SE2(pose: SE2value) -> SO2value:
     return SO2_project_from_SE2(pose)
 
 
+@fast_path
 @contract(pose="SE3", returns="array[3]")
-def translation_from_SE3(pose: SE2value) -> T3value:
-    # TODO: make it more efficient
-    _, t, _, _ = extract_pieces(pose)
-    return t.copy()
+def translation_from_SE3(pose: SE2value, copy=True) -> T3value:
+    """ Returns the translation; if *copy* is False, a view of *pose*. """
+    t = pose[:3, 3]
+    return t.copy() if copy else t
 
 
-@contract(t="array[2]|seq[2](number)", theta="number", returns="SE2")
-def SE2_from_translation_angle(t, theta: Number) -> SE2value:
-    """ Returns an element of SE2 from translation and rotation. """
-    t = np.array(t)
-    return combine_pieces(rot2d(theta), t, t * 0, 1)
+@fast_path
+@contract(t="array[2]|seq[2](number)", theta="number", out="None|array[3x3]", returns="SE2")
+def SE2_from_translation_angle(t, theta: Number, out=None) -> SE2value:
+    """
+        Returns an element of SE2 from translation and rotation; if *out*
+        is given, the pose is written there instead of in a new array.
+    """
+    C = np.cos(theta)
+    S = np.sin(theta)
+    x = np.empty((3, 3)) if out is None else out
+    x[0, 0] = C
+    x[0, 1] = -S
+    x[0, 2] = t[0]
+    x[1, 0] = S
+    x[1, 1] = C
+    x[1, 2] = t[1]
+    x[2, 0] = 0
+    x[2, 1] = 0
+    x[2, 2] = 1
+    return x
 
 
+@fast_path
 @contract(pose="SE2", returns="tuple(array[2],float)")
 def translation_angle_from_SE2(pose: SE2value):
     R, t, _, _ = extract_pieces(pose)
@@ -228,6 +305,7 @@ def translation_angle_scale_from_E2(pose):
     return TranslationAngleScale(translation=t, angle=angle, scale=scale)
 
 
+@fast_path
 @contract(pose="SE2", returns="float")
 def angle_from_SE2(pose):
     # XXX: untested
@@ -236,12 +314,14 @@ def angle_from_SE2(pose):
 
 
 # TODO: write tests for this, and other function
+@fast_path
 @contract(xytheta="array[3]|seq[3](number)", returns="SE2")
 def SE2_from_xytheta(xytheta: Union[List[Number], Tuple[Number, Number, Number]]) -> SE2value:
     """ Returns an element of SE2 from translation and rotation. """
     return SE2_from_translation_angle([xytheta[0], xytheta[1]], xytheta[2])
 
 
+@fast_path
 @contract(returns="array[3],finite", pose="SE2")
 def xytheta_from_SE2(pose: SE2value):
     """ Returns an element of SE2 from translation and rotation. """
@@ -249,6 +329,7 @@ def xytheta_from_SE2(pose: SE2value):
     return np.array([t[0], t[1], alpha])
 
 
+@fast_path
 @contract(linear="(array[2],finite)|seq[2](number,finite)", angular="number,finite", returns="se2")
 def se2_from_linear_angular(linear, angular) -> SE2value:
     """ Returns an element of se2 from linear and angular velocity. """
@@ -257,6 +338,7 @@ def se2_from_linear_angular(linear, angular) -> SE2value:
     return combine_pieces(M, linear, linear * 0, 0)
 
 
+@fast_path
 @contract(vel="se2", returns="tuple((array[2],finite),Float)")
 def linear_angular_from_se2(vel: se2value):
     M, v, Z, zero = extract_pieces(vel)  # @UnusedVariable
@@ -285,13 +367,17 @@ def se2_from_SE2_slow(pose):
     return combine_pieces(M, v, v * 0, 0)
 
 
-@contract(pose="SE2", returns="se2")
+@fast_path
+@contract(pose="array[Nx3x3]|SE2", returns="array[Nx3x3]|se2")
 def se2_from_SE2(pose):
     """
         Converts a pose to its Lie algebra representation.
+        Accepts also a stack of (N,3,3) matrices.
 
         See Bullo, Murray "PD control on the euclidean group" for proofs.
     """
+    if pose.ndim > 2:
+        return _se2_from_SE2_stack(pose)
     R, t, zero, one = extract_pieces(pose)  # @UnusedVariable
     w = angle_from_rot2d(R)
 
@@ -308,24 +394,69 @@ def se2_from_SE2(pose):
     return combine_pieces(w_hat, v, v * 0, 0)
 
 
-@contract(returns="SE2", vel="se2")
+def _se2_from_SE2_stack(pose):
+    """ The same as :py:func:`se2_from_SE2`, on a stack, with masks for the branches. """
+    w = np.arctan2(pose[:, 1, 0], pose[:, 0, 0])
+    w[w == np.pi] = -np.pi
+    w_abs = np.abs(w)
+    small = w_abs < 1e-8
+    half = np.where(small, 1.0, w_abs / 2)
+    a = np.where(small, 1.0, half / np.tan(half))
+    tx = pose[:, 0, 2]
+    ty = pose[:, 1, 2]
+    vel = np.zeros(pose.shape)
+    vel[:, 0, 1] = -w
+    vel[:, 1, 0] = w
+    vel[:, 0, 2] = a * tx + (w / 2) * ty
+    vel[:, 1, 2] = -(w / 2) * tx + a * ty
+    return vel
+
+
+@fast_path
+@contract(vel="array[Nx3x3]|se2", returns="array[Nx3x3]|SE2")
 def SE2_from_se2(vel):
     """ Converts from Lie algebra representation to pose.
+        Accepts also a stack of (N,3,3) matrices.
 
         See Bullo, Murray "PD control on the euclidean group" for proofs.
     """
+    if vel.ndim > 2:
+        return _SE2_from_se2_stack(vel)
     w = vel[1, 0]
     R = rot2d(w)
     v = vel[0:2, 2]
     if np.abs(w) < 1e-8:  # XXX threshold
-        R = np.eye(2)
-        t = v
+        # first order: A = I + (w/2) J
+        t = np.array([v[0] - (w / 2) * v[1], (w / 2) * v[0] + v[1]])
     else:
         A = np.array([[np.sin(w), np.cos(w) - 1], [1 - np.cos(w), np.sin(w)]]) / w
         t = np.dot(A, v)
     return combine_pieces(R, t, t * 0, 1)
 
 
+def _SE2_from_se2_stack(vel):
+    """ The same as :py:func:`SE2_from_se2`, on a stack, with masks for the branches. """
+    w = vel[:, 1, 0]
+    C = np.cos(w)
+    S = np.sin(w)
+    small = np.abs(w) < 1e-8
+    w_safe = np.where(small, 1.0, w)
+    # sin(w)/w and (1 - cos(w))/w, to first order for small angles
+    s = np.where(small, 1.0, S / w_safe)
+    c = np.where(small, w / 2, (1 - C) / w_safe)
+    vx = vel[:, 0, 2]
+    vy = vel[:, 1, 2]
+    pose = np.zeros(vel.shape)
+    pose[:, 0, 0] = C
+    pose[:, 0, 1] = -S
+    pose[:, 1, 0] = S
+    pose[:, 1, 1] = C
+    pose[:, 0, 2] = s * vx - c * vy
+    pose[:, 1, 2] = c * vx + s * vy
+    pose[:, 2, 2] = 1
+    return pose
+
+
 @contract(returns="SE2", vel="se2")
 def SE2_from_se2_slow(vel):
     X = expm(vel)
@@ -333,6 +464,62 @@ def SE2_from_se2_slow(vel):
     return X
 
 
+@fast_path
+@contract(vel="array[Nx4x4]|se3", returns="array[Nx4x4]|SE3")
+def SE3_from_se3(vel):
+    """
+        Converts from Lie algebra representation to pose, in closed form.
+
+        With W the rotational part, v the linear part and t the norm of W:
+
+            R = I + A W + B W^2
+            t = V v,   V = I + B W + C W^2
+
+        where A = sin(t)/t, B = (1-cos(t))/t^2 and C = (t-sin(t))/t^3.
+        Accepts also a stack of (N,4,4) matrices.
+    """
+    vel = np.asarray(vel)
+    W = vel[..., :3, :3]
+    v = vel[..., :3, 3]
+    theta = rotation_angles(W)
+    A, B, C = exp_coefficients(theta)
+    W2 = np.matmul(W, W)
+    I = np.eye(3)
+    V = I + B * W + C * W2
+    pose = np.zeros(vel.shape)
+    pose[..., :3, :3] = I + A * W + B * W2
+    pose[..., :3, 3] = np.matmul(V, v[..., np.newaxis])[..., 0]
+    pose[..., 3, 3] = 1
+    return pose
+
+
+@fast_path
+@contract(pose="array[Nx4x4]|SE3", returns="array[Nx4x4]|se3")
+def se3_from_SE3(pose):
+    """
+        Converts a pose to its Lie algebra representation, in closed form.
+
+        This is the inverse of :py:func:`SE3_from_se3`; the linear part
+        is recovered as v = V^-1 t, with
+
+            V^-1 = I - W/2 + D W^2,  D = (1 - A/(2B)) / t^2.
+
+        The rotation angle is in [0, pi].
+        Accepts also a stack of (N,4,4) matrices.
+    """
+    pose = np.asarray(pose)
+    # the pose was already checked
+    W = so3_from_SO3.unchecked(pose[..., :3, :3])
+    t = pose[..., :3, 3]
+    theta = rotation_angles(W)
+    D = log_coefficient(theta)
+    Vinv = np.eye(3) - 0.5 * W + D * np.matmul(W, W)
+    vel = np.zeros(pose.shape)
+    vel[..., :3, :3] = W
+    vel[..., :3, 3] = np.matmul(Vinv, t[..., np.newaxis])[..., 0]
+    return vel
+
+
 @contract(pose="SE2", returns="SE3")
 def SE3_from_SE2(pose):
     """ Embeds a pose in SE2 to SE3, setting z=0 and upright. """
@@ -352,36 +539,98 @@ def se2_from_se3(vel, check_exact=True, z_atol=1e-6):
     return combine_pieces(M1, v1, Z[:2], zero)
 
 
-@contract(pose="SE3", returns="SE2")
+@fast_path
+@contract(pose="array[Nx4x4]|SE3", returns="array[Nx3x3]|SE2")
 def SE2_from_SE3(pose, check_exact=True, z_atol=1e-6):
     """
         Projects a pose in SE3 to SE2.
 
         If check_exact is True, it will check that z = 0 and axis ~= [0,0,1].
+        Accepts also a stack of (N,4,4) poses; the checks are array
+        comparisons, and the diagnostics are formatted only on failure.
     """
-    rotation, translation = rotation_translation_from_pose(pose)
-    axis, angle = axis_angle_from_rotation(rotation)
+    pose = np.asarray(pose)
+    R = pose[..., :3, :3]
+    # the axis (up to sign) from the quaternion, which is robust near pi
+    q = quaternions_from_rotations(R)
+    s = np.linalg.norm(q[..., 1:], axis=-1)
+    axis = q[..., 1:] / np.where(s == 0, 1, s)[..., np.newaxis]
+    # any axis will do for the identity; use the default one, [0,0,1]
+    axis[s == 0] = [0, 0, 1]
+    sign = np.sign(axis[..., 2])
+    # the angle, with the sign of the z component of the axis: the
+    # skew-symmetric part of R is sin(angle) [axis]
+    v_z = R[..., 1, 0] - R[..., 0, 1]
+    v = np.sqrt((R[..., 2, 1] - R[..., 1, 2]) ** 2 + (R[..., 0, 2] - R[..., 2, 0]) ** 2 + v_z ** 2)
+    cos = (R[..., 0, 0] + R[..., 1, 1] + R[..., 2, 2] - 1) / 2
+    angle = np.arctan2(v / 2, cos)
+    translation = pose[..., :3, 3]
     if check_exact:
-        sit = "\n pose %s" % pose
-        sit += "\n axis: %s" % axis
-        sit += "\n angle: %s" % angle
-
-        err_msg = "I expect that z=0 when projecting to SE2 " "(check_exact=True)."
-        err_msg += sit
-
-        assert_allclose(translation[2], 0, atol=z_atol, err_msg=err_msg)
-        # normalize angle z
-        axis2 = axis * np.sign(axis[2])
-        err_msg = "I expect that the rotation is around [0,0,1] " "when projecting to SE2 (check_exact=True)."
-        err_msg += sit
-
-        assert_allclose(
-            axis2,
-            [0, 0, 1],
-            rtol=GeometryConstants.rtol_SE2_from_SE3,
-            atol=GeometryConstants.rtol_SE2_from_SE3,  # XXX
-            err_msg=err_msg,
-        )
-
-    angle = angle * np.sign(axis[2])
-    return SE2_from_translation_angle(translation[0:2], angle)
+        # same tolerances as assert_allclose(), which is only called to
+        # format the message
+        tol = GeometryConstants.rtol_SE2_from_SE3
+        bad_z = ~(np.abs(translation[..., 2]) <= z_atol)
+        axis2 = axis * sign[..., np.newaxis]
+        bad_axis = ~np.all(np.abs(axis2 - [0, 0, 1]) <= tol + tol * np.array([0, 0, 1]), axis=-1)
+        if np.any(bad_z) or np.any(bad_axis):
+            _SE2_from_SE3_failure(pose, bad_z, bad_axis, axis, angle, z_atol)
+
+    angle = angle * np.where(v_z != 0, np.sign(v_z), sign)
+    C = np.cos(angle)
+    S = np.sin(angle)
+    M = np.zeros(pose.shape[:-2] + (3, 3))
+    M[..., 0, 0] = C
+    M[..., 0, 1] = -S
+    M[..., 1, 0] = S
+    M[..., 1, 1] = C
+    M[..., :2, 2] = translation[..., :2]
+    M[..., 2, 2] = 1
+    return M
+
+
+def _SE2_from_SE3_failure(pose, bad_z, bad_axis, axis, angle, z_atol):
+    """ Raises the AssertionError for the first pose that is not planar. """
+    stack = pose.ndim > 2
+    pose = pose.reshape(-1, 4, 4)
+    bad_z = bad_z.reshape(-1)
+    axis = axis.reshape(-1, 3)
+    angle = angle.reshape(-1)
+    i = int(np.argmax(bad_z | bad_axis.reshape(-1)))
+    sit = "\n index: %d" % i if stack else ""
+    sit += "\n pose %s" % pose[i]
+    sit += "\n axis: %s" % axis[i]
+    sit += "\n angle: %s" % angle[i]
+    if bad_z[i]:
+        err_msg = "I expect that z=0 when projecting to SE2 (check_exact=True)." + sit
+        assert_allclose(pose[i, 2, 3], 0, atol=z_atol, err_msg=err_msg)
+    tol = GeometryConstants.rtol_SE2_from_SE3
+    err_msg = "I expect that the rotation is around [0,0,1] when projecting to SE2 (check_exact=True)." + sit
+    assert_allclose(axis[i] * np.sign(axis[i, 2]), [0, 0, 1], rtol=tol, atol=tol, err_msg=err_msg)
+
+
+@contract(M="array[NxKxK]", returns="array[NxKxK]")
+def cumulative_products(M):
+    """
+        Returns the prefix products P_i = M_0 M_1 ... M_i of a stack of
+        matrices (e.g., the poses obtained composing a sequence of
+        relative poses).
+
+        The products are computed with a parallel prefix scan: the pairs
+        (M_0 M_1), (M_2 M_3), ... are scanned recursively, and then the
+        even elements are filled in. This takes about 2N matrix products
+        in log2(N) batched passes, instead of N products in a Python loop.
+    """
+    return _prefix_products(np.asarray(M, dtype="float64"))
+
+
+def _prefix_products(M):
+    n = len(M)
+    if n <= 1:
+        return M.copy()
+    # S[k] = M_0 ... M_{2k+1}
+    S = _prefix_products(np.matmul(M[0 : n - 1 : 2], M[1::2]))
+    P = np.empty(M.shape)
+    P[0] = M[0]
+    P[1::2] = S
+    P[2::2] = np.matmul(S[: (n - 1) // 2], M[2::2])
+    return P
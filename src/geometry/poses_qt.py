@@ -0,0 +1,189 @@
+# coding=utf-8
+"""
+    SE(3) poses as compact (quaternion, translation) arrays.
+
+    A pose is an array ``[qw, qx, qy, qz, tx, ty, tz]``: the unit
+    quaternion of the rotation, as returned by
+    :py:func:`quaternion_from_rotation`, followed by the translation;
+    a set of poses is an (N,7) array, which takes 7 floats per pose
+    instead of the 16 of the 4x4 matrices. All the operations work
+    directly on this representation, and broadcast a single pose against
+    a stack. The quaternions are returned with a nonnegative real part.
+
+    The Lie algebra se(3) is represented as the array
+    ``[wx, wy, wz, vx, vy, vz]`` of the angular and linear velocity, in
+    the order of :py:func:`MatrixLieAlgebra.vector_from_algebra`.
+"""
+import numpy as np
+from contracts import contract
+
+from .quaternions import quaternion_exp, quaternion_log
+from .rotations import (
+    exp_coefficients,
+    log_coefficient,
+    quaternions_from_rotations,
+    rotations_from_quaternions,
+)
+
+__all__ = [
+    "SE3_from_qts",
+    "qts_from_SE3",
+    "qt_compose",
+    "qt_inverse",
+    "qt_relative",
+    "qt_apply",
+    "qt_exp",
+    "qt_log",
+    "qt_distances",
+]
+
+
+def _components(a):
+    """
+        Returns the components of the last axis as contiguous arrays;
+        the arithmetic on them is much faster than on the strided
+        columns of the (N,7) array.
+    """
+    return np.ascontiguousarray(np.moveaxis(a, -1, 0))
+
+
+def _multiply(p, q):
+    """ Hamilton product, on the components; see :py:func:`quaternion_multiply`. """
+    a1, b1, c1, d1 = p
+    a2, b2, c2, d2 = q
+    return (
+        a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2,
+        a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2,
+        a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2,
+        a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2,
+    )
+
+
+def _rotate(q, v):
+    """ Rotation of vectors, on the components; see :py:func:`quaternion_rotate`. """
+    a, x, y, z = q
+    v0, v1, v2 = v
+    t0 = 2 * (y * v2 - z * v1)
+    t1 = 2 * (z * v0 - x * v2)
+    t2 = 2 * (x * v1 - y * v0)
+    return (
+        v0 + a * t0 + (y * t2 - z * t1),
+        v1 + a * t1 + (z * t0 - x * t2),
+        v2 + a * t2 + (x * t1 - y * t0),
+    )
+
+
+def _result(q, t):
+    """ Assembles the poses, changing the sign of the quaternions with negative real part. """
+    shape = np.broadcast(*(tuple(q) + tuple(t))).shape
+    r = np.empty((7,) + shape)
+    np.multiply(q, np.where(q[0] < 0, -1.0, 1.0), out=r[:4])
+    r[4:] = t
+    return np.ascontiguousarray(np.moveaxis(r, 0, -1))
+
+
+@contract(P="array[Nx7]|array[7]", returns="array[Nx4x4]|array[4x4]")
+def SE3_from_qts(P):
+    """ Converts to the 4x4 matrices of :py:func:`pose_from_rotation_translation`. """
+    P = np.asarray(P, dtype="float64")
+    M = np.zeros(P.shape[:-1] + (4, 4))
+    M[..., :3, :3] = rotations_from_quaternions(P[..., :4])
+    M[..., :3, 3] = P[..., 4:]
+    M[..., 3, 3] = 1
+    return M
+
+
+@contract(M="array[Nx4x4]|array[4x4]", returns="array[Nx7]|array[7]")
+def qts_from_SE3(M):
+    """
+        The inverse of :py:func:`SE3_from_qts`; only the shapes
+        are checked, not that the matrices are poses.
+    """
+    M = np.asarray(M)
+    P = np.empty(M.shape[:-2] + (7,))
+    P[..., :4] = quaternions_from_rotations(M[..., :3, :3])
+    P[..., 4:] = M[..., :3, 3]
+    return P
+
+
+@contract(a="array[Nx7]|array[7]", b="array[Nx7]|array[7]", returns="array[Nx7]|array[7]")
+def qt_compose(a, b):
+    """ Returns the composition *a b* of the poses. """
+    a = _components(a)
+    b = _components(b)
+    t = _rotate(a[:4], b[4:])
+    return _result(_multiply(a[:4], b[:4]), [a[4 + i] + t[i] for i in range(3)])
+
+
+@contract(a="array[Nx7]|array[7]", returns="array[Nx7]|array[7]")
+def qt_inverse(a):
+    """ Returns the inverse of the poses. """
+    a = _components(a)
+    q = (a[0], -a[1], -a[2], -a[3])
+    return _result(q, [-x for x in _rotate(q, a[4:])])
+
+
+@contract(a="array[Nx7]|array[7]", b="array[Nx7]|array[7]", returns="array[Nx7]|array[7]")
+def qt_relative(a, b):
+    """ Returns the pose of *b* relative to *a*, that is, *a^-1 b*. """
+    a = _components(a)
+    b = _components(b)
+    qinv = (a[0], -a[1], -a[2], -a[3])
+    t = _rotate(qinv, [b[4 + i] - a[4 + i] for i in range(3)])
+    return _result(_multiply(qinv, b[:4]), t)
+
+
+@contract(a="array[Nx7]|array[7]", points="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def qt_apply(a, points):
+    """ Applies the poses to the 3D *points* (rotation, then translation). """
+    a = _components(a)
+    t = _rotate(a[:4], _components(points))
+    return np.stack([a[4 + i] + t[i] for i in range(3)], axis=-1)
+
+
+@contract(v="array[Nx6]|array[6]", returns="array[Nx7]|array[7]")
+def qt_exp(v):
+    """
+        Exponential map from se(3), as [wx, wy, wz, vx, vy, vz], to the
+        poses; the same as :py:func:`SE3_from_se3`.
+    """
+    v = np.asarray(v, dtype="float64")
+    w = v[..., :3]
+    u = v[..., 3:]
+    theta = np.linalg.norm(w, axis=-1)
+    _, B, C = exp_coefficients(theta)
+    # t = V u, with V = I + B W + C W^2
+    wu = np.cross(w, u)
+    t = u + np.expand_dims(B, -1) * wu + np.expand_dims(C, -1) * np.cross(w, wu)
+    return _result(_components(quaternion_exp(w / 2)), _components(t))
+
+
+@contract(a="array[Nx7]|array[7]", returns="array[Nx6]|array[6]")
+def qt_log(a):
+    """
+        Logarithmic map from the poses to se(3), as [wx, wy, wz, vx, vy, vz];
+        the same as :py:func:`se3_from_SE3`. The rotation angle is in [0, pi].
+    """
+    a = np.asarray(a, dtype="float64")
+    q = a[..., :4] * np.where(a[..., :1] < 0, -1.0, 1.0)
+    t = a[..., 4:]
+    w = 2 * quaternion_log(q)
+    D = log_coefficient(np.linalg.norm(w, axis=-1))
+    # u = V^-1 t, with V^-1 = I - W/2 + D W^2
+    wt = np.cross(w, t)
+    v = np.empty(a.shape[:-1] + (6,))
+    v[..., :3] = w
+    v[..., 3:] = t - 0.5 * wt + np.expand_dims(D, -1) * np.cross(w, wt)
+    return v
+
+
+@contract(a="array[Nx7]|array[7]", b="array[Nx7]|array[7]")
+def qt_distances(a, b, alpha=1.0):
+    """
+        Returns the distances between the poses, as the norm of the
+        linear velocity plus *alpha* times the rotation angle of
+        :py:func:`qt_log` of the relative pose; this is the same as
+        ``SE3.distances()``, whose *alpha* is 1.
+    """
+    v = qt_log(qt_relative(a, b))
+    return np.linalg.norm(v[..., 3:], axis=-1) + alpha * np.linalg.norm(v[..., :3], axis=-1)
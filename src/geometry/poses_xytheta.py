@@ -0,0 +1,160 @@
+# coding=utf-8
+"""
+    SE(2) poses as compact (x, y, theta) arrays.
+
+    A pose is an array ``[x, y, theta]``, as returned by
+    :py:func:`xytheta_from_SE2`; a set of poses is an (N,3) array. All the
+    operations work directly on this representation, without building the
+    3x3 matrices, and broadcast a single pose against a stack.
+    The angles are returned in [-pi, pi).
+
+    The Lie algebra se(2) is represented in the same way, as the array
+    ``[vx, vy, omega]`` of the linear and angular velocity.
+"""
+import numpy as np
+from contracts import contract
+
+__all__ = [
+    "SE2_from_xythetas",
+    "xythetas_from_SE2",
+    "xytheta_compose",
+    "xytheta_inverse",
+    "xytheta_relative",
+    "xytheta_apply",
+    "xytheta_exp",
+    "xytheta_log",
+]
+
+
+def _wrap(theta):
+    """ Normalizes the angles to [-pi, pi). """
+    return np.remainder(theta + np.pi, 2 * np.pi) - np.pi
+
+
+def _result(shape):
+    return np.empty(shape[:-1] + (3,))
+
+
+@contract(P="array[Nx3]|array[3]", returns="array[Nx3x3]|array[3x3]")
+def SE2_from_xythetas(P):
+    """ Batched version of :py:func:`SE2_from_xytheta`. """
+    P = np.asarray(P, dtype="float64")
+    C = np.cos(P[..., 2])
+    S = np.sin(P[..., 2])
+    M = np.zeros(P.shape[:-1] + (3, 3))
+    M[..., 0, 0] = C
+    M[..., 0, 1] = -S
+    M[..., 1, 0] = S
+    M[..., 1, 1] = C
+    M[..., 0, 2] = P[..., 0]
+    M[..., 1, 2] = P[..., 1]
+    M[..., 2, 2] = 1
+    return M
+
+
+@contract(M="array[Nx3x3]|array[3x3]", returns="array[Nx3]|array[3]")
+def xythetas_from_SE2(M):
+    """
+        Batched version of :py:func:`xytheta_from_SE2`; only the shapes
+        are checked, not that the matrices are poses.
+    """
+    M = np.asarray(M)
+    P = np.empty(M.shape[:-2] + (3,))
+    P[..., 0] = M[..., 0, 2]
+    P[..., 1] = M[..., 1, 2]
+    theta = np.arctan2(M[..., 1, 0], M[..., 0, 0])
+    P[..., 2] = np.where(theta == np.pi, -np.pi, theta)
+    return P
+
+
+@contract(a="array[Nx3]|array[3]", b="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def xytheta_compose(a, b):
+    """ Returns the composition *a b* of the poses. """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    C = np.cos(a[..., 2])
+    S = np.sin(a[..., 2])
+    r = _result(np.broadcast(a, b).shape)
+    r[..., 0] = a[..., 0] + C * b[..., 0] - S * b[..., 1]
+    r[..., 1] = a[..., 1] + S * b[..., 0] + C * b[..., 1]
+    r[..., 2] = _wrap(a[..., 2] + b[..., 2])
+    return r
+
+
+@contract(a="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def xytheta_inverse(a):
+    """ Returns the inverse of the poses. """
+    a = np.asarray(a)
+    C = np.cos(a[..., 2])
+    S = np.sin(a[..., 2])
+    r = _result(a.shape)
+    r[..., 0] = -C * a[..., 0] - S * a[..., 1]
+    r[..., 1] = S * a[..., 0] - C * a[..., 1]
+    r[..., 2] = _wrap(-a[..., 2])
+    return r
+
+
+@contract(a="array[Nx3]|array[3]", b="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def xytheta_relative(a, b):
+    """ Returns the pose of *b* relative to *a*, that is, *a^-1 b*. """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    C = np.cos(a[..., 2])
+    S = np.sin(a[..., 2])
+    dx = b[..., 0] - a[..., 0]
+    dy = b[..., 1] - a[..., 1]
+    r = _result(np.broadcast(a, b).shape)
+    r[..., 0] = C * dx + S * dy
+    r[..., 1] = -S * dx + C * dy
+    r[..., 2] = _wrap(b[..., 2] - a[..., 2])
+    return r
+
+
+@contract(a="array[Nx3]|array[3]", points="array[Nx2]|array[2]", returns="array[Nx2]|array[2]")
+def xytheta_apply(a, points):
+    """ Applies the poses to the 2D *points* (rotation, then translation). """
+    a = np.asarray(a)
+    points = np.asarray(points)
+    C = np.cos(a[..., 2])
+    S = np.sin(a[..., 2])
+    x = points[..., 0]
+    y = points[..., 1]
+    r = np.empty(np.broadcast(a[..., :2], points).shape)
+    r[..., 0] = a[..., 0] + C * x - S * y
+    r[..., 1] = a[..., 1] + S * x + C * y
+    return r
+
+
+@contract(v="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def xytheta_exp(v):
+    """
+        Exponential map from se(2), as [vx, vy, omega], to the poses;
+        the same as :py:func:`SE2_from_se2`.
+    """
+    v = np.asarray(v, dtype="float64")
+    w = v[..., 2]
+    # sin(w) / w and (1 - cos(w)) / w, with the correct limits at 0
+    s = np.sinc(w / np.pi)
+    c = (w / 2) * np.sinc(w / (2 * np.pi)) ** 2
+    r = _result(v.shape)
+    r[..., 0] = s * v[..., 0] - c * v[..., 1]
+    r[..., 1] = c * v[..., 0] + s * v[..., 1]
+    r[..., 2] = _wrap(w)
+    return r
+
+
+@contract(a="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def xytheta_log(a):
+    """
+        Logarithmic map from the poses to se(2), as [vx, vy, omega];
+        the same as :py:func:`se2_from_SE2`.
+    """
+    a = np.asarray(a, dtype="float64")
+    w = _wrap(a[..., 2])
+    # (w / 2) / tan(w / 2), with the correct limit at 0
+    k = np.cos(w / 2) / np.sinc(w / (2 * np.pi))
+    r = _result(a.shape)
+    r[..., 0] = k * a[..., 0] + (w / 2) * a[..., 1]
+    r[..., 1] = -(w / 2) * a[..., 0] + k * a[..., 1]
+    r[..., 2] = w
+    return r
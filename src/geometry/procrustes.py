@@ -22,9 +22,17 @@ def best_orthogonal_transform(X, Y):
 
 
 @contract(M="array[NxN]", returns="array[NxN],orthogonal")
-def closest_orthogonal_matrix(M):
-    """ Finds the closest orthogonal matrix to M. """
+def closest_orthogonal_matrix(M, special=False):
+    """
+        Finds the closest orthogonal matrix to M.
+
+        If *special* is True, the result is the closest rotation matrix
+        (determinant +1); if needed, the sign of the singular vector
+        with the smallest singular value is flipped.
+    """
     U, _, V = np.linalg.svd(M)
+    if special and np.linalg.det(U) * np.linalg.det(V) < 0:
+        U[:, -1] *= -1
     R = np.dot(U, V)
     return R
 
@@ -0,0 +1,264 @@
+# coding=utf-8
+"""
+    Quaternion algebra on stacked arrays.
+
+    The conventions are the same as in :py:mod:`geometry.rotations`:
+    q = (a + bi + cj + dk) is stored as the array ``[a, b, c, d]``, and
+    unit quaternions are canonicalized with a nonnegative real part.
+
+    All functions accept a single quaternion (shape (4,)) or a stack of
+    them (shape (N,4)), and broadcast a single element against a stack.
+    Only the shapes are checked, not that the quaternions have unit
+    length.
+"""
+import numpy as np
+from contracts import contract
+
+from .constants import GeometryConstants
+
+__all__ = [
+    "quaternion_multiply",
+    "quaternion_conjugate",
+    "quaternion_inverse",
+    "quaternion_rotate",
+    "quaternion_log",
+    "quaternion_exp",
+    "quaternion_normalize",
+    "quaternion_slerp",
+    "quaternion_angles",
+    "quaternion_distances",
+    "quaternion_distance_matrix",
+]
+
+
+@contract(p="array[Nx4]|array[4]", q="array[Nx4]|array[4]", returns="array[Nx4]|array[4]")
+def quaternion_multiply(p, q):
+    """
+        Hamilton product *p q*; if *p* and *q* are unit quaternions, this
+        corresponds to the rotation R(p) R(q).
+    """
+    p = np.asarray(p)
+    q = np.asarray(q)
+    a1, b1, c1, d1 = p[..., 0], p[..., 1], p[..., 2], p[..., 3]
+    a2, b2, c2, d2 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    r = np.empty(np.broadcast(p, q).shape)
+    r[..., 0] = a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2
+    r[..., 1] = a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2
+    r[..., 2] = a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2
+    r[..., 3] = a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2
+    return r
+
+
+@contract(q="array[Nx4]|array[4]", returns="array[Nx4]|array[4]")
+def quaternion_conjugate(q):
+    """ Returns the conjugate (a - bi - cj - dk). """
+    r = np.array(q, dtype="float64")
+    r[..., 1:] *= -1
+    return r
+
+
+@contract(q="array[Nx4]|array[4]", returns="array[Nx4]|array[4]")
+def quaternion_inverse(q):
+    """
+        Returns the inverse of *q*; for unit quaternions this is the
+        same as :py:func:`quaternion_conjugate`.
+    """
+    r = quaternion_conjugate(q)
+    r /= (r * r).sum(axis=-1)[..., np.newaxis]
+    return r
+
+
+@contract(q="array[Nx4]|array[4]", v="array[Nx3]|array[3]", returns="array[Nx3]|array[3]")
+def quaternion_rotate(q, v):
+    """
+        Rotates the vectors *v* by the unit quaternions *q*,
+        i.e. computes R(q) v without building the matrices, as
+
+            v' = v + 2 a (u x v) + 2 u x (u x v),
+
+        where a is the real part of q and u the imaginary part.
+    """
+    q = np.asarray(q)
+    v = np.asarray(v)
+    a, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    v0, v1, v2 = v[..., 0], v[..., 1], v[..., 2]
+    # t = 2 u x v
+    t0 = 2 * (y * v2 - z * v1)
+    t1 = 2 * (z * v0 - x * v2)
+    t2 = 2 * (x * v1 - y * v0)
+    r = np.empty(np.broadcast(q[..., :3], v).shape)
+    r[..., 0] = v0 + a * t0 + (y * t2 - z * t1)
+    r[..., 1] = v1 + a * t1 + (z * t0 - x * t2)
+    r[..., 2] = v2 + a * t2 + (x * t1 - y * t0)
+    return r
+
+
+@contract(q="array[Nx4]|array[4]", returns="array[Nx3]|array[3]")
+def quaternion_log(q):
+    """
+        Logarithm of unit quaternions. The result is the imaginary part
+        of log(q), which is (angle / 2) * axis; the rotation vector is
+        twice this.
+
+        It is the logarithm of the canonical representative of the
+        rotation, that is, of -q if the real part of q is negative, so
+        that the half angle is in [0, pi/2] and the rotation angle in
+        [0, pi]; then :py:func:`quaternion_exp` gives back q up to sign.
+
+        The angle is computed as atan2, which is accurate for all angles.
+    """
+    q = np.asarray(q, dtype="float64")
+    q = q * np.where(q[..., :1] < 0, -1.0, 1.0)
+    a = q[..., 0]
+    u = q[..., 1:]
+    n = np.linalg.norm(u, axis=-1)
+    half_angle = np.arctan2(n, a)
+    # for n -> 0, atan2(n, a) / n -> 1 / a
+    small = n < 1e-12
+    ratio = np.where(small, 1.0, half_angle) / np.where(small, a, n)
+    return u * ratio[..., np.newaxis]
+
+
+@contract(v="array[Nx3]|array[3]", returns="array[Nx4]|array[4]")
+def quaternion_exp(v):
+    """
+        Exponential of the imaginary quaternions *v*; this is the
+        inverse of :py:func:`quaternion_log`.
+    """
+    v = np.asarray(v, dtype="float64")
+    n = np.linalg.norm(v, axis=-1)
+    q = np.empty(v.shape[:-1] + (4,))
+    q[..., 0] = np.cos(n)
+    # sin(n) / n, with the correct limit at 0
+    q[..., 1:] = v * np.sinc(n / np.pi)[..., np.newaxis]
+    return q
+
+
+@contract(q="array[Nx4]|array[4]", returns="array[Nx4]|array[4]")
+def quaternion_normalize(q, canonical=True):
+    """
+        Returns the quaternions scaled to unit length and, if *canonical*
+        is True, with the sign chosen so that the real part is nonnegative
+        (q and -q represent the same rotation), as
+        :py:func:`random_quaternion` does.
+    """
+    q = np.asarray(q, dtype="float64")
+    norms = np.linalg.norm(q, axis=-1)[..., np.newaxis]
+    if canonical:
+        norms = np.where(q[..., :1] < 0, -norms, norms)
+    return q / norms
+
+
+@contract(p="array[Nx4]|array[4]", q="array[Nx4]|array[4]", returns="array[Nx4]|array[4]")
+def quaternion_slerp(p, q, t):
+    """
+        Spherical linear interpolation between the unit quaternions *p*
+        and *q*, at the fractions *t* (a number, or an array that
+        broadcasts against the stacks): the result is p at t=0 and q at
+        t=1, along the shortest rotation between them.
+
+        It is computed as p exp(t log(p^-1 q')), where q' = +-q is chosen
+        so that p^-1 q' has a nonnegative real part; unlike the sin()
+        formula, this is accurate also for close quaternions.
+    """
+    p = np.asarray(p, dtype="float64")
+    q = np.asarray(q, dtype="float64")
+    t = np.asarray(t, dtype="float64")
+    r = quaternion_multiply(quaternion_conjugate(p), q)
+    r *= np.where(r[..., :1] < 0, -1.0, 1.0)
+    v = quaternion_log(r) * t[..., np.newaxis]
+    return quaternion_multiply(p, quaternion_exp(v))
+
+
+def _angles_from_dots(d, P, Q):
+    """
+        Converts in place the dot products *d* between the unit quaternions
+        *P* and *Q* (which broadcast to d.shape + (4,)) to rotation angles.
+
+        The angle is 2 arccos |p.q|, which does not depend on the sign of
+        the quaternions. As the arccos is not accurate near 1, the small
+        angles are recomputed from the chordal distance, as
+        4 arcsin(|p - s q| / 2) with s = sign(p.q).
+    """
+    cos_small = np.cos(GeometryConstants.rotation_distance_small_angle / 2)
+    # only boolean temporaries: the signs are kept for the small angles
+    negative = d < 0
+    np.abs(d, out=d)
+    small = np.nonzero(d > cos_small)
+    signs = np.where(negative[small], -1.0, 1.0)[:, np.newaxis]
+    del negative
+    np.minimum(d, 1, out=d)
+    np.arccos(d, out=d)
+    d *= 2
+    if signs.size:
+        p = np.broadcast_to(P, d.shape + (4,))[small]
+        q = np.broadcast_to(Q, d.shape + (4,))[small]
+        chord = np.linalg.norm(p - signs * q, axis=1)
+        d[small] = 4 * np.arcsin(np.minimum(chord / 2, 1))
+    return d
+
+
+def quaternion_angles(P, Q):
+    """
+        Returns the rotation angles (in [0, pi]) between the corresponding
+        unit quaternions in *P* and *Q*, which are broadcast against each
+        other (e.g., shapes (N,4) and (N,4), or (M,1,4) and (1,N,4)).
+
+        See :py:func:`quaternion_distance_matrix`.
+    """
+    P = np.asarray(P, dtype="float64")
+    Q = np.asarray(Q, dtype="float64")
+    d = np.array((P * Q).sum(axis=-1), ndmin=1)
+    return _angles_from_dots(d, P, Q).reshape(np.broadcast(P[..., 0], Q[..., 0]).shape)
+
+
+@contract(p="array[4]", Q="array[Nx4]", returns="array[N](>=0)")
+def quaternion_distances(p, Q):
+    """
+        Returns the rotation angles (in [0, pi]) between the unit
+        quaternion *p* and each of the unit quaternions in *Q*.
+
+        See :py:func:`quaternion_distance_matrix`.
+    """
+    p = np.asarray(p, dtype="float64")
+    Q = np.asarray(Q, dtype="float64")
+    return _angles_from_dots(np.dot(Q, p), p, Q)
+
+
+@contract(P="array[Mx4]", Q="None|array[Nx4]", block_size="None|(int,>0)", returns="array[Mx*]")
+def quaternion_distance_matrix(P, Q=None, dtype="float64", block_size=None, out=None):
+    """
+        Computes the MxN matrix of rotation angles between the unit
+        quaternions in *P* and those in *Q* (default: *P*).
+
+        Each block of rows is computed with a single matrix product,
+        as the angle between p and q is 2 arccos |p.q|; small angles are
+        recomputed with the (accurate) chordal distance, so that the
+        diagonal is exactly zero.
+
+        :param dtype: Type of the result (e.g., "float32" to halve the memory).
+        :param block_size: The rows are computed in blocks of this size,
+            so that the temporary memory is O(block_size * N). By default,
+            all at once for a new float64 result, and in blocks of 1024
+            rows for a smaller *dtype* or with *out*.
+        :param out: Optional MxN array (e.g., a memory-mapped file)
+            in which to write the result.
+    """
+    P = np.asarray(P, dtype="float64")
+    Q = P if Q is None else np.asarray(Q, dtype="float64")
+    M, N = len(P), len(Q)
+    if block_size is None:
+        at_once = out is None and np.dtype(dtype) == np.float64
+        block_size = max(M, 1) if at_once else max(min(M, 1024), 1)
+    if out is None:
+        out = np.empty((M, N), dtype=dtype)
+    # the products are computed directly in out if possible
+    direct = out.dtype == np.float64 and out.flags.c_contiguous
+    buffer = None if direct else np.empty((min(M, block_size), N))
+    for i0 in range(0, M, block_size):
+        i1 = min(M, i0 + block_size)
+        d = np.dot(P[i0:i1], Q.T, out=out[i0:i1] if direct else buffer[: i1 - i0])
+        d = _angles_from_dots(d, P[i0:i1, np.newaxis, :], Q[np.newaxis, :, :])
+        if not direct:
+            out[i0:i1, :] = d
+    return out
@@ -0,0 +1,148 @@
+# coding=utf-8
+"""
+    Averages of rotations.
+
+    All functions take a stack of (N,n,n) rotation matrices and optional
+    nonnegative weights, and do O(N) vectorized work; only the iterative
+    geodesic mean loops, over the iterations.
+"""
+import numpy as np
+from contracts import contract
+
+from .procrustes import closest_orthogonal_matrix
+from .rotations import (
+    hat_map,
+    map_hats,
+    quaternions_from_rotations,
+    rotation_from_quaternion,
+    SO2_from_angle,
+    SO3_from_so3,
+    so3_from_SO3,
+)
+
+__all__ = [
+    "rotation_mean",
+    "rotation_mean_chordal",
+    "rotation_mean_quaternion",
+    "rotation_mean_geodesic",
+]
+
+
+def _normalized_weights(R, weights):
+    if weights is None:
+        return np.ones(len(R)) / len(R)
+    weights = np.asarray(weights, dtype="float64")
+    total = weights.sum()
+    if not total > 0:
+        raise ValueError("The weights must not all be zero.")
+    return weights / total
+
+
+@contract(R="array[NxKxK],N>=1", weights="None|array[N](>=0)|seq[N](>=0)", returns="array[KxK]")
+def rotation_mean_chordal(R, weights=None):
+    """
+        Returns the chordal L2 mean: the rotation closest (in the Frobenius
+        norm) to the weighted average of the matrices, obtained with
+        :py:func:`closest_orthogonal_matrix`.
+    """
+    w = _normalized_weights(R, weights)
+    M = np.tensordot(w, R, axes=1)
+    return closest_orthogonal_matrix(M, special=True)
+
+
+@contract(R="array[Nx3x3],N>=1", weights="None|array[N](>=0)|seq[N](>=0)", returns="array[3x3]")
+def rotation_mean_quaternion(R, weights=None):
+    """
+        Returns the quaternion mean (Markley et al., 2007): the rotation
+        corresponding to the eigenvector with the largest eigenvalue of
+        sum_i w_i q_i q_i^T. It does not depend on the signs of the q_i.
+    """
+    w = _normalized_weights(R, weights)
+    Q = quaternions_from_rotations(R)
+    A = np.dot(Q.T * w, Q)
+    _, V = np.linalg.eigh(A)
+    q = V[:, -1]
+    return rotation_from_quaternion(q * np.sign(q[0] or 1))
+
+
+def _log_vectors(M, R):
+    """ The logarithms of M^T R_i, as angles (SO(2)) or (N,3) vectors. """
+    X = np.matmul(M.T, R)
+    if M.shape[0] == 2:
+        return np.arctan2(X[:, 1, 0], X[:, 0, 0])
+    return map_hats(so3_from_SO3(X))
+
+
+def _exp_vector(M, v):
+    """ Returns M exp(v). """
+    if M.shape[0] == 2:
+        return np.dot(M, SO2_from_angle(float(v)))
+    return np.dot(M, SO3_from_so3(hat_map(v)))
+
+
+@contract(
+    R="array[NxKxK],N>=1,K>=2,K<=3",
+    weights="None|array[N](>=0)|seq[N](>=0)",
+    norm="str",
+    tol="float,>0",
+    max_iter="int,>=1",
+    returns="array[KxK]",
+)
+def rotation_mean_geodesic(R, weights=None, norm="L2", tol=1e-12, max_iter=100):
+    """
+        Returns the geodesic mean, starting from the chordal mean:
+
+        - ``norm="L2"``: the Karcher mean, which minimizes the weighted sum
+          of the squared angles; each iteration moves along the weighted
+          average of the logarithms.
+        - ``norm="L1"``: the geodesic median, which minimizes the weighted
+          sum of the angles (Weiszfeld's algorithm, as in Hartley et al.,
+          2011); it is robust to outliers.
+
+        The iterations stop when the step is smaller than *tol* radians.
+    """
+    if norm not in ["L1", "L2"]:
+        raise ValueError("Unknown norm %r (use 'L1' or 'L2')." % norm)
+    w = _normalized_weights(R, weights)
+    M = rotation_mean_chordal(R, w)
+    for _ in range(max_iter):
+        V = _log_vectors(M, R)
+        if norm == "L1":
+            lengths = np.abs(V) if V.ndim == 1 else np.linalg.norm(V, axis=1)
+            # the points coinciding with the estimate do not pull
+            nonzero = lengths > tol
+            if not nonzero.any():
+                break
+            wi = w[nonzero] / lengths[nonzero]
+            delta = np.tensordot(wi, V[nonzero], axes=1) / wi.sum()
+        else:
+            delta = np.tensordot(w, V, axes=1)
+        M = _exp_vector(M, delta)
+        if np.linalg.norm(delta) < tol:
+            break
+    return M
+
+
+_rotation_means = {
+    "chordal": rotation_mean_chordal,
+    "quaternion": rotation_mean_quaternion,
+    "geodesic": rotation_mean_geodesic,
+}
+
+
+@contract(
+    R="array[NxKxK],N>=1", weights="None|array[N](>=0)|seq[N](>=0)", method="str", returns="array[KxK]"
+)
+def rotation_mean(R, weights=None, method="geodesic", **params):
+    """
+        Returns the weighted mean of the rotations in *R*.
+
+        :param method: One of "chordal" (:py:func:`rotation_mean_chordal`),
+            "quaternion" (:py:func:`rotation_mean_quaternion`, only for
+            SO(3)), or "geodesic" (:py:func:`rotation_mean_geodesic`,
+            which accepts *norm*, *tol* and *max_iter*).
+    """
+    if method not in _rotation_means:
+        msg = "Unknown method %r; available: %s." % (method, ", ".join(sorted(_rotation_means)))
+        raise ValueError(msg)
+    return _rotation_means[method](R, weights, **params)
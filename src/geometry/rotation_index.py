@@ -0,0 +1,156 @@
+# coding=utf-8
+"""
+    Nearest-neighbour queries on SO(3).
+"""
+import numpy as np
+from contracts import contract
+
+from .quaternions import quaternion_angles
+from .rotations import quaternions_from_rotations
+
+__all__ = [
+    "RotationIndex",
+]
+
+
+class RotationIndex(object):
+    """
+        A nearest-neighbour index over a set of 3D rotations, supporting
+        k-NN and radius queries, bulk build, and incremental insertion: ::
+
+            index = RotationIndex(rotations)  # stack of (N,3,3) matrices
+            distances, indices = index.query(R, k=5)
+            distances, indices = index.query_radius(R, 0.1)
+            i = index.add(R2)
+
+        The rotations are stored as unit quaternions q, in a k-d tree
+        (``scipy.spatial.cKDTree``) that contains both q and -q; as the
+        geodesic distance is a monotone function of the smaller of
+        |p - q| and |p + q|, the Euclidean neighbours in the tree are the
+        geodesic neighbours. The returned distances are then recomputed
+        exactly, as by :py:func:`geometry.rotation_distance_matrix`.
+
+        Insertion uses the logarithmic method: the points are divided in
+        blocks whose sizes are decreasing powers of two, each with its own
+        tree, and two blocks of the same size are merged (i.e., their tree is
+        rebuilt) when needed. An insertion costs amortized O(log^2 N), and
+        a query looks in O(log N) trees.
+    """
+
+    @contract(rotations="None|array[Nx3x3]")
+    def __init__(self, rotations=None):
+        self._Q = np.empty((0, 4))
+        self._n = 0
+        # list of (start, stop, tree), with decreasing sizes
+        self._blocks = []
+        if rotations is not None and len(rotations) > 0:
+            self.add(rotations)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def quaternions(self):
+        """ The (N,4) quaternions of the rotations in the index (not a copy). """
+        return self._Q[: self._n]
+
+    @contract(R="array[3x3]|array[Nx3x3]", returns="int|array[N](int)")
+    def add(self, R):
+        """
+            Adds one rotation, or a stack of rotations, returning their
+            indices. A stack is added as a single block, so a bulk build
+            costs a single tree construction.
+        """
+        Q = quaternions_from_rotations(R).reshape(-1, 4)
+        m = len(Q)
+        n = self._n
+        capacity = len(self._Q)
+        if n + m > capacity:
+            capacity = max(n + m, 2 * capacity, 16)
+            buffer = np.empty((capacity, 4))
+            buffer[:n] = self._Q[:n]
+            self._Q = buffer
+        self._Q[n : n + m] = Q
+        self._n = n + m
+        start = n
+        while self._blocks and self._blocks[-1][1] - self._blocks[-1][0] <= self._n - start:
+            start = self._blocks.pop()[0]
+        self._blocks.append((start, self._n, self._build_tree(start, self._n)))
+        if R.ndim == 2:
+            return n
+        return np.arange(n, n + m)
+
+    def _build_tree(self, start, stop):
+        from scipy.spatial import cKDTree
+
+        Q = self._Q[start:stop]
+        return cKDTree(np.vstack([Q, -Q]))
+
+    def _query_quaternions(self, R):
+        P = quaternions_from_rotations(R)
+        return P.reshape(-1, 4)
+
+    @contract(R="array[3x3]|array[Mx3x3]", k="int,>=1")
+    def query(self, R, k=1):
+        """
+            Finds the *k* rotations closest to *R* (or to each rotation in
+            the stack *R*).
+
+            Returns a tuple (distances, indices), sorted by distance, of
+            shape (k,) for one rotation and (M,k) for a stack.
+        """
+        if k > self._n:
+            msg = "Cannot find %d neighbours among %d rotations." % (k, self._n)
+            raise ValueError(msg)
+        P = self._query_quaternions(R)
+        candidates = []
+        for start, stop, tree in self._blocks:
+            size = stop - start
+            # each rotation appears twice in the tree (q and -q)
+            kk = min(2 * k, 2 * size)
+            _, idx = tree.query(P, kk)
+            candidates.append(start + np.reshape(idx, (len(P), kk)) % size)
+        indices = np.hstack(candidates)
+        distances = quaternion_angles(P[:, np.newaxis, :], self._Q[indices])
+        # the second copy of a rotation has the same distance; drop it
+        order = np.argsort(indices, axis=1, kind="stable")
+        sorted_indices = np.take_along_axis(indices, order, axis=1)
+        duplicate = np.zeros(indices.shape, dtype="bool")
+        duplicate[:, 1:] = sorted_indices[:, 1:] == sorted_indices[:, :-1]
+        distances[np.nonzero(duplicate)[0], order[duplicate]] = np.inf
+        best = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        distances = np.take_along_axis(distances, best, axis=1)
+        indices = np.take_along_axis(indices, best, axis=1)
+        if R.ndim == 2:
+            return distances[0], indices[0]
+        return distances, indices
+
+    @contract(R="array[3x3]|array[Mx3x3]", radius="(float|int),>=0")
+    def query_radius(self, R, radius):
+        """
+            Finds all rotations within geodesic distance *radius* from *R*.
+
+            Returns a tuple (distances, indices), sorted by distance; for a
+            stack of M rotations, returns a list of M such tuples.
+        """
+        P = self._query_quaternions(R)
+        # the chordal distance between quaternions is 2 sin(angle / 4);
+        # a small margin accounts for the rounding, as the exact distances
+        # are checked afterwards
+        chord = 2 * np.sin(min(radius, np.pi) / 4) + 1e-9
+        results = []
+        for p in P:
+            found = [np.zeros(0, dtype="int")]
+            for start, stop, tree in self._blocks:
+                idx = np.array(tree.query_ball_point(p, chord), dtype="int")
+                found.append(start + idx % (stop - start))
+            indices = np.unique(np.concatenate(found))
+            distances = quaternion_angles(p, self._Q[indices])
+            inside = distances <= radius
+            indices = indices[inside]
+            distances = distances[inside]
+            order = np.argsort(distances, kind="stable")
+            results.append((distances[order], indices[order]))
+        if R.ndim == 2:
+            return results[0]
+        return results
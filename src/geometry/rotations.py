@@ -4,12 +4,14 @@
 
     conventions: q=( a + bi + cj + dk), with a>0
 """
-import itertools
+import math
 
 import numpy as np
 from contracts import contract, new_contract, raise_wrapped, raise_desc
 
-from .basic_utils import safe_arccos, normalize_length
+from .constants import GeometryConstants
+from .quaternions import quaternion_distance_matrix
+from .basic_utils import fast_path, normalize_length, random_generator, safe_arccos
 from .spheres import default_axis
 from .types import se2value
 
@@ -22,6 +24,7 @@ __all__ = [
     "SO2_from_angle",
     "SO3_from_R3",
     "angle_from_SO2",
+    "angles_from_rotations",
     "angle_scale_from_O2",
     "axis_angle_from_quaternion",
     "axis_angle_from_rotation",
@@ -29,7 +32,13 @@ __all__ = [
     "check_diagonal",
     "check_orthogonal",
     "check_skew_symmetric",
+    "is_SO",
+    "is_diagonal",
+    "is_orthogonal",
+    "is_skew_symmetric",
     "geodesic_distance_for_rotations",
+    "rotation_distances",
+    "rotation_distance_matrix",
     "hat_map",
     "hat_map_2d",
     "map_hat",
@@ -39,6 +48,8 @@ __all__ = [
     "random_orthogonal_transform",
     "random_quaternion",
     "random_rotation",
+    "random_quaternions",
+    "random_rotations",
     "rotation_from_axes_spec",
     "rotation_from_axis_angle",
     "rotation_from_axis_angle2",
@@ -49,30 +60,83 @@ __all__ = [
     "rot2d",
     "rot2d_from_angle",
     "angle_from_rot2d",
+    "rotations_from_quaternions",
+    "quaternions_from_rotations",
+    "axis_angles_from_rotations",
+    "rotations_from_axis_angles",
+    "hat_maps",
+    "map_hats",
+    "SO3_from_so3",
+    "so3_from_SO3",
+    "SO2_from_so2",
+    "so2_from_SO2",
+    "exp_coefficients",
+    "log_coefficient",
+    "rotation_angles",
 ]
 
 
-@contract(x="array[NxN],N>0")
-def check_SO(x):
-    """ Checks that the given value is a rotation matrix of arbitrary size. """
-    try:
-        check_orthogonal(x)
-    except ValueError as e:
-        msg = "It is not orthogonal."
-        raise_wrapped(ValueError, e, msg, x=x, compact=True)
-    determinant = np.linalg.det(x * 1.0)  # XXX: voodoo
-    # lapack_lite.LapackError:
-    # Parameter a has non-native byte order in lapack_lite.dgetrf
-    if not np.allclose(determinant, 1.0):
-        msg = "The determinant is %s not 1." % determinant
-        raise_desc(ValueError, msg, x=x)
+# The checks below accept a single matrix, or a stack of shape (N,n,n).
+# The is_* functions return a boolean (or a boolean array of shape (N,)),
+# while the check_* functions raise ValueError for the first failing
+# element, whose index in the stack is reported in the message.
+
+
+def _square_matrices(x):
+    x = np.asarray(x)
+    if x.ndim < 2 or x.shape[-1] != x.shape[-2] or x.shape[-1] == 0:
+        msg = "Expected a square matrix or a stack of them, got shape %s." % (x.shape,)
+        raise ValueError(msg)
+    return x
+
+
+def _raise_first(msg, index, shape):
+    """ Raises ValueError, prefixing the stack index for stacks. """
+    if len(shape) > 2:
+        msg = "Element %s of the stack: %s" % (index[0] if len(shape) == 3 else tuple(index), msg)
+    raise ValueError(msg)
+
+
+def _diagonal_failures(m, atol):
+    m = _square_matrices(m)
+    off_diagonal = ~np.eye(m.shape[-1], dtype=bool)
+    # written so that NaNs fail
+    return np.logical_and(off_diagonal, ~(np.abs(m) <= atol))
+
+
+def is_diagonal(m, rtol=10e-10, atol=10e-7):
+    """ Returns whether the off-diagonal elements are within *atol* of 0. """
+    return ~_diagonal_failures(m, atol).any(axis=(-2, -1))
+
+
+def check_diagonal(m, rtol=10e-10, atol=10e-7):
+    """
+        Checks that the off-diagonal elements are within *atol* of 0
+        (*rtol* is irrelevant when comparing with 0).
+    """
+    m = np.asarray(m)
+    bad = _diagonal_failures(m, atol)
+    if bad.any():
+        index = np.argwhere(bad)[0]
+        i, j = index[-2:]
+        msg = "The element %s, %s is %s not equal to zero." % (i, j, m[tuple(index)])
+        _raise_first(msg, index[:-2], bad.shape)
+
+
+def _orthogonal_products(x):
+    x = _square_matrices(x)
+    xt = np.swapaxes(x, -1, -2)
+    return np.matmul(x, xt), np.matmul(xt, x)
+
+
+def is_orthogonal(x):
+    a, b = _orthogonal_products(x)
+    return np.logical_and(is_diagonal(a), is_diagonal(b))
 
 
-@contract(x="array[NxN],N>0")
 def check_orthogonal(x):
     """ Check that the argument is an orthogonal matrix. """
-    a = np.dot(x, x.T)
-    b = np.dot(x.T, x)
+    a, b = _orthogonal_products(x)
     try:
         check_diagonal(a)
         check_diagonal(b)
@@ -81,32 +145,71 @@ def check_orthogonal(x):
         raise_wrapped(ValueError, e, msg, a=a, b=b)
 
 
-def check_diagonal(m, rtol=10e-10, atol=10e-7):
-    shape = m.shape
-    for i, j in itertools.product(range(shape[0]), range(shape[1])):
-        if i != j:
-            if not np.allclose(m[i, j], 0, rtol=rtol, atol=atol):
-                msg = "The element %s, %s is %s not equal to zero." % (i, j, m[i, j])
-                raise ValueError(msg)
+def _determinants(x):
+    # XXX: voodoo; the copy avoids
+    # lapack_lite.LapackError:
+    # Parameter a has non-native byte order in lapack_lite.dgetrf
+    return np.linalg.det(x * 1.0)
+
+
+def _is_one(x):
+    # same as np.isclose(x, 1), which is much slower on small arrays
+    return np.abs(x - 1.0) <= 1e-8 + 1e-5
+
+
+def is_SO(x):
+    """ Returns whether *x* is a rotation matrix (or a mask, for a stack). """
+    x = _square_matrices(x)
+    return np.logical_and(is_orthogonal(x), _is_one(_determinants(x)))
+
+
+def check_SO(x):
+    """ Checks that the given value is a rotation matrix of arbitrary size. """
+    x = _square_matrices(x)
+    if x.ndim > 2:
+        bad = ~is_SO(x)
+        if bad.any():
+            index = tuple(np.argwhere(bad)[0])
+            try:
+                check_SO(x[index])
+            except ValueError as e:
+                msg = "Element %s of the stack is not a rotation." % (index if len(index) > 1 else index[0],)
+                raise_wrapped(ValueError, e, msg, compact=True)
+        return
+    try:
+        check_orthogonal(x)
+    except ValueError as e:
+        msg = "It is not orthogonal."
+        raise_wrapped(ValueError, e, msg, x=x, compact=True)
+    determinant = _determinants(x)
+    if not _is_one(determinant):
+        msg = "The determinant is %s not 1." % determinant
+        raise_desc(ValueError, msg, x=x)
+
+
+def is_skew_symmetric(x):
+    """ Returns whether *x* is skew-symmetric (or a mask, for a stack). """
+    x = _square_matrices(x)
+    return (x == -np.swapaxes(x, -1, -2)).all(axis=(-2, -1))
 
 
-@contract(x="array[NxN]")
 def check_skew_symmetric(x):
     """ Check that the argument is a skew-symmetric matrix. """
-    n = x.shape[0]
-    ok = (np.zeros((n, n)) == x).all()
-    if not ok:
-        diag = x.diagonal()
-        if not (diag == 0).all():
-            raise ValueError("Expected skew symmetric, but diagonal is not " "exactly zero: %s." % diag)
-        for i, j in itertools.product(range(n), range(n)):
-            if i < j:
-                continue
-            if x[i, j] != -x[j, i]:
-                raise ValueError(
-                    "Expected skew symmetric, but "
-                    + "a[%d][%d] = %f, a[%d][%d] = %f" % (i, j, x[i, j], j, i, x[j, i])
-                )
+    x = _square_matrices(x)
+    bad = ~is_skew_symmetric(x)
+    if not bad.any():
+        return
+    index = tuple(np.argwhere(np.atleast_1d(bad))[0][: x.ndim - 2])
+    xk = x[index]
+    diag = xk.diagonal()
+    if not (diag == 0).all():
+        msg = "Expected skew symmetric, but diagonal is not " "exactly zero: %s." % diag
+        _raise_first(msg, index, x.shape)
+    # the first (i,j) with i > j, as visited row by row
+    lower = np.tri(xk.shape[0], k=-1, dtype=bool)
+    i, j = np.argwhere(np.logical_and(xk != -xk.T, lower))[0]
+    msg = "Expected skew symmetric, but " + "a[%d][%d] = %f, a[%d][%d] = %f" % (i, j, xk[i, j], j, i, xk[j, i])
+    _raise_first(msg, index, x.shape)
 
 
 new_contract("orthogonal", check_orthogonal)
@@ -124,6 +227,7 @@ new_contract("so3", "array[3x3],skew_symmetric")
 new_contract("rotation_matrix", "SO3")
 
 
+@fast_path
 @contract(theta="number", returns="SO3")
 def rotz(theta):
     """ Returns a 3x3 rotation matrix corresponding
@@ -157,6 +261,7 @@ def roty(theta):
     return SO3_from_R3(w)
 
 
+@fast_path
 @contract(theta="number", returns="SO2")
 def SO2_from_angle(theta):
     """ Returns a 2x2 rotation matrix. """
@@ -175,6 +280,7 @@ def angle_scale_from_O2(M):
     return angle, scale
 
 
+@fast_path
 @contract(R="SO2", returns="float")
 def angle_from_SO2(R):
     angle = np.arctan2(R[1, 0], R[0, 0])
@@ -183,11 +289,13 @@ def angle_from_SO2(R):
     return angle
 
 
+@fast_path
 @contract(omega="number", returns="so2")
 def hat_map_2d(omega):
     return np.array([[0, -1], [+1, 0]]) * omega
 
 
+@fast_path
 @contract(W="so2", returns="float")
 def map_hat_2d(W):
     return W[1, 0]
@@ -199,16 +307,19 @@ angle_from_rot2d = angle_from_SO2
 
 
 @contract(returns="unit_quaternion")
-def random_quaternion():
+def random_quaternion(rng=None):
     """ Generate a random quaternion.
 
         Uses the algorithm used in Kuffner, ICRA'04.
+
+        :param rng: See :py:func:`random_generator`.
     """
-    s = np.random.uniform()
+    rng = random_generator(rng)
+    s = rng.uniform()
     sigma1 = np.sqrt(1 - s)
     sigma2 = np.sqrt(s)
-    theta1 = np.random.uniform() * 2 * np.pi
-    theta2 = np.random.uniform() * 2 * np.pi
+    theta1 = rng.uniform() * 2 * np.pi
+    theta2 = rng.uniform() * 2 * np.pi
 
     q = np.array(
         [np.cos(theta2) * sigma2, np.sin(theta1) * sigma1, np.cos(theta1) * sigma1, np.sin(theta2) * sigma2]
@@ -218,17 +329,54 @@ def random_quaternion():
     return q
 
 
+@contract(n="int,>=0,N", returns="array[Nx4]")
+def random_quaternions(n, rng=None):
+    """ Batched version of :py:func:`random_quaternion`. """
+    rng = random_generator(rng)
+    s = rng.uniform(size=n)
+    sigma1 = np.sqrt(1 - s)
+    sigma2 = np.sqrt(s)
+    theta1 = rng.uniform(size=n) * 2 * np.pi
+    theta2 = rng.uniform(size=n) * 2 * np.pi
+    Q = np.empty((n, 4))
+    Q[:, 0] = np.cos(theta2) * sigma2
+    Q[:, 1] = np.sin(theta1) * sigma1
+    Q[:, 2] = np.cos(theta1) * sigma1
+    Q[:, 3] = np.sin(theta2) * sigma2
+    Q *= np.where(Q[:, :1] < 0, -1.0, 1.0)
+    return Q
+
+
 @contract(returns="array[2x2]|rotation_matrix", ndim="2|3")
-def random_rotation(ndim=3):
+def random_rotation(ndim=3, rng=None):
     """ Generate a random rotation matrix.
 
         This is a wrapper around :py:func:`random_quaternion`.
+
+        :param rng: See :py:func:`random_generator`.
     """
     if ndim == 3:
-        q = random_quaternion()
+        q = random_quaternion(rng)
         return rotation_from_quaternion(q)
     elif ndim == 2:
-        return rot2d(np.random.uniform(0, 2 * np.pi))
+        return rot2d(random_generator(rng).uniform(0, 2 * np.pi))
+    else:
+        assert False
+
+
+@contract(n="int,>=0,N", ndim="(2|3),K", returns="array[NxKxK]")
+def random_rotations(n, ndim=3, rng=None):
+    """
+        Batched version of :py:func:`random_rotation`: returns a stack
+        of *n* rotation matrices, uniformly distributed.
+    """
+    if ndim == 3:
+        return rotations_from_quaternions(random_quaternions(n, rng))
+    elif ndim == 2:
+        theta = random_generator(rng).uniform(0, 2 * np.pi, size=n)
+        C = np.cos(theta)
+        S = np.sin(theta)
+        return np.stack([np.stack([C, -S], axis=-1), np.stack([S, C], axis=-1)], axis=-2)
     else:
         assert False
 
@@ -252,17 +400,61 @@ def geodesic_distance_for_rotations(R1, R2):
     return angle1
 
 
-@contract(v="array[3]", returns="array[3x3],skew_symmetric")
-def hat_map(v) -> se2value:
-    """ Maps a vector to a 3x3 skew symmetric matrix. """
-    h = np.zeros((3, 3))
+@contract(R="rotation_matrix", Rs="array[Nx3x3]", returns="array[N](>=0)")
+def rotation_distances(R, Rs):
+    """
+        Returns the geodesic distances between the rotation *R* and each
+        of the rotations in *Rs*.
+
+        The cosines of the angles are obtained from the traces of
+        :math:`R^T R_i`, computed all at once as a matrix-vector product;
+        the small angles, for which the arccos is not accurate, are
+        recomputed with :py:func:`angles_from_rotations`.
+    """
+    Rs = np.asarray(Rs, dtype="float64")
+    N = len(Rs)
+    c = (np.dot(Rs.reshape(N, 9), np.ravel(R)) - 1) / 2
+    small = np.nonzero(c > np.cos(GeometryConstants.rotation_distance_small_angle))[0]
+    angles = np.arccos(np.clip(c, -1, 1))
+    if small.size:
+        angles[small] = angles_from_rotations(np.matmul(np.transpose(R), Rs[small]))
+    return angles
+
+
+@contract(A="array[Mx3x3]", B="None|array[Nx3x3]", returns="array[Mx*]")
+def rotation_distance_matrix(A, B=None, dtype="float64", block_size=None, out=None):
+    """
+        Computes the MxN matrix of geodesic distances between the rotations
+        in *A* and those in *B* (default: *A*).
+
+        The rotations are converted to quaternions, and the distances
+        are computed with :py:func:`quaternion_distance_matrix`, which
+        accepts the same *dtype*, *block_size*, and *out* parameters.
+    """
+    P = quaternions_from_rotations(A)
+    Q = None if B is None else quaternions_from_rotations(B)
+    return quaternion_distance_matrix(P, Q, dtype=dtype, block_size=block_size, out=out)
+
+
+@fast_path
+@contract(v="array[3]", out="None|array[3x3]", returns="array[3x3],skew_symmetric")
+def hat_map(v, out=None) -> se2value:
+    """
+        Maps a vector to a 3x3 skew symmetric matrix; if *out* is given,
+        the matrix is written there instead of in a new array.
+    """
+    h = np.zeros((3, 3)) if out is None else out
+    h[0, 0] = h[1, 1] = h[2, 2] = 0
     h[0, 1] = -v[2]
     h[0, 2] = v[1]
     h[1, 2] = -v[0]
-    h = h - h.transpose()
+    h[1, 0] = v[2]
+    h[2, 0] = -v[1]
+    h[2, 1] = v[0]
     return h
 
 
+@fast_path
 @contract(H="array[3x3],skew_symmetric", returns="array[3]")
 def map_hat(H: se2value):
     """ The inverse of :py:func:`hat_map`. """
@@ -273,11 +465,12 @@ def map_hat(H: se2value):
     return v
 
 
-@contract(x="unit_quaternion", returns="rotation_matrix")
-def rotation_from_quaternion(x):
+@fast_path
+@contract(x="unit_quaternion", out="None|array[3x3]", returns="rotation_matrix")
+def rotation_from_quaternion(x, out=None):
     """
-        Converts a quaternion to a rotation matrix.
-
+        Converts a quaternion to a rotation matrix; if *out* is given,
+        the matrix is written there instead of in a new array.
     """
     # Documented in <http://en.wikipedia.org/w/index.php?title=
     # Quaternions_and_spatial_rotation&oldid=402924915>
@@ -287,9 +480,15 @@ def rotation_from_quaternion(x):
     r2 = [2 * b * c + 2 * a * d, a ** 2 - b ** 2 + c ** 2 - d ** 2, 2 * c * d - 2 * a * b]
     r3 = [2 * b * d - 2 * a * c, 2 * c * d + 2 * a * b, a ** 2 - b ** 2 - c ** 2 + d ** 2]
 
-    return np.array([r1, r2, r3])
+    if out is None:
+        return np.array([r1, r2, r3])
+    out[0] = r1
+    out[1] = r2
+    out[2] = r3
+    return out
 
 
+@fast_path
 @contract(R="rotation_matrix", returns="unit_quaternion")
 def quaternion_from_rotation(R):
     """
@@ -325,6 +524,7 @@ def quaternion_from_rotation(R):
         return Q
 
 
+@fast_path
 @contract(axis="direction", angle="float", returns="unit_quaternion")
 def quaternion_from_axis_angle(axis, angle):
     """
@@ -345,6 +545,7 @@ def quaternion_from_axis_angle(axis, angle):
     return Q
 
 
+@fast_path
 @contract(q="unit_quaternion", returns="axis_angle_canonical")
 def axis_angle_from_quaternion(q):
     """
@@ -364,6 +565,7 @@ def axis_angle_from_quaternion(q):
     return axis, angle
 
 
+@fast_path
 @contract(axis="direction", angle="float", returns="rotation_matrix")
 def rotation_from_axis_angle(axis, angle):
     """
@@ -377,6 +579,7 @@ def rotation_from_axis_angle(axis, angle):
     return R
 
 
+@fast_path
 @contract(R="rotation_matrix", returns="axis_angle_canonical")
 def axis_angle_from_rotation(R):
     """
@@ -442,3 +645,353 @@ def rotation_from_axes_spec(x_axis, vector_on_xy_plane):  # TODO: docs
     y_axis = normalize_length(np.cross(z_axis, x_axis))
     R = np.vstack((x_axis, y_axis, z_axis))
     return R.copy("C")
+
+
+# Batched versions of the conversions above.
+#
+# They accept stacked arrays, e.g. (N,4) quaternions or (N,3,3) matrices,
+# and return stacked results; a single element (e.g. shape (4,)) is
+# also accepted and gives the same result as the scalar function.
+# Only the shapes are checked, not the group membership.
+
+
+@contract(V="array[Nx3]|array[3]", returns="array[Nx3x3]|array[3x3]")
+def hat_maps(V):
+    """ Batched version of :py:func:`hat_map`. """
+    V = np.asarray(V)
+    H = np.zeros(V.shape[:-1] + (3, 3))
+    H[..., 0, 1] = -V[..., 2]
+    H[..., 0, 2] = V[..., 1]
+    H[..., 1, 2] = -V[..., 0]
+    H[..., 1, 0] = V[..., 2]
+    H[..., 2, 0] = -V[..., 1]
+    H[..., 2, 1] = V[..., 0]
+    return H
+
+
+@contract(H="array[Nx3x3]|array[3x3]", returns="array[Nx3]|array[3]")
+def map_hats(H):
+    """ Batched version of :py:func:`map_hat`. """
+    H = np.asarray(H)
+    V = np.empty(H.shape[:-2] + (3,))
+    V[..., 0] = -H[..., 1, 2]
+    V[..., 1] = H[..., 0, 2]
+    V[..., 2] = -H[..., 0, 1]
+    return V
+
+
+@contract(Q="array[Nx4]|array[4]", returns="array[Nx3x3]|array[3x3]")
+def rotations_from_quaternions(Q):
+    """ Batched version of :py:func:`rotation_from_quaternion`. """
+    Q = np.asarray(Q)
+    a, b, c, d = Q[..., 0], Q[..., 1], Q[..., 2], Q[..., 3]
+    R = np.empty(Q.shape[:-1] + (3, 3))
+    R[..., 0, 0] = a ** 2 + b ** 2 - c ** 2 - d ** 2
+    R[..., 0, 1] = 2 * b * c - 2 * a * d
+    R[..., 0, 2] = 2 * b * d + 2 * a * c
+    R[..., 1, 0] = 2 * b * c + 2 * a * d
+    R[..., 1, 1] = a ** 2 - b ** 2 + c ** 2 - d ** 2
+    R[..., 1, 2] = 2 * c * d - 2 * a * b
+    R[..., 2, 0] = 2 * b * d - 2 * a * c
+    R[..., 2, 1] = 2 * c * d + 2 * a * b
+    R[..., 2, 2] = a ** 2 - b ** 2 - c ** 2 + d ** 2
+    return R
+
+
+@contract(R="array[Nx3x3]|array[3x3]", returns="array[Nx4]|array[4]")
+def quaternions_from_rotations(R):
+    """
+        Batched version of :py:func:`quaternion_from_rotation`.
+
+        Uses the same pivoting on the largest diagonal element,
+        and returns quaternions with nonnegative real part.
+    """
+    R = np.asarray(R)
+    shape = R.shape[:-2]
+    Rf = R.reshape(-1, 3, 3)
+    n = Rf.shape[0]
+    i = np.arange(n)
+    u = np.argmax(np.diagonal(Rf, axis1=1, axis2=2), axis=1)
+    v = (u + 1) % 3
+    w = (u + 2) % 3
+    rr = 1 + Rf[i, u, u] - Rf[i, v, v] - Rf[i, w, w]
+    r = np.sqrt(np.maximum(rr, 0))
+    degenerate = r == 0
+    r2 = 2 * np.where(degenerate, 1, r)
+
+    Q = np.zeros((n, 4))
+    Q[:, 0] = (Rf[i, w, v] - Rf[i, v, w]) / r2
+    Q[i, u + 1] = r / 2
+    Q[i, v + 1] = (Rf[i, u, v] + Rf[i, v, u]) / r2
+    Q[i, w + 1] = (Rf[i, w, u] + Rf[i, u, w]) / r2
+    Q[degenerate] = [1.0, 0.0, 0.0, 0.0]
+    Q[Q[:, 0] < 0] *= -1
+    return Q.reshape(shape + (4,))
+
+
+@contract(axes="array[Nx3]|array[3]", angles="array[N]|number", returns="array[Nx3x3]|array[3x3]")
+def rotations_from_axis_angles(axes, angles):
+    """ Batched version of :py:func:`rotation_from_axis_angle`. """
+    angles = np.asarray(angles, dtype="float")[..., np.newaxis, np.newaxis]
+    W = hat_maps(axes)
+    W2 = np.matmul(W, W)
+    return np.eye(3) + W * np.sin(angles) + W2 * (1 - np.cos(angles))
+
+
+@contract(R="array[Nx3x3]|array[3x3]", returns="tuple(array[Nx3]|array[3], array[N]|float)")
+def axis_angles_from_rotations(R, atol_pi=1e-6):
+    """
+        Batched version of :py:func:`axis_angle_from_rotation`.
+
+        Returns a tuple ``(axes, angles)``. Angles are in [0, pi];
+        for a zero angle the :py:func:`default_axis` is returned.
+
+        Close to pi the antisymmetric part of R vanishes; for those
+        elements (norm below *atol_pi*) the axis is recovered from the
+        symmetric part instead.
+    """
+    R = np.asarray(R)
+    shape = R.shape[:-2]
+    Rf = R.reshape(-1, 3, 3)
+    n = Rf.shape[0]
+    trace = np.trace(Rf, axis1=1, axis2=2)
+    angles = safe_arccos((trace - 1) / 2)
+
+    v = np.empty((n, 3))
+    v[:, 0] = Rf[:, 2, 1] - Rf[:, 1, 2]
+    v[:, 1] = Rf[:, 0, 2] - Rf[:, 2, 0]
+    v[:, 2] = Rf[:, 1, 0] - Rf[:, 0, 1]
+    vn = np.linalg.norm(v, axis=1)
+
+    axes = np.empty((n, 3))
+    axes[:] = default_axis()
+    ok = np.logical_and(angles != 0, vn >= atol_pi)
+    axes[ok] = v[ok] / vn[ok, np.newaxis]
+
+    near_pi = np.logical_and(angles != 0, vn < atol_pi)
+    if np.any(near_pi):
+        axes[near_pi] = _axes_from_symmetric_part(Rf[near_pi], angles[near_pi], v[near_pi])
+
+    if shape == ():
+        return axes[0], float(angles[0])
+    return axes.reshape(shape + (3,)), angles.reshape(shape)
+
+
+@contract(R="array[Nx3x3]|array[3x3]", returns="array[N](>=0)|float")
+def angles_from_rotations(R):
+    """
+        Returns the rotation angles (in [0, pi]) of a stack of rotations.
+
+        The angle is computed as atan2(sin, cos) from the antisymmetric
+        part and the trace, which is accurate also near 0 and pi
+        (unlike the arccos of the trace).
+    """
+    R = np.asarray(R)
+    s = 0.5 * np.sqrt(
+        (R[..., 2, 1] - R[..., 1, 2]) ** 2 + (R[..., 0, 2] - R[..., 2, 0]) ** 2 + (R[..., 1, 0] - R[..., 0, 1]) ** 2
+    )
+    c = 0.5 * (R[..., 0, 0] + R[..., 1, 1] + R[..., 2, 2] - 1)
+    angles = np.arctan2(s, c)
+    if R.ndim == 2:
+        return float(angles)
+    return angles
+
+
+def _axes_from_symmetric_part(R, angles, v):
+    """
+        Recovers the rotation axes from the symmetric part of R,
+        which is cos(t) I + (1 - cos(t)) a a^T.
+
+        This is well conditioned for large angles, where the antisymmetric
+        part vanishes; *v* (the antisymmetric part) only fixes the sign.
+    """
+    c = np.cos(angles)[:, np.newaxis, np.newaxis]
+    B = (0.5 * (R + np.transpose(R, (0, 2, 1))) - c * np.eye(3)) / (1 - c)
+    j = np.arange(R.shape[0])
+    k = np.argmax(np.diagonal(B, axis1=1, axis2=2), axis=1)
+    a = B[j, :, k] / np.sqrt(B[j, k, k])[:, np.newaxis]
+    a /= np.linalg.norm(a, axis=1)[:, np.newaxis]
+    flip = (a * v).sum(axis=1) < 0
+    a[flip] *= -1
+    return a
+
+
+def exp_coefficients(theta):
+    """
+        Returns the coefficients A = sin(t)/t, B = (1-cos(t))/t^2 and
+        C = (t-sin(t))/t^3 of the exponential maps of SO(3) and SE(3).
+
+        Taylor series are used for small angles, where the closed forms
+        lose precision.
+    """
+    if np.ndim(theta) == 0:
+        # scalar case: avoid the overhead of small arrays
+        t = float(theta)
+        if t < 0.1:
+            t2 = t * t
+            return (
+                1 - t2 / 6 * (1 - t2 / 20 * (1 - t2 / 42)),
+                0.5 - t2 / 24 * (1 - t2 / 30 * (1 - t2 / 56)),
+                1.0 / 6 - t2 / 120 * (1 - t2 / 42 * (1 - t2 / 72)),
+            )
+        s = math.sin(t)
+        return s / t, 2 * (math.sin(t / 2) / t) ** 2, (t - s) / (t * t * t)
+
+    theta = np.asarray(theta, dtype="float")
+    small = theta < 0.1
+    t = np.where(small, 1.0, theta)
+    t2 = theta * theta
+    A = np.where(small, 1 - t2 / 6 * (1 - t2 / 20 * (1 - t2 / 42)), np.sin(t) / t)
+    B = np.where(small, 0.5 - t2 / 24 * (1 - t2 / 30 * (1 - t2 / 56)), 2 * (np.sin(t / 2) / t) ** 2)
+    C = np.where(
+        small, 1.0 / 6 - t2 / 120 * (1 - t2 / 42 * (1 - t2 / 72)), (t - np.sin(t)) / (t * t * t)
+    )
+    return A, B, C
+
+
+def log_coefficient(theta):
+    """
+        Returns D = (1 - A / (2B)) / t^2 = 1/t^2 - 1/(2 t tan(t/2)), the
+        coefficient of W^2 in the inverse of the V matrix of SE(3).
+    """
+    # the closed form has a cancellation of order 1/t^2
+    if np.ndim(theta) == 0:
+        t = float(theta)
+        if t < 0.2:
+            t2 = t * t
+            return 1.0 / 12 + t2 / 720 * (1 + t2 / 42 * (1 + t2 / 40))
+        return 1 / (t * t) - 1 / (2 * t * math.tan(t / 2))
+
+    theta = np.asarray(theta, dtype="float")
+    small = theta < 0.2
+    t = np.where(small, 1.0, theta)
+    t2 = theta * theta
+    D = np.where(
+        small,
+        1.0 / 12 + t2 / 720 * (1 + t2 / 42 * (1 + t2 / 40)),
+        1 / (t * t) - 1 / (2 * t * np.tan(t / 2)),
+    )
+    return D
+
+
+def rotation_angles(W):
+    """
+        Returns the norm of the vectors corresponding to the matrices
+        in so(3), shaped so that it broadcasts with the matrices.
+    """
+    theta = np.sqrt(W[..., 2, 1] ** 2 + W[..., 0, 2] ** 2 + W[..., 1, 0] ** 2)
+    if W.ndim > 2:
+        theta = theta[..., np.newaxis, np.newaxis]
+    return theta
+
+
+def _SO3_from_so3(W):
+    theta = rotation_angles(W)
+    A, B, _ = exp_coefficients(theta)
+    return np.eye(3) + A * W + B * np.matmul(W, W)
+
+
+def _so3_from_SO3(R):
+    if R.ndim == 2:
+        # scalar case: avoid the overhead of small arrays
+        v = np.array([R[2, 1] - R[1, 2], R[0, 2] - R[2, 0], R[1, 0] - R[0, 1]])
+        s = math.sqrt(v.dot(v)) / 2
+        c = (R[0, 0] + R[1, 1] + R[2, 2] - 1) / 2
+        theta = math.atan2(s, c)
+        if c < 0:
+            w = _axes_from_symmetric_part(R[np.newaxis], np.array([theta]), v[np.newaxis])[0] * theta
+        elif theta < 1e-6:
+            w = v * 0.5 * (1 + theta * theta / 6)
+        else:
+            w = v * (theta / (2 * s))
+        return np.array([[0, -w[2], w[1]], [w[2], 0, -w[0]], [-w[1], w[0], 0]])
+
+    shape = R.shape
+    Rf = R.reshape(-1, 3, 3)
+    v = np.empty((Rf.shape[0], 3))
+    v[:, 0] = Rf[:, 2, 1] - Rf[:, 1, 2]
+    v[:, 1] = Rf[:, 0, 2] - Rf[:, 2, 0]
+    v[:, 2] = Rf[:, 1, 0] - Rf[:, 0, 1]
+    s = np.sqrt((v * v).sum(axis=1)) / 2
+    c = (Rf[:, 0, 0] + Rf[:, 1, 1] + Rf[:, 2, 2] - 1) / 2
+    theta = np.arctan2(s, c)
+
+    # w = theta * axis = v * theta / (2 sin(theta))
+    small = theta < 1e-6
+    ratio = np.where(small, 0.5 * (1 + theta * theta / 6), theta / (2 * np.where(small, 1, s)))
+    w = v * ratio[:, np.newaxis]
+
+    large = c < 0
+    if np.any(large):
+        axes = _axes_from_symmetric_part(Rf[large], theta[large], v[large])
+        w[large] = axes * theta[large, np.newaxis]
+
+    W = np.zeros((Rf.shape[0], 3, 3))
+    W[:, 0, 1] = -w[:, 2]
+    W[:, 0, 2] = w[:, 1]
+    W[:, 1, 2] = -w[:, 0]
+    W[:, 1, 0] = w[:, 2]
+    W[:, 2, 0] = -w[:, 1]
+    W[:, 2, 1] = w[:, 0]
+    return W.reshape(shape)
+
+
+@fast_path
+@contract(W="array[Nx3x3]|so3", returns="array[Nx3x3]|SO3")
+def SO3_from_so3(W):
+    """
+        Exponential map from so(3) to SO(3), computed with Rodrigues'
+        formula. Accepts also a stack of (N,3,3) matrices.
+    """
+    return _SO3_from_so3(np.asarray(W))
+
+
+@fast_path
+@contract(R="array[Nx3x3]|SO3", returns="array[Nx3x3]|so3")
+def so3_from_SO3(R):
+    """
+        Logarithmic map from SO(3) to so(3), the inverse of
+        :py:func:`SO3_from_so3`. The result has angle in [0, pi].
+        Accepts also a stack of (N,3,3) matrices.
+
+        The angle is computed with atan2, which is accurate also for
+        small angles; for angles larger than pi/2 the axis is computed
+        from the symmetric part of the matrix.
+    """
+    return _so3_from_SO3(np.asarray(R))
+
+
+@fast_path
+@contract(W="array[Nx2x2]|so2", returns="array[Nx2x2]|SO2")
+def SO2_from_so2(W):
+    """
+        Exponential map from so(2) to SO(2).
+        Accepts also a stack of (N,2,2) matrices.
+    """
+    W = np.asarray(W)
+    theta = W[..., 1, 0]
+    C = np.cos(theta)
+    S = np.sin(theta)
+    R = np.empty(W.shape)
+    R[..., 0, 0] = C
+    R[..., 0, 1] = -S
+    R[..., 1, 0] = S
+    R[..., 1, 1] = C
+    return R
+
+
+@fast_path
+@contract(R="array[Nx2x2]|SO2", returns="array[Nx2x2]|so2")
+def so2_from_SO2(R):
+    """
+        Logarithmic map from SO(2) to so(2), the inverse of
+        :py:func:`SO2_from_so2`. As in :py:func:`angle_from_SO2`,
+        the angle is in [-pi, pi). Accepts also a stack of (N,2,2) matrices.
+    """
+    R = np.asarray(R)
+    theta = np.arctan2(R[..., 1, 0], R[..., 0, 0])
+    theta = np.where(theta == np.pi, -np.pi, theta)
+    W = np.zeros(R.shape)
+    W[..., 0, 1] = -theta
+    W[..., 1, 0] = theta
+    return W
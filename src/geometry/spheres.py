@@ -2,7 +2,7 @@
 import numpy as np
 from contracts import contract, new_contract
 
-from .basic_utils import safe_arccos, normalize_length
+from .basic_utils import safe_arccos, normalize_length, random_generator
 from .utils import assert_allclose
 
 __all__ = [
@@ -35,7 +35,11 @@ __all__ = [
 @contract(x="array[N],N>0")
 def unit_length(x):
     """ Checks that the value is a 1D vector with unit length in the 2 norm."""
-    assert_allclose(1, np.linalg.norm(x), rtol=1e-5)  # XXX:
+    norm = np.linalg.norm(x)
+    # same tolerance as assert_allclose(), which is only called to
+    # format the message, as it is slow on small arrays
+    if not abs(1 - norm) <= 1e-5 * abs(norm):
+        assert_allclose(1, norm, rtol=1e-5)  # XXX:
 
 
 new_contract("direction", "array[3], unit_length")
@@ -49,7 +53,8 @@ new_contract("S2", "array[3],unit_length")
 def directions(X):
     """ Checks that every column has unit length. """
     norm = (X * X).sum(axis=0)
-    assert_allclose(1, norm, rtol=1e-5)  # XXX:
+    if not np.all(np.abs(1 - norm) <= 1e-5 * np.abs(norm)):
+        assert_allclose(1, norm, rtol=1e-5)  # XXX:
 
 
 @contract(s="array[K],K>=2", v="array[K]")
@@ -141,30 +146,48 @@ def distances_from(S, s):
 
 
 @contract(ndim="(2|3),K", returns="array[K],unit_length")
-def random_direction(ndim=3):
+def random_direction(ndim=3, rng=None):
     """
         Generates a random direction in :math:`S^{n-1}`.
 
         Currently only implemented for 2D and 3D.
+
+        :param rng: See :py:func:`random_generator`.
     """
+    rng = random_generator(rng)
     if ndim == 3:
-        z = np.random.uniform(-1, +1)
-        t = np.random.uniform(0, 2 * np.pi)
+        z = rng.uniform(-1, +1)
+        t = rng.uniform(0, 2 * np.pi)
         r = np.sqrt(1 - z ** 2)
         x = r * np.cos(t)
         y = r * np.sin(t)
         return np.array([x, y, z])
     elif ndim == 2:
-        theta = np.random.uniform(0, 2 * np.pi)
+        theta = rng.uniform(0, 2 * np.pi)
         return np.array([np.cos(theta), np.sin(theta)])
     else:
         assert False, "Not implemented"
 
 
-@contract(N="int,>0,N", ndim="2|3", returns="array[3xN]")
-def random_directions(N, ndim=3):
-    """ Returns a set of random directions. """
-    return np.vstack([random_direction(ndim) for _ in range(N)]).T
+@contract(N="int,>=0,N", ndim="(2|3),K", returns="array[KxN]")
+def random_directions(N, ndim=3, rng=None):
+    """
+        Returns a set of N random directions, as the columns
+        of the result.
+
+        :param rng: See :py:func:`random_generator`.
+    """
+    rng = random_generator(rng)
+    if ndim == 3:
+        z = rng.uniform(-1, +1, size=N)
+        t = rng.uniform(0, 2 * np.pi, size=N)
+        r = np.sqrt(1 - z ** 2)
+        return np.vstack([r * np.cos(t), r * np.sin(t), z])
+    elif ndim == 2:
+        theta = rng.uniform(0, 2 * np.pi, size=N)
+        return np.vstack([np.cos(theta), np.sin(theta)])
+    else:
+        assert False, "Not implemented"
 
 
 @contract(s="direction", returns="direction")
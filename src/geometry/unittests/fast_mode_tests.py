@@ -0,0 +1,97 @@
+# coding=utf-8
+import os
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from contracts import ContractNotRespected
+from contracts.enabling import all_disabled
+from geometry import (
+    SE2_from_se2,
+    SE2_from_translation_angle,
+    extract_pieces,
+    fast,
+    in_fast_mode,
+    logger,
+    quaternion_from_rotation,
+    random_rotation,
+    rotation_from_quaternion,
+    se2_from_SE2,
+    set_fast_mode,
+)
+from geometry.utils import assert_allclose
+
+
+def fast_namespace_test():
+    pose = SE2_from_translation_angle([1, 2], 0.3)
+    vel = se2_from_SE2(pose)
+    assert_allclose(fast.se2_from_SE2(pose), vel)
+    assert_allclose(fast.SE2_from_se2(vel), SE2_from_se2(vel))
+    R = random_rotation()
+    q = quaternion_from_rotation(R)
+    assert_allclose(fast.quaternion_from_rotation(R), q)
+    assert_allclose(fast.rotation_from_quaternion(q), rotation_from_quaternion(q))
+    for a, b in zip(fast.extract_pieces(pose), extract_pieces(pose)):
+        assert_allclose(a, b)
+    # the namespace does not change the global mode
+    assert not in_fast_mode()
+
+
+def fast_namespace_skips_contracts_test():
+    if all_disabled():
+        return
+    not_a_pose = np.ones((3, 3))
+    try:
+        se2_from_SE2(not_a_pose)
+    except ContractNotRespected:
+        pass
+    else:
+        raise Exception("Expected the contract to fail.")
+    fast.se2_from_SE2(not_a_pose)
+
+
+def fast_mode_switch_test():
+    if all_disabled():
+        return
+    not_a_pose = np.ones((3, 3))
+    set_fast_mode(True)
+    try:
+        assert in_fast_mode()
+        se2_from_SE2(not_a_pose)
+    finally:
+        set_fast_mode(False)
+    assert not in_fast_mode()
+
+
+def fast_mode_environment_test():
+    # the variable is read at import, so each value needs a new interpreter
+    src = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = "import geometry; print(geometry.in_fast_mode())"
+    for value, expected in [("0", "False"), ("false", "False"), ("", "False"), ("yes", "True")]:
+        env = dict(os.environ, GEOMETRY_FAST_MODE=value, PYTHONPATH=src)
+        out = subprocess.check_output([sys.executable, "-c", code], env=env, cwd=src)
+        assert out.decode().strip().splitlines()[-1] == expected, (value, out)
+
+
+@attr("benchmark")
+def fast_mode_benchmark_test():
+    pose = SE2_from_translation_angle([1, 2], 0.3)
+    vel = se2_from_SE2(pose)
+    q = quaternion_from_rotation(random_rotation())
+    cases = [
+        ("SE2_from_se2", lambda: SE2_from_se2(vel), lambda: fast.SE2_from_se2(vel)),
+        ("se2_from_SE2", lambda: se2_from_SE2(pose), lambda: fast.se2_from_SE2(pose)),
+        ("extract_pieces", lambda: extract_pieces(pose), lambda: fast.extract_pieces(pose)),
+        ("rotation_from_quaternion", lambda: rotation_from_quaternion(q), lambda: fast.rotation_from_quaternion(q)),
+    ]
+    number = 200
+    for name, checked, unchecked in cases:
+        t_checked = min(timeit.repeat(checked, number=number, repeat=3)) / number
+        t_fast = min(timeit.repeat(unchecked, number=number, repeat=3)) / number
+        logger.info(
+            "%-25s checked: %7.1f us  fast: %7.1f us  overhead removed: %7.1f us/call"
+            % (name, t_checked * 1e6, t_fast * 1e6, (t_checked - t_fast) * 1e6)
+        )
@@ -0,0 +1,129 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import logger, SE2, SE3, SE3_left_jacobian, SO2, SO3
+from geometry.utils import assert_allclose
+
+# the groups, with the number of angular coordinates of their vectors
+groups = [(SO2, 1), (SO3, 3), (SE2, 1), (SE3, 3)]
+
+
+def _exp(G, v):
+    return G.group_from_algebra(G.algebra.algebra_from_vector(v))
+
+
+def _log(G, g):
+    return G.algebra.vector_from_algebra(G.algebra_from_group(g))
+
+
+def _numerical_jacobians(G, v, eps=1e-6):
+    """ Central differences of exp(v + d) exp(v)^-1 and exp(v)^-1 exp(v + d). """
+    k = len(v)
+    g = _exp(G, v)
+    ginv = G.inverse(g)
+    left = np.zeros((k, k))
+    right = np.zeros((k, k))
+    for i in range(k):
+        d = np.zeros(k)
+        d[i] = eps
+        gp = _exp(G, v + d)
+        gm = _exp(G, v - d)
+        left[:, i] = (_log(G, np.dot(gp, ginv)) - _log(G, np.dot(gm, ginv))) / (2 * eps)
+        right[:, i] = (_log(G, np.dot(ginv, gp)) - _log(G, np.dot(ginv, gm))) / (2 * eps)
+    return left, right
+
+
+def _vectors(n, k, m, rng):
+    """ Vectors with angles in (0.1, 2.5), and unit-size linear velocities. """
+    V = rng.randn(n, k)
+    w = V[:, :m]
+    angles = rng.uniform(0.1, 2.5, n)
+    V[:, :m] = w / np.linalg.norm(w, axis=1)[:, np.newaxis] * angles[:, np.newaxis]
+    return V
+
+
+def jacobians_numerical_test():
+    rng = np.random.RandomState(0)
+    for G, m in groups:
+        for v in _vectors(10, G.dimension, m, rng):
+            left, right = _numerical_jacobians(G, v)
+            assert_allclose(G.left_jacobian(v), left, atol=1e-8)
+            assert_allclose(G.right_jacobian(v), right, atol=1e-8)
+
+
+def jacobians_identities_test():
+    rng = np.random.RandomState(1)
+    for G, m in groups:
+        k = G.dimension
+        V = _vectors(20, k, m, rng)
+        V[0] = 0
+        V[1, m:] = 0
+        V[2, :m] = 0
+        V[3, :m] = 1e-9
+        Jl = G.left_jacobian(V)
+        Jr = G.right_jacobian(V)
+        assert Jl.shape == (20, k, k)
+        assert_allclose(np.matmul(G.left_jacobian_inverse(V), Jl), np.tile(np.eye(k), (20, 1, 1)), atol=1e-13)
+        assert_allclose(np.matmul(G.right_jacobian_inverse(V), Jr), np.tile(np.eye(k), (20, 1, 1)), atol=1e-13)
+        assert_allclose(Jl[0], np.eye(k))
+        for i, v in enumerate(V):
+            g = _exp(G, v)
+            assert_allclose(G.left_jacobian(v), Jl[i])
+            # J_l(v) = Ad(exp(v)) J_r(v)
+            assert_allclose(Jl[i], np.dot(G.adjoint(g), Jr[i]), atol=1e-13)
+
+
+def adjoint_test():
+    rng = np.random.RandomState(2)
+    for G, m in groups:
+        g = G.sample_uniform(10, rng=rng)
+        Ad = G.adjoint(g)
+        assert Ad.shape == (10, G.dimension, G.dimension)
+        for i in range(10):
+            v = rng.randn(G.dimension)
+            X = G.algebra.algebra_from_vector(v)
+            Y = G.algebra.project(np.dot(np.dot(g[i], X), G.inverse(g[i])))
+            expected = G.algebra.vector_from_algebra(Y)
+            assert_allclose(np.dot(Ad[i], v), expected, atol=1e-13)
+            assert_allclose(G.adjoint(g[i]), Ad[i])
+
+
+def jacobians_small_angles_test():
+    rng = np.random.RandomState(3)
+    for theta in [0, 1e-12, 1e-8, 1e-4, 0.01, 0.999999, 1.0, 1.000001]:
+        v = rng.randn(6)
+        v[:3] *= theta / max(np.linalg.norm(v[:3]), 1e-300)
+        J = SE3_left_jacobian(v)
+        # second order expansion: Q = P/2 + (WP + PW + WPW)/6 + O(theta^2)
+        W = SO3.algebra.algebra_from_vector(v[:3])
+        P = SO3.algebra.algebra_from_vector(v[3:])
+        WP = np.dot(W, P)
+        PW = np.dot(P, W)
+        expected = P / 2 + (WP + PW + np.dot(WP, W)) / 6
+        expected += (np.dot(W, WP) + np.dot(PW, W) - 3 * np.dot(WP, W)) / 24
+        assert_allclose(J[3:, :3], expected, atol=max(theta ** 3, 1e-15))
+        assert_allclose(J[:3, :3], np.eye(3) + W / 2 + np.dot(W, W) / 6, atol=max(theta ** 3, 1e-15))
+        # SE(2) is the planar case of SE(3)
+        u = np.array([v[2], v[3], v[4]])
+        u3 = np.array([0, 0, v[2], v[3], v[4], 0])
+        assert_allclose(SE2.left_jacobian(u), SE3_left_jacobian(u3)[np.ix_([2, 3, 4], [2, 3, 4])], atol=1e-15)
+
+
+@attr("benchmark")
+def jacobians_benchmark_test():
+    n = 100000
+    X = np.random.randn(n, 6)
+    for G, V in [(SO3, X[:, :3]), (SE3, X)]:
+        t0 = time.time()
+        G.left_jacobian(V)
+        t1 = time.time()
+        for v in V[:100]:
+            _numerical_jacobians(G, v)
+        t2 = time.time()
+        logger.info(
+            "%s left Jacobian: %d closed form %.1f ms; numerical: %.1f ms per 100"
+            % (G, n, (t1 - t0) * 1000, (t2 - t1) * 1000)
+        )
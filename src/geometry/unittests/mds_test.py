@@ -1,9 +1,27 @@
 # coding=utf-8
 import itertools
+import os
+import tempfile
+import time
 
 import numpy as np
+from nose.plugins.attrib import attr
 
-from geometry import euclidean_distances, double_center, mds, mds_randomized, place, eigh
+from geometry import (
+    choose_embedding_solver,
+    double_center,
+    eigh,
+    inner_product_embedding,
+    euclidean_distances,
+    LandmarkMDS,
+    landmark_mds,
+    logger,
+    mds,
+    mds_implicit,
+    mds_randomized,
+    place,
+    truncated_svd_randomized,
+)
 from geometry.utils import assert_allclose
 
 
@@ -17,6 +35,117 @@ def euclidean_distances_test():
         assert_allclose(d, D[i, j])
 
 
+def euclidean_distances_loop(S):
+    """ Reference implementation, one row at a time. """
+    K, N = S.shape
+    D = np.zeros((N, N))
+    for i in range(N):
+        D[i, :] = np.sqrt(((S - S[:, i].reshape(K, 1)) ** 2).sum(axis=0))
+    return D
+
+
+def double_center_loop(P):
+    """ Reference implementation, one entry at a time. """
+    n = P.shape[0]
+    B = np.zeros(P.shape)
+    for i, j in itertools.product(range(n), range(n)):
+        B[i, j] = -0.5 * (P[i, j] - P[:, j].mean() - P[i, :].mean() + P.mean())
+    return B
+
+
+def euclidean_distances_options_test():
+    S = np.random.rand(3, 50) + 10
+    D0 = euclidean_distances_loop(S)
+    D = euclidean_distances(S)
+    assert_allclose(D, D0, atol=1e-10)
+    assert np.all(D.diagonal() == 0)
+    for block_size in [1, 7, 50, 100]:
+        assert_allclose(euclidean_distances(S, block_size=block_size), D, atol=1e-12)
+    D32 = euclidean_distances(S, dtype="float32", block_size=16)
+    assert D32.dtype == np.float32
+    assert_allclose(D32, D0, atol=1e-5)
+    assert_allclose(euclidean_distances(S.astype("float32")), D0, atol=1e-5)
+    out = np.empty((50, 50))
+    D2 = euclidean_distances(S, out=out)
+    assert D2 is out
+    assert_allclose(out, D, atol=1e-12)
+
+
+def euclidean_distances_float32_memory_test():
+    import tracemalloc
+
+    n = 3000
+    S = np.random.rand(3, n)
+    tracemalloc.start()
+    try:
+        D = euclidean_distances(S, dtype="float32")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # the result (4 n^2 bytes) plus blocks of 1024 rows, not a n x n float64 temporary
+    assert peak < 8 * n * n, peak / (4.0 * n * n)
+    assert_allclose(D[:50, :50], euclidean_distances(S[:, :50]), atol=1e-5)
+
+
+def euclidean_distances_float64_memory_test():
+    import tracemalloc
+
+    n = 3000
+    S = np.random.rand(3, n)
+    tracemalloc.start()
+    try:
+        D = euclidean_distances(S)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # the products are computed directly in the result (8 n^2 bytes)
+    assert peak < 1.1 * 8 * n * n, peak / (8.0 * n * n)
+    assert_allclose(D[:50, :50], euclidean_distances(S[:, :50]), atol=1e-12)
+
+
+def double_center_test():
+    P = euclidean_distances(np.random.rand(2, 20)) ** 2
+    B = double_center(P)
+    assert_allclose(B, double_center_loop(P), atol=1e-12)
+    assert_allclose(B.mean(axis=0), 0, atol=1e-12)
+    assert_allclose(B.mean(axis=1), 0, atol=1e-12)
+    B32 = double_center(P.astype("float32"))
+    assert B32.dtype == np.float32
+    assert_allclose(B32, B, atol=1e-5)
+
+
+@attr("benchmark")
+def euclidean_distances_benchmark_test():
+    """
+        Times euclidean_distances() and double_center().
+
+        Set GEOMETRY_BENCHMARK_MAX_N to run the larger sizes
+        (N=20000 needs about 3GB of memory).
+    """
+    max_n = int(os.environ.get("GEOMETRY_BENCHMARK_MAX_N", 2000))
+    for n in [100, 1000, 2000, 5000, 10000, 20000]:
+        if n > max_n:
+            break
+        S = np.random.rand(3, n)
+        t0 = time.time()
+        D = euclidean_distances(S, dtype="float32", block_size=1000)
+        t1 = time.time()
+        B = double_center(D)
+        t2 = time.time()
+        msg = "N = %5d  euclidean_distances: %8.1f ms  double_center: %8.1f ms" % (
+            n,
+            (t1 - t0) * 1000,
+            (t2 - t1) * 1000,
+        )
+        if n <= 1000:
+            t0 = time.time()
+            euclidean_distances_loop(S)
+            t1 = time.time()
+            msg += "  (loop: %8.1f ms)" % ((t1 - t0) * 1000)
+        logger.info(msg)
+        del D, B
+
+
 def rank_test():
     """ Check that the double-centered matrix has small rank. """
     for n in range(5, 50, 5):
@@ -74,6 +203,38 @@ def mds_fast_test():
 #      (k, n, algo.__name__, t_mds * 1000, error))
 
 
+def mds_overwrite_test():
+    P = np.random.rand(3, 50)
+    D = euclidean_distances(P)
+    expected = double_center(D * D)
+    P2 = mds(D, ndim=3, overwrite_D=True)
+    assert_allclose(0, evaluate_error(P, P2), atol=1e-7)
+    # D now contains the centered matrix
+    assert_allclose(D, expected)
+
+
+def mds_implicit_test():
+    for n in [10, 100]:
+        for k in [2, 3]:
+            P = np.random.rand(k, n)
+            D = euclidean_distances(P)
+            for block_size in [1, 7, 1024]:
+                P2 = mds_implicit(D, ndim=k, block_size=block_size)
+                assert_allclose(0, evaluate_error(P, P2), atol=1e-7)
+
+
+def mds_implicit_memmap_test():
+    n, k = 300, 3
+    P = np.random.rand(k, n)
+    with tempfile.NamedTemporaryFile() as f:
+        D = np.memmap(f.name, dtype="float32", mode="w+", shape=(n, n))
+        D[:] = euclidean_distances(P)
+        D.flush()
+        P2 = mds_implicit(D, ndim=k, block_size=64)
+        del D
+    assert_allclose(0, evaluate_error(P, P2), atol=1e-4)
+
+
 def place_test():
     for n in [4, 10]:
         for k in [3]:
@@ -83,3 +244,131 @@ def place_test():
             distances = np.array([ref(S[:, i]) for i in range(n)])
             p2 = place(S, distances)
             assert_allclose(p, p2)
+
+
+def place_many_test():
+    S = np.random.rand(3, 10)
+    P = np.random.rand(3, 5)
+    distances = np.hypot.reduce(S[:, :, np.newaxis] - P[:, np.newaxis, :], axis=0)
+    assert_allclose(place(S, distances), P)
+
+
+def landmark_mds_test():
+    for k in [2, 3]:
+        P = np.random.rand(k, 200)
+        landmarks = np.arange(0, 200, 10)
+        D = euclidean_distances(P)[landmarks, :]
+        P2 = landmark_mds(D, landmarks, ndim=k)
+        assert_allclose(0, evaluate_error(P, P2), atol=1e-7)
+
+
+def landmark_mds_add_test():
+    P = np.random.rand(3, 100)
+    D = euclidean_distances(P)
+    landmarks = list(range(8))
+    lmds = LandmarkMDS(D[np.ix_(landmarks, landmarks)], ndim=3)
+    assert_allclose(euclidean_distances(lmds.landmark_coords), D[:8, :8], atol=1e-10)
+    for i in range(50):
+        x = lmds.add(D[landmarks, i])
+        assert x.shape == (3,)
+    lmds.add(D[landmarks, 50:])
+    assert lmds.points.shape == (3, 100)
+    assert_allclose(lmds.points, lmds.place(D[landmarks, :]))
+    assert_allclose(0, evaluate_error(P, lmds.points), atol=1e-7)
+
+
+def landmark_mds_integer_distances_test():
+    # the corners of a 3x4 rectangle, with integer distances
+    P = np.array([[0, 3, 0, 3], [0, 0, 4, 4]], dtype="float64")
+    D = np.array([[0, 3, 4, 5], [3, 0, 5, 4], [4, 5, 0, 3], [5, 4, 3, 0]])
+    lmds = LandmarkMDS(D, ndim=2)
+    assert_allclose(lmds.place(D), lmds.place(D.astype("float64")))
+    assert_allclose(lmds.place(D[:, 0]), lmds.landmark_coords[:, 0], atol=1e-12)
+    assert_allclose(0, evaluate_error(P, lmds.place(D)), atol=1e-12)
+
+
+def truncated_svd_randomized_test():
+    rng = np.random.default_rng(0)
+    n, k = 100, 5
+    U, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    s = 1.0 / np.arange(1, n + 1)
+    M = np.dot(U * s, U.T)
+    for method in ["subspace", "krylov", "single_pass"]:
+        U2, s2, V2 = truncated_svd_randomized(M, k, rng=1, method=method)
+        assert U2.shape == (n, k) and s2.shape == (k,) and V2.shape == (k, n)
+        # same seed, same result
+        assert_allclose(s2, truncated_svd_randomized(M, k, rng=1, method=method)[1])
+        error = np.linalg.norm(M - np.dot(U2 * s2, V2), 2)
+        # the optimal error is s[k]
+        bound = 3 if method == "single_pass" else 1.01
+        assert error < bound * s[k], (method, error / s[k])
+    # without rng, the global numpy state is used
+    np.random.seed(2)
+    s1 = truncated_svd_randomized(M, k, method="single_pass")[1]
+    np.random.seed(2)
+    assert_allclose(s1, truncated_svd_randomized(M, k, method="single_pass")[1])
+
+
+def mds_randomized_options_test():
+    P = np.random.rand(3, 60)
+    D = euclidean_distances(P)
+    for method in ["subspace", "krylov", "single_pass"]:
+        P2 = mds_randomized(D, ndim=3, method=method, n_iter=1, rng=0, block_size=16)
+        assert_allclose(0, evaluate_error(P, P2), atol=1e-7)
+
+
+def inner_product_embedding_solvers_test():
+    P = np.random.rand(4, 120)
+    D = euclidean_distances(P)
+    B = double_center(D * D)
+    expected = inner_product_embedding(B, 4, solver="lapack")
+    for solver, params in [("auto", {}), ("arpack", {}), ("lobpcg", {"rng": 0}), ("randomized", {"rng": 0})]:
+        coords = inner_product_embedding(B, 4, solver=solver, **params)
+        assert_allclose(euclidean_distances(coords), D, atol=1e-6)
+        # same eigenvectors, up to sign
+        signs = np.sign((coords * expected).sum(axis=1)).reshape(4, 1)
+        assert_allclose(coords * signs, expected, atol=1e-6)
+
+
+def choose_embedding_solver_test():
+    assert choose_embedding_solver(100, 3) == "lapack"
+    assert choose_embedding_solver(10000, 3) == "arpack"
+    assert choose_embedding_solver(10000, 50) == "arpack"
+    assert choose_embedding_solver(10000, 9999) == "lapack"
+
+
+def inner_product_embedding_not_psd_test():
+    # as from non-Euclidean distances: the largest eigenvalues in
+    # absolute value are negative
+    rng = np.random.default_rng(0)
+    n = 60
+    U, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    S = 0.01 * rng.standard_normal(n)
+    S[:5] = [-100, -50, 5, 4, 3]
+    C = np.dot(U * S, U.T)
+    expected = np.sqrt(np.sort(S)[-3:])
+    for solver, params in [("lapack", {}), ("arpack", {}), ("lobpcg", {"rng": 0})]:
+        coords = inner_product_embedding(C, 3, solver=solver, **params)
+        assert_allclose(np.linalg.norm(coords, axis=1), expected, atol=1e-6)
+    # the randomized SVD finds the eigenvalues -100, -50, 5, but it
+    # must not report the negative ones as positive
+    coords = inner_product_embedding(C, 3, solver="randomized", rng=0)
+    assert_allclose(np.linalg.norm(coords, axis=1), [0, 0, np.sqrt(5)], atol=1e-4)
+
+
+def inner_product_embedding_params_test():
+    P = np.random.rand(3, 20)
+    D = euclidean_distances(P)
+    B = double_center(D * D)
+    for solver, params in [
+        ("lapack", {"tol": 0}),
+        ("arpack", {"rng": 0}),
+        ("lobpcg", {"tool": 0}),
+        ("randomized", {"n_iters": 2}),
+    ]:
+        try:
+            inner_product_embedding(B, 3, solver=solver, **params)
+        except TypeError:
+            pass
+        else:
+            raise Exception("Expected TypeError for %s with %s" % (solver, params))
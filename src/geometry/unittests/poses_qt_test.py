@@ -0,0 +1,107 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import (
+    logger,
+    qt_apply,
+    qt_compose,
+    qt_distances,
+    qt_exp,
+    qt_inverse,
+    qt_log,
+    qt_relative,
+    qts_from_SE3,
+    rotation_translation_from_SE3,
+    SE3,
+    SE3_from_qts,
+    SE3_from_se3,
+    se3_from_SE3,
+)
+from geometry.poses import pose_from_rotation_translation
+from geometry.utils import assert_allclose
+from geometry.yaml_ import from_yaml, to_yaml
+
+
+def qt_conversions_test():
+    M = SE3.sample_uniform(50, rng=0)
+    P = qts_from_SE3(M)
+    assert P.shape == (50, 7)
+    assert np.all(P[:, 0] >= 0)
+    assert_allclose(SE3_from_qts(P), M, atol=1e-15)
+    assert_allclose(qts_from_SE3(SE3_from_qts(P)), P, atol=1e-15)
+    R, t = rotation_translation_from_SE3(M[3])
+    assert_allclose(SE3_from_qts(P[3]), pose_from_rotation_translation(R, t), atol=1e-15)
+    assert_allclose(qts_from_SE3(M[3]), P[3])
+
+
+def qt_group_operations_test():
+    MA = SE3.sample_uniform(50, rng=1)
+    MB = SE3.sample_uniform(50, rng=2)
+    A = qts_from_SE3(MA)
+    B = qts_from_SE3(MB)
+    assert_allclose(SE3_from_qts(qt_compose(A, B)), np.matmul(MA, MB), atol=1e-14)
+    assert_allclose(SE3_from_qts(qt_inverse(A)), np.linalg.inv(MA), atol=1e-14)
+    expected = np.matmul(np.linalg.inv(MA), MB)
+    assert_allclose(SE3_from_qts(qt_relative(A, B)), expected, atol=1e-14)
+    # a single pose is broadcast against a stack
+    assert_allclose(qt_compose(A[3], B), qt_compose(np.tile(A[3], (50, 1)), B))
+    assert_allclose(qt_compose(A, qt_inverse(A)), np.tile([1.0, 0, 0, 0, 0, 0, 0], (50, 1)), atol=1e-14)
+    assert np.all(qt_compose(A, B)[:, 0] >= 0)
+    points = np.random.randn(50, 3)
+    expected = np.matmul(MA[:, :3, :3], points[:, :, np.newaxis])[:, :, 0] + MA[:, :3, 3]
+    assert_allclose(qt_apply(A, points), expected, atol=1e-14)
+    assert qt_apply(A[0], points).shape == (50, 3)
+
+
+def qt_exp_log_test():
+    M = SE3.sample_uniform(50, rng=3)
+    M[0] = np.eye(4)
+    M[1] = np.eye(4)
+    M[1, :3, 3] = [1, 2, 3]
+    A = qts_from_SE3(M)
+    V = qt_log(A)
+    for m, v in zip(M, V):
+        assert_allclose(v, SE3.algebra.vector_from_algebra(se3_from_SE3(m)), atol=1e-12)
+    assert_allclose(SE3_from_qts(qt_exp(V)), M, atol=1e-12)
+    assert_allclose(SE3_from_qts(qt_exp(V[5])), SE3_from_se3(se3_from_SE3(M[5])), atol=1e-12)
+    assert_allclose(qt_log(A[:2]), [[0, 0, 0, 0, 0, 0], [0, 0, 0, 1, 2, 3]], atol=1e-15)
+
+
+def qt_distances_test():
+    M = SE3.sample_uniform(20, rng=4)
+    A = qts_from_SE3(M)
+    assert_allclose(qt_distances(A[0], A), SE3.distances(M[0], M), atol=1e-12)
+    assert_allclose(qt_distances(A, A), 0, atol=1e-12)
+
+
+def qt_yaml_test():
+    x = SE3.sample_uniform(rng=5)
+    y = to_yaml("SE3", x, representation="qt")
+    assert y[0] == "SE3:qt" and len(y[1]) == 7
+    assert_allclose(from_yaml(y), x, atol=1e-15)
+    # the matrices are still the default
+    assert to_yaml("SE3", x)[0] == "SE3:m44"
+
+
+@attr("benchmark")
+def qt_benchmark_test():
+    n = 1000000
+    MA = SE3.sample_uniform(n, rng=0)
+    MB = SE3.sample_uniform(n, rng=1)
+    A = qts_from_SE3(MA)
+    B = qts_from_SE3(MB)
+    # the first call pays for the page faults of the new arrays
+    qt_compose(A, B)
+    for name, f, g in [("compose", qt_compose, np.matmul), ("relative", qt_relative, SE3.relative)]:
+        t0 = time.time()
+        f(A, B)
+        t1 = time.time()
+        g(MA, MB)
+        t2 = time.time()
+        logger.info(
+            "%d SE(3) %-8s  qt: %7.1f ms (%d MB)  matrices: %7.1f ms (%d MB)"
+            % (n, name, (t1 - t0) * 1000, A.nbytes // 2 ** 20, (t2 - t1) * 1000, MA.nbytes // 2 ** 20)
+        )
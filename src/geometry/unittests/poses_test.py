@@ -1,5 +1,8 @@
 # coding=utf-8
+import time
+
 import numpy as np
+from nose.plugins.attrib import attr
 
 from geometry import (
     translation_angle_from_SE2,
@@ -17,6 +20,7 @@ from geometry import (
     SE3_from_SE2,
     se2_from_se3,
 )
+from geometry import logger
 from geometry.utils import assert_allclose
 from .utils import GeoTestCase
 
@@ -107,3 +111,164 @@ def check_pi_test():
         assert_allclose(w, w2, atol=1e-8)
         g2 = SE2_from_se2(w2)
         assert_allclose(g, g2, atol=1e-8)
+
+
+def se3_closed_form_test():
+    """ Compares SE3_from_se3 / se3_from_SE3 with expm / logm. """
+    from geometry import expm, logm, SE3_from_se3, se3_from_SE3, se3
+
+    for _ in range(20):
+        w = np.random.randn(3)
+        w *= np.random.uniform(0, np.pi * 0.99) / np.linalg.norm(w)
+        vel = se3.algebra_from_vector(np.hstack((w, np.random.randn(3))))
+        pose = SE3_from_se3(vel)
+        assert_allclose(pose, expm(vel), atol=1e-10)
+        assert_allclose(se3_from_SE3(pose), logm(pose).real, atol=1e-8)
+        assert_allclose(se3_from_SE3(pose), vel, atol=1e-10)
+
+
+def se3_small_angles_test():
+    from geometry import expm, SE3_from_se3, se3_from_SE3, se3
+
+    for theta in [0, 1e-12, 1e-8, 1e-5, 1e-3, 0.05, 0.1, 0.15, 0.2, 0.25]:
+        vel = se3.algebra_from_vector(np.array([theta, 0, 0, 1, 2, 3.0]))
+        pose = SE3_from_se3(vel)
+        assert_allclose(pose, expm(vel), rtol=1e-12, atol=1e-14)
+        assert_allclose(se3_from_SE3(pose), vel, rtol=1e-12, atol=1e-14)
+
+
+def se3_near_pi_test():
+    from geometry import SE3_from_se3, se3_from_SE3, se3
+
+    axis = np.array([2.0, -1, 2]) / 3
+    for eps in [0, 1e-12, 1e-9, 1e-6]:
+        vel = se3.algebra_from_vector(np.hstack((axis * (np.pi - eps), [1, 2, 3])))
+        pose = SE3_from_se3(vel)
+        vel2 = se3_from_SE3(pose)
+        assert_allclose(SE3_from_se3(vel2), pose, atol=1e-10)
+
+
+def out_and_views_test():
+    from geometry.poses import combine_pieces, extract_pieces, pose_from_rotation_translation
+    from geometry import rotation_translation_from_SE3, translation_from_SE2, translation_from_SE3
+
+    out = np.full((3, 3), np.nan)
+    assert SE2_from_translation_angle([1, 2], 0.3, out=out) is out
+    assert np.all(out == SE2_from_translation_angle([1, 2], 0.3))
+    pose = SE3.sample_uniform()
+    R, t, c, d = extract_pieces(pose)
+    out = np.full((4, 4), np.nan)
+    assert pose_from_rotation_translation(R, t, out=out) is out
+    assert np.all(out == pose)
+    out[:] = np.nan
+    assert combine_pieces(R, t, c, d, out=out) is out
+    assert np.all(out == pose)
+    # views share the memory of the pose, copies do not
+    R2, t2 = rotation_translation_from_SE3(pose, copy=False)
+    assert np.shares_memory(R2, pose) and np.shares_memory(t2, pose)
+    assert np.all(t2 == translation_from_SE3(pose))
+    assert not np.shares_memory(translation_from_SE3(pose), pose)
+    assert np.shares_memory(translation_from_SE3(pose, copy=False), pose)
+    pose2 = SE2_from_translation_angle([1, 2], 0.3)
+    assert np.all(translation_from_SE2(pose2, copy=False) == [1, 2])
+    assert np.shares_memory(translation_from_SE2(pose2, copy=False), pose2)
+    assert not np.shares_memory(translation_from_SE2(pose2), pose2)
+    # buffers of the wrong size are rejected by the contracts
+    from contracts import ContractNotRespected
+    from contracts.enabling import all_disabled
+
+    if not all_disabled():
+        for f, args in [(combine_pieces, (R, t, c, d)), (pose_from_rotation_translation, (R, t))]:
+            for shape in [(3, 3), (5, 5)]:
+                try:
+                    f(*args, out=np.empty(shape))
+                except ContractNotRespected:
+                    pass
+                else:
+                    raise Exception("Expected a contract failure for out of shape %s." % (shape,))
+
+
+def SE2_from_SE3_test():
+    from geometry import SE2_from_SE3, SE2_from_xythetas
+
+    rng = np.random.default_rng(0)
+    xythetas = rng.uniform(-np.pi, np.pi, size=(100, 3))
+    xythetas[:4, 2] = [0, 1e-12, np.pi, -np.pi + 1e-9]
+    expected = SE2_from_xythetas(xythetas)
+    poses = np.array([SE3_from_SE2(pose) for pose in expected])
+    assert_allclose(SE2_from_SE3(poses), expected, atol=1e-15)
+    for pose, pose2 in zip(poses[:10], expected):
+        assert_allclose(SE2_from_SE3(pose), pose2, atol=1e-15)
+    # the failures report the pose
+    poses[7, 2, 3] = 1e-3
+    poses[9, :3, :3] = np.diag([1, -1, -1])
+    for stack, fragment in [(poses, "index: 7"), (poses[8:], "index: 1"), (poses[7], "z=0"), (poses[9], "around")]:
+        try:
+            SE2_from_SE3(stack)
+        except AssertionError as e:
+            assert fragment in str(e), e
+        else:
+            raise Exception("Expected AssertionError")
+    assert SE2_from_SE3(poses, check_exact=False).shape == (100, 3, 3)
+
+
+def se3_batch_test():
+    from geometry import SE3_from_se3, se3_from_SE3
+
+    poses = np.array([SE3.sample_uniform() for _ in range(10)])
+    vels = se3_from_SE3(poses)
+    for pose, vel in zip(poses, vels):
+        assert_allclose(se3_from_SE3(pose), vel)
+        assert_allclose(SE3_from_se3(vel), pose, atol=1e-10)
+    assert_allclose(SE3_from_se3(vels), poses, atol=1e-10)
+
+
+def se2_batch_test():
+    from geometry import xytheta_exp, SE2_from_xythetas
+
+    rng = np.random.default_rng(0)
+    n = 200
+    vels = np.zeros((n, 3, 3))
+    w = rng.uniform(-np.pi, np.pi, size=n)
+    # the small-angle branch, and its boundary
+    w[:6] = [0, 1e-12, -1e-9, 1e-8, 2e-8, -np.pi]
+    vels[:, 1, 0] = w
+    vels[:, 0, 1] = -w
+    vels[:, :2, 2] = rng.normal(size=(n, 2))
+    poses = SE2_from_se2(vels)
+    assert poses.shape == (n, 3, 3)
+    for vel, pose in zip(vels, poses):
+        assert_allclose(SE2_from_se2(vel), pose, atol=1e-12)
+    logs = se2_from_SE2(poses)
+    for pose, vel in zip(poses, logs):
+        assert_allclose(se2_from_SE2(pose), vel, atol=1e-12)
+    assert_allclose(logs, vels, atol=1e-12)
+    # the same as the compact (x, y, theta) version
+    twists = np.column_stack([vels[:, 0, 2], vels[:, 1, 2], w])
+    assert_allclose(SE2_from_xythetas(xytheta_exp(twists)), poses, atol=1e-12)
+
+
+@attr("benchmark")
+def se2_batch_benchmark_test():
+    from geometry import fast
+
+    n = 1000000
+    rng = np.random.default_rng(0)
+    vels = np.zeros((n, 3, 3))
+    w = rng.uniform(-1, 1, size=n)
+    vels[:, 1, 0] = w
+    vels[:, 0, 1] = -w
+    vels[:, :2, 2] = rng.normal(size=(n, 2))
+    t0 = time.time()
+    poses = SE2_from_se2(vels)
+    t1 = time.time()
+    se2_from_SE2(poses)
+    t2 = time.time()
+    m = 10000
+    for vel in vels[:m]:
+        fast.SE2_from_se2(vel)
+    t3 = time.time()
+    logger.info(
+        "%d se2 -> SE2: stacked %7.1f ms  (SE2 -> se2: %7.1f ms)  one at a time, fast mode: %7.1f ms"
+        % (n, (t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000 * n / m)
+    )
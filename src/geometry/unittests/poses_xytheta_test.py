@@ -0,0 +1,99 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import (
+    linear_angular_from_se2,
+    logger,
+    se2_from_linear_angular,
+    SE2_from_se2,
+    se2_from_SE2,
+    SE2_from_xytheta,
+    SE2_from_xythetas,
+    xytheta_apply,
+    xytheta_compose,
+    xytheta_exp,
+    xytheta_from_SE2,
+    xytheta_inverse,
+    xytheta_log,
+    xytheta_relative,
+    xythetas_from_SE2,
+)
+from geometry.utils import assert_allclose
+
+
+def random_xythetas(n, rng):
+    P = np.empty((n, 3))
+    P[:, :2] = rng.normal(size=(n, 2))
+    P[:, 2] = rng.uniform(-np.pi, np.pi, size=n)
+    return P
+
+
+def xytheta_conversions_test():
+    P = random_xythetas(50, np.random.default_rng(0))
+    # some special angles
+    P[:4, 2] = [0, np.pi / 2, -np.pi, np.pi]
+    M = SE2_from_xythetas(P)
+    Q = xythetas_from_SE2(M)
+    for i in range(50):
+        assert np.all(M[i] == SE2_from_xytheta(P[i]))
+        assert np.all(Q[i] == xytheta_from_SE2(M[i]))
+    assert_allclose(Q[4:], P[4:], atol=1e-15)
+    assert Q[2, 2] == Q[3, 2] == -np.pi
+    assert np.all(SE2_from_xythetas(P[7]) == M[7])
+
+
+def xytheta_group_operations_test():
+    rng = np.random.default_rng(1)
+    A = random_xythetas(50, rng)
+    B = random_xythetas(50, rng)
+    MA = SE2_from_xythetas(A)
+    MB = SE2_from_xythetas(B)
+    assert_allclose(SE2_from_xythetas(xytheta_compose(A, B)), np.matmul(MA, MB), atol=1e-14)
+    assert_allclose(SE2_from_xythetas(xytheta_inverse(A)), np.linalg.inv(MA), atol=1e-14)
+    expected = np.matmul(np.linalg.inv(MA), MB)
+    assert_allclose(SE2_from_xythetas(xytheta_relative(A, B)), expected, atol=1e-14)
+    # a single pose is broadcast against a stack
+    assert_allclose(xytheta_compose(A[3], B), xytheta_compose(np.tile(A[3], (50, 1)), B))
+    assert_allclose(xytheta_compose(A, xytheta_inverse(A)), 0, atol=1e-14)
+    points = rng.normal(size=(50, 2))
+    expected = np.matmul(MA[:, :2, :2], points[:, :, np.newaxis])[:, :, 0] + MA[:, :2, 2]
+    assert_allclose(xytheta_apply(A, points), expected, atol=1e-14)
+    assert xytheta_apply(A[0], points).shape == (50, 2)
+    angles = xytheta_compose(A, B)[:, 2]
+    assert np.all(angles >= -np.pi) and np.all(angles < np.pi)
+
+
+def xytheta_exp_log_test():
+    rng = np.random.default_rng(2)
+    A = random_xythetas(50, rng)
+    A[:3, 2] = [0, 1e-10, -np.pi]
+    V = xytheta_log(A)
+    for a, v in zip(A, V):
+        linear, angular = linear_angular_from_se2(se2_from_SE2(SE2_from_xytheta(a)))
+        assert_allclose(v, [linear[0], linear[1], angular], atol=1e-12)
+        expected = SE2_from_se2(se2_from_linear_angular(v[:2], v[2]))
+        assert_allclose(SE2_from_xytheta(xytheta_exp(v)), expected, atol=1e-12)
+    assert_allclose(xytheta_exp(V), A, atol=1e-14)
+    assert_allclose(xytheta_exp(np.array([1.0, 2, 0])), [1, 2, 0])
+
+
+@attr("benchmark")
+def xytheta_benchmark_test():
+    n = 1000000
+    rng = np.random.default_rng(0)
+    A = random_xythetas(n, rng)
+    B = random_xythetas(n, rng)
+    MA = SE2_from_xythetas(A)
+    MB = SE2_from_xythetas(B)
+    t0 = time.time()
+    xytheta_compose(xytheta_inverse(A), B)
+    t1 = time.time()
+    np.matmul(np.linalg.inv(MA), MB)
+    t2 = time.time()
+    logger.info(
+        "%d SE(2) relative poses  xytheta: %7.1f ms (%d MB)  matrices: %7.1f ms (%d MB)"
+        % (n, (t1 - t0) * 1000, A.nbytes // 2 ** 20, (t2 - t1) * 1000, MA.nbytes // 2 ** 20)
+    )
@@ -55,3 +55,13 @@ def best_similarity_transform_test():
         assert_allclose(t, t2)
 
         assert_allclose(Y, Y2)
+
+
+def closest_orthogonal_matrix_special_test():
+    R = random_rotation()
+    # a reflection: the closest orthogonal matrix has determinant -1
+    M = np.dot(R, np.diag([1, 1, -1.0]))
+    assert_allclose(np.linalg.det(closest_orthogonal_matrix(M)), -1)
+    R2 = closest_orthogonal_matrix(M + 0.01, special=True)
+    assert_allclose(np.linalg.det(R2), 1)
+    assert_allclose(closest_orthogonal_matrix(R + 0.001, special=True), R, atol=0.01)
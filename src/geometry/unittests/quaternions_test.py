@@ -1,5 +1,29 @@
 # coding=utf-8
+import tempfile
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
 from geometry import (
+    angles_from_rotations,
+    euclidean_distances,
+    mds,
+    quaternion_distance_matrix,
+    quaternion_distances,
+    random_quaternions,
+    random_rotations,
+    rotation_distance_matrix,
+    rotation_distances,
+    quaternion_conjugate,
+    quaternion_exp,
+    quaternion_inverse,
+    quaternion_log,
+    quaternion_multiply,
+    quaternion_normalize,
+    quaternion_rotate,
+    quaternion_slerp,
+    rotations_from_quaternions,
     quaternion_from_rotation,
     rotation_from_quaternion,
     axis_angle_from_quaternion,
@@ -7,6 +31,8 @@ from geometry import (
     rotation_from_axis_angle,
     rotation_from_axis_angle2,
     axis_angle_from_rotation,
+    logger,
+    slerp,
 )
 
 from geometry.utils import assert_allclose
@@ -46,3 +72,179 @@ class TestQuaternions(GeoTestCase):
                 print("Secnd: %s around %s" % (a2, s2))
 
             assert_allclose(R1, R2)
+
+
+def quaternion_multiply_test():
+    P = random_quaternions(20)
+    Q = random_quaternions(20)
+    PQ = quaternion_multiply(P, Q)
+    assert_allclose(rotations_from_quaternions(PQ), np.matmul(rotations_from_quaternions(P), rotations_from_quaternions(Q)))
+    # broadcasting a single quaternion
+    assert_allclose(quaternion_multiply(P[0], Q), quaternion_multiply(P[:1].repeat(20, axis=0), Q))
+    assert_allclose(quaternion_multiply(P[3], Q[3]), PQ[3])
+
+
+def quaternion_inverse_test():
+    Q = random_quaternions(20)
+    identity = np.array([1.0, 0, 0, 0])
+    assert_allclose(quaternion_multiply(Q, quaternion_inverse(Q)), np.tile(identity, (20, 1)), atol=1e-12)
+    assert_allclose(quaternion_inverse(Q), quaternion_conjugate(Q))
+    assert_allclose(quaternion_multiply(quaternion_inverse(2 * Q[0]), 2 * Q[0]), identity, atol=1e-12)
+
+
+def quaternion_rotate_test():
+    Q = random_quaternions(20)
+    V = np.random.randn(20, 3)
+    expected = np.matmul(rotations_from_quaternions(Q), V[..., np.newaxis])[..., 0]
+    assert_allclose(quaternion_rotate(Q, V), expected)
+    assert_allclose(quaternion_rotate(Q[0], V[0]), expected[0])
+    assert_allclose(quaternion_rotate(Q[0], V), np.dot(V, rotation_from_quaternion(Q[0]).T))
+
+
+def quaternion_log_exp_test():
+    Q = random_quaternions(20)
+    Q[0] = [1, 0, 0, 0]
+    Q[1] = quaternion_from_axis_angle(np.array([0, 0, 1.0]), 1e-9)
+    Q[2] = [0, 1, 0, 0]
+    L = quaternion_log(Q)
+    assert_allclose(quaternion_exp(L), Q, atol=1e-12)
+    # arccos() would give 0 here
+    assert_allclose(L[1], [0, 0, 0.5e-9], rtol=1e-12)
+    for q, l in zip(Q[3:], L[3:]):
+        axis, angle = axis_angle_from_quaternion(q)
+        assert_allclose(l, axis * angle / 2, atol=1e-12)
+    # -q has the same log, that of the representative with nonnegative
+    # real part (the half-turn Q[2] is ambiguous)
+    assert_allclose(quaternion_log(-Q[3:]), L[3:], atol=1e-15)
+    assert_allclose(quaternion_log(-Q[:2]), L[:2], atol=1e-15)
+    q = np.array([-1, 1e-13, 0, 0])
+    assert_allclose(quaternion_log(q), [-1e-13, 0, 0], rtol=1e-12)
+
+
+def quaternion_normalize_test():
+    Q = random_quaternions(20)
+    scaled = -3 * Q
+    assert_allclose(quaternion_normalize(scaled), Q)
+    assert_allclose(quaternion_normalize(scaled, canonical=False), -Q)
+    assert_allclose(quaternion_normalize(scaled[0]), Q[0])
+
+
+def quaternion_slerp_test():
+    P = random_quaternions(20)
+    Q = random_quaternions(20)
+    t = np.random.rand(20)
+    S = quaternion_slerp(P, Q, t)
+    for p, q, ti, s in zip(P, Q, t, S):
+        # the same as slerp() on the sphere, after choosing the closest sign
+        q = q if np.dot(p, q) >= 0 else -q
+        assert_allclose(s, slerp(p, q, ti), atol=1e-12)
+    assert_allclose(quaternion_slerp(P, Q, 0), P, atol=1e-12)
+    assert_allclose(np.abs((quaternion_slerp(P, -Q, 1) * Q).sum(axis=1)), 1, atol=1e-12)
+    # close quaternions, for which sin(omega) would be 0
+    identity = np.array([1.0, 0, 0, 0])
+    q = quaternion_from_axis_angle(np.array([0, 0, 1.0]), 1e-9)
+    assert_allclose(quaternion_log(quaternion_slerp(identity, q, 0.5)), [0, 0, 0.25e-9], rtol=1e-12)
+    assert_allclose(quaternion_slerp(P[0], P[0], 0.5), P[0], atol=1e-15)
+
+
+def rotation_distances_test():
+    R = random_rotations(40, rng=0)
+    # add some (almost) coincident rotations
+    R[1] = R[0]
+    R[2] = np.dot(R[0], rotation_from_axis_angle(np.array([0, 0, 1.0]), 1e-9))
+    expected = np.array([angles_from_rotations(np.matmul(a.T, R)) for a in R])
+    assert_allclose(rotation_distances(R[5], R), expected[5], atol=1e-12)
+    assert_allclose(rotation_distances(R[0], R[:3]), [0, 0, 1e-9], atol=1e-15)
+    D = rotation_distance_matrix(R)
+    assert_allclose(D, expected, atol=1e-12)
+    assert np.all(D.diagonal() == 0)
+    assert_allclose(D[0, :3], [0, 0, 1e-9], atol=1e-15)
+    for block_size in [1, 7, 100]:
+        assert_allclose(rotation_distance_matrix(R, R[:10], block_size=block_size), expected[:, :10], atol=1e-12)
+    D32 = rotation_distance_matrix(R, dtype="float32", block_size=16)
+    assert D32.dtype == np.float32
+    assert_allclose(D32, expected, atol=1e-5)
+
+
+def quaternion_distances_test():
+    P = random_quaternions(30, rng=1)
+    Q = random_quaternions(20, rng=2)
+    expected = rotation_distance_matrix(rotations_from_quaternions(P), rotations_from_quaternions(Q))
+    # q and -q are the same rotation
+    Q[::2] *= -1
+    assert_allclose(quaternion_distance_matrix(P, Q), expected, atol=1e-12)
+    assert_allclose(quaternion_distances(P[3], Q), expected[3], atol=1e-12)
+    with tempfile.NamedTemporaryFile() as f:
+        out = np.memmap(f.name, dtype="float32", mode="w+", shape=(30, 20))
+        D = quaternion_distance_matrix(P, Q, block_size=8, out=out)
+        assert D is out
+        assert_allclose(out, expected, atol=1e-5)
+        del D, out
+
+
+def quaternion_distance_matrix_memory_test():
+    import tracemalloc
+
+    n = 3000
+    P = random_quaternions(n, rng=3)
+    expected = quaternion_distance_matrix(P[:50], P)
+    for dtype, size in [("float32", 4), ("float64", 8)]:
+        tracemalloc.start()
+        try:
+            D = quaternion_distance_matrix(P, dtype=dtype)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # the result, plus two booleans per entry of a block; for float32
+        # the blocks have 1024 rows and a float64 buffer, while for float64
+        # the products are computed directly in the result
+        rows, temporary = (1024, 8 + 2) if dtype == "float32" else (n, 2)
+        assert peak < size * n * n + 1.2 * temporary * rows * n, peak / float(size * n * n)
+        assert D.dtype == dtype
+        assert_allclose(D[:50], expected, atol=1e-5)
+        del D
+
+
+def rotation_distances_mds_test():
+    # rotations around the same axis embed isometrically on a line
+    angles = np.linspace(0, 2, 20)
+    R = np.array([rotation_from_axis_angle(np.array([1.0, 0, 0]), a) for a in angles])
+    D = rotation_distance_matrix(R)
+    P = mds(D, ndim=2)
+    assert_allclose(euclidean_distances(P), D, atol=1e-7)
+
+
+@attr("benchmark")
+def rotation_distance_matrix_benchmark_test():
+    from geometry.manifolds import SO3
+
+    for n in [500, 2000]:
+        R = random_rotations(n, rng=0)
+        t0 = time.time()
+        rotation_distance_matrix(R, dtype="float32", block_size=256)
+        t1 = time.time()
+        msg = "%d x %d rotation distances  quaternion dots: %7.1f ms" % (n, n, (t1 - t0) * 1000)
+        if n <= 500:
+            t0 = time.time()
+            np.array([[SO3.distance(a, b) for b in R] for a in R[:5]])
+            t1 = time.time()
+            msg += "  (loop: %7.1f ms)" % ((t1 - t0) * 1000 * n / 5)
+        logger.info(msg)
+
+
+@attr("benchmark")
+def quaternion_benchmark_test():
+    n = 100000
+    P = quaternion_normalize(np.random.randn(n, 4))
+    Q = quaternion_normalize(np.random.randn(n, 4))
+    V = np.random.randn(n, 3)
+    t0 = time.time()
+    quaternion_rotate(quaternion_multiply(P, Q), V)
+    t1 = time.time()
+    R = np.matmul(rotations_from_quaternions(P), rotations_from_quaternions(Q))
+    np.matmul(R, V[..., np.newaxis])
+    t2 = time.time()
+    logger.info(
+        "compose and apply %d rotations  quaternions: %7.1f ms  matrices: %7.1f ms"
+        % (n, (t1 - t0) * 1000, (t2 - t1) * 1000)
+    )
@@ -0,0 +1,105 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import (
+    angle_from_SO2,
+    hat_maps,
+    logger,
+    map_hats,
+    random_rotation,
+    rotation_mean,
+    rotation_mean_chordal,
+    rotation_mean_geodesic,
+    rotation_mean_quaternion,
+    SO2_from_angle,
+    SO3_from_so3,
+    so3_from_SO3,
+)
+from geometry.manifolds import PointSet, SO2, SO3
+from geometry.utils import assert_allclose
+
+
+def noisy_rotations(M0, n, sigma, rng):
+    """ Rotations M0 exp(v) with v ~ N(0, sigma^2 I). """
+    V = rng.normal(scale=sigma, size=(n, 3))
+    return np.matmul(M0, SO3_from_so3(hat_maps(V)))
+
+
+def rotation_mean_methods_test():
+    rng = np.random.default_rng(0)
+    M0 = random_rotation(rng=rng)
+    R = noisy_rotations(M0, 400, 0.1, rng)
+    for method in ["chordal", "quaternion", "geodesic"]:
+        M = rotation_mean(R, method=method)
+        assert SO3.distance(M, M0) < 0.03, method
+    # with small noise, all the means are close to each other
+    R = noisy_rotations(M0, 50, 1e-4, rng)
+    M = rotation_mean_geodesic(R)
+    assert_allclose(rotation_mean_chordal(R), M, atol=1e-8)
+    assert_allclose(rotation_mean_quaternion(R), M, atol=1e-8)
+
+
+def rotation_mean_geodesic_test():
+    rng = np.random.default_rng(1)
+    R = noisy_rotations(random_rotation(rng=rng), 100, 0.3, rng)
+    w = rng.random(100)
+    M = rotation_mean_geodesic(R, w)
+    # the weighted average of the logarithms vanishes at the Karcher mean
+    V = map_hats(so3_from_SO3(np.matmul(M.T, R)))
+    assert_allclose(np.dot(w, V), 0, atol=1e-10)
+    # L1: the weighted average of the unit directions vanishes
+    M = rotation_mean_geodesic(R, w, norm="L1", max_iter=1000)
+    V = map_hats(so3_from_SO3(np.matmul(M.T, R)))
+    U = V / np.linalg.norm(V, axis=1)[:, np.newaxis]
+    assert_allclose(np.dot(w, U), 0, atol=1e-6)
+
+
+def rotation_mean_outliers_test():
+    rng = np.random.default_rng(2)
+    M0 = random_rotation(rng=rng)
+    R = np.concatenate([noisy_rotations(M0, 80, 0.01, rng), SO3.sample_uniform(20, rng=rng)])
+    assert SO3.distance(rotation_mean_geodesic(R, norm="L1"), M0) < 0.01
+
+
+def rotation_mean_weights_test():
+    R = SO3.sample_uniform(10, rng=3)
+    w = np.zeros(10)
+    w[4] = 2
+    for method in ["chordal", "quaternion", "geodesic"]:
+        assert_allclose(rotation_mean(R, w, method=method), R[4], atol=1e-10)
+    # duplicating a rotation is the same as doubling its weight
+    w = np.ones(10)
+    w[0] = 2
+    assert_allclose(rotation_mean(R, w), rotation_mean(np.concatenate([R, R[:1]])), atol=1e-10)
+    # plain lists are accepted too
+    for method in ["chordal", "quaternion", "geodesic"]:
+        assert_allclose(rotation_mean(R, list(w), method=method), rotation_mean(R, w, method=method))
+
+
+def SO_riemannian_mean_test():
+    R = SO3.sample_uniform(30, rng=4)
+    ps = PointSet(SO3, list(R))
+    assert_allclose(ps.average(), rotation_mean(R), atol=1e-12)
+    assert ps.centroid_index() in range(30)
+    angles = np.array([0.1, 0.2, 0.6, -0.3, 0.15])
+    R2 = np.array([SO2_from_angle(t) for t in angles])
+    M = SO2.riemannian_mean(R2)
+    assert_allclose(angle_from_SO2(M), angles.mean())
+    # the L1 mean of angles is their median
+    M = SO2.riemannian_mean(list(R2), norm="L1", max_iter=1000)
+    assert_allclose(angle_from_SO2(M), 0.15, atol=1e-6)
+
+
+@attr("benchmark")
+def rotation_mean_benchmark_test():
+    rng = np.random.default_rng(0)
+    n = 10000
+    R = noisy_rotations(random_rotation(rng=rng), n, 0.2, rng)
+    for method in ["chordal", "quaternion", "geodesic"]:
+        t0 = time.time()
+        rotation_mean(R, method=method)
+        t1 = time.time()
+        logger.info("rotation_mean(%d rotations, method=%r): %7.1f ms" % (n, method, (t1 - t0) * 1000))
@@ -0,0 +1,102 @@
+# coding=utf-8
+import time
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from geometry import (
+    geodesic_distance_for_rotations,
+    logger,
+    random_rotations,
+    rotation_distance_matrix,
+    rotation_from_axis_angle,
+    RotationIndex,
+)
+from geometry.manifolds import SO3
+from geometry.utils import assert_allclose
+
+
+def rotation_index_query_test():
+    R = random_rotations(500, rng=0)
+    queries = random_rotations(30, rng=1)
+    D = rotation_distance_matrix(queries, R)
+    index = RotationIndex(R)
+    distances, indices = index.query(queries, k=5)
+    assert distances.shape == indices.shape == (30, 5)
+    assert_allclose(distances, np.sort(D, axis=1)[:, :5], atol=0)
+    assert_allclose(np.take_along_axis(D, indices, axis=1), distances, atol=0)
+    for i in range(5):
+        expected = geodesic_distance_for_rotations(queries[i], R[indices[i, 0]])
+        assert_allclose(distances[i, 0], expected, atol=1e-12)
+    d, i = index.query(R[17])
+    assert i.shape == (1,) and i[0] == 17 and d[0] == 0
+
+
+def rotation_index_antipodal_test():
+    # rotations by angles close to pi, for which q and -q are both near
+    axis = np.array([0, 0, 1.0])
+    R = np.array([rotation_from_axis_angle(axis, a) for a in [np.pi - 0.01, 0.5, -np.pi + 0.02]])
+    index = RotationIndex(R)
+    d, i = index.query(rotation_from_axis_angle(axis, np.pi), k=3)
+    assert list(i[:2]) == [0, 2]
+    assert_allclose(d, [0.01, 0.02, np.pi - 0.5], atol=1e-12)
+
+
+def rotation_index_insert_test():
+    R = random_rotations(300, rng=2)
+    index = RotationIndex()
+    for j, r in enumerate(R[:100]):
+        assert index.add(r) == j
+    assert list(index.add(R[100:])) == list(range(100, 300))
+    assert len(index) == 300
+    queries = random_rotations(10, rng=3)
+    D = rotation_distance_matrix(queries, R)
+    distances, indices = index.query(queries, k=3)
+    assert_allclose(distances, np.sort(D, axis=1)[:, :3], atol=0)
+    index.add(queries[4])
+    d, i = index.query(queries[4])
+    assert i[0] == 300 and d[0] == 0
+
+
+def rotation_index_radius_test():
+    R = SO3.sample_uniform(400, rng=4)
+    queries = SO3.sample_uniform(10, rng=5)
+    D = rotation_distance_matrix(queries, R)
+    index = RotationIndex(R[:200])
+    for r in R[200:]:
+        index.add(r)
+    results = index.query_radius(queries, 0.4)
+    assert len(results) == 10
+    for k, (distances, indices) in enumerate(results):
+        expected = np.nonzero(D[k] <= 0.4)[0]
+        assert sorted(indices) == list(expected)
+        assert_allclose(distances, D[k, indices], atol=0)
+        assert np.all(np.diff(distances) >= 0)
+    distances, indices = index.query_radius(R[3], 0)
+    assert list(indices) == [3]
+    assert len(index.query_radius(R[3], np.pi)[1]) == 400
+
+
+@attr("benchmark")
+def rotation_index_benchmark_test():
+    n = 50000
+    R = random_rotations(n, rng=0)
+    queries = random_rotations(1000, rng=1)
+    t0 = time.time()
+    index = RotationIndex(R)
+    t1 = time.time()
+    index.query(queries, k=1)
+    t2 = time.time()
+    for q in queries[:20]:
+        SO3.distances(q, R).argmin()
+    t3 = time.time()
+    logger.info(
+        "RotationIndex(%d): build %7.1f ms  1000 queries: %7.1f ms  (brute force: %7.1f ms)"
+        % (n, (t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000 * 50)
+    )
+    R2 = random_rotations(5000, rng=2)
+    t0 = time.time()
+    for r in R2:
+        index.add(r)
+    t1 = time.time()
+    logger.info("RotationIndex: 5000 insertions: %7.1f ms" % ((t1 - t0) * 1000))
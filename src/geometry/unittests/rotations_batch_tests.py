@@ -0,0 +1,207 @@
+# coding=utf-8
+import numpy as np
+
+from geometry import (
+    axis_angle_from_rotation,
+    axis_angles_from_rotations,
+    hat_map,
+    hat_maps,
+    map_hat,
+    map_hats,
+    quaternion_from_rotation,
+    quaternions_from_rotations,
+    rotation_from_axis_angle,
+    rotation_from_quaternion,
+    rotations_from_axis_angles,
+    rotations_from_quaternions,
+)
+from geometry.utils import assert_allclose
+
+from .utils import axis_angle_sequence, directions_sequence, quaternions_sequence, rotations_sequence
+
+
+def stacked_rotations():
+    Rs = list(rotations_sequence())
+    Rs.append(rotation_from_axis_angle(np.array([0, 0, 1]), np.pi))
+    Rs.append(rotation_from_axis_angle(np.array([0, 1, 0]), np.pi))
+    return np.array(Rs)
+
+
+def hat_maps_test():
+    V = np.array(list(directions_sequence()))
+    H = hat_maps(V)
+    assert H.shape == (V.shape[0], 3, 3)
+    for v, h in zip(V, H):
+        assert_allclose(h, hat_map(v))
+    assert_allclose(map_hats(H), V)
+    assert_allclose(hat_maps(V[0]), hat_map(V[0]))
+    assert_allclose(map_hats(H[0]), map_hat(H[0]))
+
+
+def rotations_from_quaternions_test():
+    Q = np.array(list(quaternions_sequence()))
+    R = rotations_from_quaternions(Q)
+    for q, r in zip(Q, R):
+        assert_allclose(r, rotation_from_quaternion(q))
+    assert_allclose(rotations_from_quaternions(Q[0]), rotation_from_quaternion(Q[0]))
+
+
+def quaternions_from_rotations_test():
+    R = stacked_rotations()
+    Q = quaternions_from_rotations(R)
+    for r, q in zip(R, Q):
+        assert_allclose(q, quaternion_from_rotation(r))
+    assert_allclose(quaternions_from_rotations(R[1]), quaternion_from_rotation(R[1]))
+    assert_allclose(rotations_from_quaternions(Q), R, atol=1e-12)
+
+
+def rotations_from_axis_angles_test():
+    axes, angles = zip(*axis_angle_sequence())
+    axes = np.array(axes)
+    angles = np.array(angles)
+    R = rotations_from_axis_angles(axes, angles)
+    for axis, angle, r in zip(axes, angles, R):
+        assert_allclose(r, rotation_from_axis_angle(axis, angle))
+    axes2, angles2 = axis_angles_from_rotations(R)
+    assert_allclose(axes2, axes)
+    assert_allclose(angles2, angles)
+
+
+def axis_angles_from_rotations_test():
+    R = stacked_rotations()
+    axes, angles = axis_angles_from_rotations(R)
+    assert axes.shape == (R.shape[0], 3)
+    assert angles.shape == (R.shape[0],)
+    for r, axis, angle in zip(R, axes, angles):
+        axis0, angle0 = axis_angle_from_rotation(r)
+        assert_allclose(angle, angle0)
+        assert_allclose(rotation_from_axis_angle(axis, angle), r, atol=1e-8)
+    axis, angle = axis_angles_from_rotations(np.eye(3))
+    assert_allclose(axis, [0, 0, 1])
+    assert angle == 0
+
+
+def axis_angles_near_pi_test():
+    axis = np.array([1.0, 2.0, -2.0]) / 3
+    for eps in [0, 1e-9, 1e-12]:
+        R = rotation_from_axis_angle(axis, np.pi - eps)
+        axis2, angle2 = axis_angles_from_rotations(R)
+        assert_allclose(rotation_from_axis_angle(axis2, angle2), R, atol=1e-8)
+
+
+def so3_exp_log_test():
+    from geometry import SO3_from_so3, so3_from_SO3, expm
+
+    R = stacked_rotations()
+    W = so3_from_SO3(R)
+    assert_allclose(SO3_from_so3(W), R, atol=1e-10)
+    for r, w in zip(R, W):
+        assert_allclose(so3_from_SO3(r), w)
+        assert_allclose(SO3_from_so3(w), expm(w), atol=1e-10)
+        axis, angle = axis_angle_from_rotation(r)
+        assert_allclose(np.linalg.norm(map_hat(w)), angle, atol=1e-7)
+
+
+def expect_value_error(f, *args):
+    try:
+        f(*args)
+    except ValueError as e:
+        return str(e)
+    raise Exception("Expected ValueError from %s%s" % (f.__name__, args))
+
+
+def check_SO_stack_test():
+    from geometry import check_SO, is_SO
+
+    R = stacked_rotations()
+    check_SO(R)
+    assert is_SO(R).all() and is_SO(R[0])
+    R[3] = np.diag([1.0, 1, -1])
+    R[5] = 2 * R[5]
+    mask = is_SO(R)
+    expected = np.ones(len(R), dtype=bool)
+    expected[[3, 5]] = False
+    assert_allclose(mask, expected)
+    assert "Element 3 of the stack is not a rotation" in expect_value_error(check_SO, R)
+    # single matrices give the same messages as before
+    assert "The determinant is -1.0 not 1." in expect_value_error(check_SO, R[3])
+
+
+def check_diagonal_stack_test():
+    from geometry import check_diagonal, is_diagonal
+
+    M = np.array([np.eye(3)] * 4)
+    M[2, 0, 1] = 0.5
+    assert_allclose(is_diagonal(M), [True, True, False, True])
+    assert is_diagonal(np.diag([1.0, 2, 3]))
+    msg = expect_value_error(check_diagonal, M)
+    assert msg == "Element 2 of the stack: The element 0, 1 is 0.5 not equal to zero.", msg
+    msg = expect_value_error(check_diagonal, M[2])
+    assert msg == "The element 0, 1 is 0.5 not equal to zero.", msg
+
+
+def check_skew_symmetric_stack_test():
+    from geometry import check_skew_symmetric, is_skew_symmetric
+
+    W = hat_maps(np.random.randn(5, 3))
+    check_skew_symmetric(W)
+    W[1, 2, 0] += 1
+    W[4, 1, 1] = 1
+    assert_allclose(is_skew_symmetric(W), [True, False, True, True, False])
+    msg = expect_value_error(check_skew_symmetric, W)
+    assert msg.startswith("Element 1 of the stack: Expected skew symmetric, but a[2][0]"), msg
+    msg = expect_value_error(check_skew_symmetric, W[4])
+    assert msg.startswith("Expected skew symmetric, but diagonal is not exactly zero"), msg
+    # lists are accepted as well
+    check_skew_symmetric([[0, -1], [1, 0]])
+    msg = expect_value_error(check_skew_symmetric, [[0, 1], [1, 0]])
+    assert msg.startswith("Expected skew symmetric, but a[1][0]"), msg
+
+
+def check_SE_stack_test():
+    from contracts import check
+    from geometry import SE3_from_se3, check_SE, check_se
+
+    vel = np.zeros((4, 4, 4))
+    vel[:, :3, :3] = hat_maps(np.random.randn(4, 3))
+    vel[:, :3, 3] = np.random.randn(4, 3)
+    check_se(vel)
+    poses = SE3_from_se3(vel)
+    check_SE(poses)
+    check("array[Nx4x4],SE", poses)
+    poses[2, 3, 0] = 1
+    try:
+        check_SE(poses)
+    except AssertionError:
+        pass
+    else:
+        raise Exception()
+
+
+def random_rotations_test():
+    from geometry import is_SO, random_quaternion, random_quaternions, random_rotation, random_rotations
+
+    for ndim in [2, 3]:
+        R = random_rotations(20, ndim, rng=0)
+        assert R.shape == (20, ndim, ndim)
+        assert is_SO(R).all()
+        assert_allclose(random_rotations(20, ndim, rng=np.random.default_rng(0)), R)
+        assert random_rotations(0, ndim).shape == (0, ndim, ndim)
+        assert_allclose(random_rotation(ndim, rng=5), random_rotation(ndim, rng=5))
+    Q = random_quaternions(50, rng=1)
+    assert_allclose(np.linalg.norm(Q, axis=1), 1)
+    assert (Q[:, 0] >= 0).all()
+    # without rng, the global numpy state is used as before
+    np.random.seed(3)
+    q1 = random_quaternion()
+    np.random.seed(3)
+    assert_allclose(random_quaternion(), q1)
+
+
+def random_directions_test():
+    from geometry import random_directions
+
+    for ndim in [2, 3]:
+        S = random_directions(30, ndim, rng=2)
+        assert S.shape == (ndim, 30)
+        assert_allclose(np.linalg.norm(S, axis=0), 1)
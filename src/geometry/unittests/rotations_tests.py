@@ -9,7 +9,14 @@ from geometry import (
     geodesic_distance_on_sphere,
 )
 from geometry.utils import assert_allclose
-from geometry.rotations import quaternion_from_rotation, rotation_from_axes_spec
+from geometry.rotations import (
+    exp_coefficients,
+    log_coefficient,
+    quaternion_from_rotation,
+    rotation_angles,
+    rotation_from_axes_spec,
+    rotation_from_quaternion,
+)
 from geometry.spheres import slerp, any_distant_direction
 import numpy as np
 
@@ -57,6 +64,38 @@ def hat_map_test():
             assert_allclose(x1, x3)
 
 
+def out_parameter_test():
+    out = np.full((3, 3), np.nan)
+    v = np.array([0.1, -2, 3])
+    assert hat_map(v, out=out) is out
+    assert np.all(out == hat_map(v))
+    for R in rotations_sequence():
+        q = quaternion_from_rotation(R)
+        assert rotation_from_quaternion(q, out=out) is out
+        assert np.all(out == rotation_from_quaternion(q))
+
+
+def exp_log_coefficients_test():
+    # the series match the closed forms around their thresholds
+    theta = np.array([1e-9, 0.05, 0.0999, 0.1, 0.1999, 0.2, 1.0, 3.0])
+    A, B, C = exp_coefficients(theta)
+    D = log_coefficient(theta)
+    big = theta >= 0.05
+    t = theta[big]
+    assert_allclose(A[big], np.sin(t) / t, rtol=1e-12)
+    assert_allclose(B[big], (1 - np.cos(t)) / t ** 2, rtol=1e-10)
+    assert_allclose(C[big], (t - np.sin(t)) / t ** 3, rtol=1e-8)
+    assert_allclose(D[big], 1 / t ** 2 - 1 / (2 * t * np.tan(t / 2)), rtol=1e-8)
+    assert_allclose([A[0], B[0], C[0], D[0]], [1, 0.5, 1.0 / 6, 1.0 / 12])
+    # scalars give the same values
+    for i, x in enumerate(theta):
+        assert_allclose(exp_coefficients(x), (A[i], B[i], C[i]), rtol=1e-12)
+        assert_allclose(log_coefficient(x), D[i], rtol=1e-12)
+    W = np.array([hat_map(np.array([0, 0, 2.0])), hat_map(np.array([3.0, 4, 0]))])
+    assert_allclose(rotation_angles(W)[:, 0, 0], [2, 5])
+    assert rotation_angles(W[0]) == 2
+
+
 def rotation_from_axes_spec__test():
     for x in directions_sequence():
         v = any_distant_direction(x)
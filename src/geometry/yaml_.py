@@ -5,6 +5,7 @@ from geometry import logger
 import numpy as np
 
 from .manifolds import DifferentiableManifold
+from .poses_qt import qts_from_SE3, SE3_from_qts
 
 #
 # def array_to_lists(x):
@@ -112,6 +113,23 @@ class SE3_m44(Representation):
 register_yaml_converter("SE3", "m44", SE3_m44)
 
 
+class SE3_qt(Representation):
+    """ The 7 numbers [qw, qx, qy, qz, tx, ty, tz]; see :py:mod:`geometry.poses_qt`. """
+
+    @staticmethod
+    @contract(x="SE3", returns="list[7](float)")
+    def to_yaml(x):
+        return qts_from_SE3(x).tolist()
+
+    @staticmethod
+    @contract(y="list[7](float|int)", returns="SE3")
+    def from_yaml(y):
+        return SE3_from_qts(np.array(y, dtype="float64"))
+
+
+register_yaml_converter("SE3", "qt", SE3_qt)
+
+
 class se3_m44(Representation):
     @staticmethod
     def to_yaml(x):